@@ -8,6 +8,7 @@ from pages.base import Base
 
 
 class About(Base):
+    URL_TEMPLATE = '/{locale}/about/'
 
     _privacy_section_locator = (By.ID, 'privacy')
     _get_involved_section_locator = (By.ID, 'get-involved')
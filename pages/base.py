@@ -2,14 +2,27 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+from contextlib import contextmanager
+
 from pypom import Page
+from pypom.interfaces import IDriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support import expected_conditions as expected
 from selenium.webdriver.support.select import Select
 
 from pages.auth0 import Auth0
+from pages.dom_wait import DomWait
+from pages.http_driver import FrozenDriver
+from pages.http_login import http_login
+from pages.login_cache import cache as login_cache
+from pages.navigation import MENU_COST, navigates_to, navigator
 from tests import conftest
+from tests.browser_pool import provider_visited
+
+
+@contextmanager
+def _unlocked(email):
+    yield
 
 
 class Base(Page):
@@ -23,13 +36,38 @@ class Base(Page):
     # Not logged in
     _sign_in_button_locator = (By.ID, 'nav-login')
 
+    # held around logging in by email, see tests.user_leases
+    mailbox = staticmethod(_unlocked)
+
     def __init__(self, selenium, base_url, locale='en-US', **url_kwargs):
         super(Base, self).__init__(selenium, base_url, locale=locale, **url_kwargs)
 
+    @property
+    def dom_wait(self):
+        return DomWait(self)
+
+    @contextmanager
+    def frozen(self):
+        """Read the page from one copy of its source until the block exits.
+
+        find_element, is_element_present and the text and attributes of
+        elements are then answered from the parsed page_source instead of
+        one WebDriver command each, also in regions created in the block.
+        Clicking, typing or waiting raises, and displayed state is
+        approximated, see pages.http_driver.FrozenDriver.
+        """
+        live = self.driver, self.driver_adapter, self.wait
+        self.driver = FrozenDriver(self.driver)
+        self.driver_adapter = IDriver(self.driver)
+        self.wait = self.driver_adapter.wait_factory(self.timeout)
+        try:
+            yield self
+        finally:
+            self.driver, self.driver_adapter, self.wait = live
+
     @property
     def page_title(self):
-        self.wait.until(lambda s: self.selenium.title)
-        return self.selenium.title
+        return self.dom_wait.until_title()
 
     @property
     def is_pending_approval_visible(self):
@@ -52,15 +90,30 @@ class Base(Page):
     def click_sign_in_button(self):
         self.find_element(*self._sign_in_button_locator).click()
 
-    def login(self, email):
-        self.click_sign_in_button()
-        auth0 = Auth0(self.selenium, self.base_url)
-        auth0.request_login_link(email)
-        login_link = conftest.login_link(email)
-        self.selenium.get(login_link)
-        self.wait.until(lambda s: self.is_user_loggedin)
+    def login(self, email, cached=True):
+        """Log in by email, through the Auth0 lock unless avoidable.
+
+        Cached session cookies are reused and, when enabled, the login link
+        is requested over HTTP. Pass cached=False to always use the lock
+        and leave the cache alone.
+        """
+        if cached and login_cache.restore(self, email):
+            return
+        with self.mailbox(email):
+            if not (cached and http_login.login(self, email)):
+                provider_visited(self.selenium)
+                self.click_sign_in_button()
+                auth0 = Auth0(self.selenium, self.base_url)
+                conftest.clear_mail(email)
+                auth0.request_login_link(email)
+                login_link = conftest.login_link(email)
+                self.selenium.get(login_link)
+                self.wait.until(lambda s: self.is_user_loggedin)
+        if cached:
+            login_cache.save(self, email)
 
     def login_with_github(self, username, password, secret):
+        provider_visited(self.selenium)
         self.click_sign_in_button()
         auth0 = Auth0(self.selenium, self.base_url)
         github = auth0.click_login_with_github()
@@ -71,6 +124,13 @@ class Base(Page):
         from pages.register import Register
         return Register(self.selenium, self.base_url).wait_for_page_to_load()
 
+    def goto(self, page_class, **url_kwargs):
+        """Go to a page of page_class the cheapest way, see Navigator.
+
+        Tests exercising a menu or link should click it themselves.
+        """
+        return navigator.goto(self, page_class, **url_kwargs)
+
     @property
     def header(self):
         return self.Header(self.selenium, self.base_url)
@@ -108,10 +168,9 @@ class Base(Page):
             return Search(self.selenium, self.base_url).wait_for_page_to_load()
 
         def click_options(self):
-            self.wait.until(expected.visibility_of_element_located(
-                self._profile_menu_locator)).click()
-            self.wait.until(expected.visibility_of_element_located(
-                self._dropdown_menu_locator))
+            dom_wait = DomWait(self)
+            dom_wait.until_visible(self._profile_menu_locator).click()
+            dom_wait.until_visible(self._dropdown_menu_locator)
 
         @property
         def is_logout_menu_item_present(self):
@@ -122,18 +181,21 @@ class Base(Page):
             return self.is_element_present(*self._groups_menu_item_locator)
 
         # menu items
+        @navigates_to('pages.profile.Profile', cost=MENU_COST)
         def click_view_profile_menu_item(self):
             self.click_options()
             self.find_element(*self._view_profile_menu_item_locator).click()
             from pages.profile import Profile
             return Profile(self.selenium, self.base_url).wait_for_page_to_load()
 
+        @navigates_to('pages.invite.Invite', cost=MENU_COST)
         def click_invite_menu_item(self):
             self.click_options()
             self.find_element(*self._invite_menu_item_locator).click()
             from pages.invite import Invite
             return Invite(self.selenium, self.base_url)
 
+        @navigates_to('pages.settings.Settings', cost=MENU_COST)
         def click_settings_menu_item(self):
             self.click_options()
             self.find_element(*self._settings_menu_item_locator).click()
@@ -145,6 +207,7 @@ class Base(Page):
             self.find_element(*self._logout_menu_item_locator).click()
             self.wait.until(lambda s: not self.is_logout_menu_item_present)
 
+        @navigates_to('pages.groups_page.GroupsPage', cost=MENU_COST)
         def click_groups_menu_item(self):
             self.click_options()
             self.find_element(*self._groups_menu_item_locator).click()
@@ -157,6 +220,7 @@ class Base(Page):
         _language_selector_locator = (By.ID, 'language')
         _language_selection_ok_button = (By.CSS_SELECTOR, '#language-switcher button')
 
+        @navigates_to('pages.about.About')
         def click_about_link(self):
             self.find_element(*self._about_mozillians_link_locator).click()
             from pages.about import About
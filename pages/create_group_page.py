@@ -9,6 +9,7 @@ from pages.base import Base
 
 
 class CreateGroupPage(Base):
+    URL_TEMPLATE = '/{locale}/groups/add/'
 
     _create_group_name = (By.NAME, 'name')
     _create_group_form = (By.CSS_SELECTOR, 'form.add-group')
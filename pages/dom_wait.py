@@ -0,0 +1,107 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support import expected_conditions as expected
+
+from pages.snapshot import FIND_ELEMENTS_SCRIPT
+
+WAIT_SCRIPT = FIND_ELEMENTS_SCRIPT + """
+var condition = arguments[0], by = arguments[1], value = arguments[2];
+var target = arguments[3], timeout = arguments[4];
+var done = arguments[arguments.length - 1];
+
+function isDisplayed(element) {
+  return !!(element.offsetWidth || element.offsetHeight || element.getClientRects().length) &&
+    window.getComputedStyle(element).visibility !== 'hidden';
+}
+
+function check() {
+  switch (condition) {
+    case 'present':
+      return findElements(document, by, value)[0] || null;
+    case 'visible':
+      var element = findElements(document, by, value)[0];
+      return element && isDisplayed(element) ? element : null;
+    case 'stale':
+      return document.documentElement.contains(target) ? null : true;
+    case 'title':
+      return document.title || null;
+  }
+}
+
+var observer, interval, timer;
+function finish(result) {
+  observer.disconnect();
+  clearInterval(interval);
+  clearTimeout(timer);
+  done(result);
+}
+
+var result = check();
+if (result !== null) {
+  done(result);
+} else {
+  observer = new MutationObserver(function () {
+    var result = check();
+    if (result !== null) {
+      finish(result);
+    }
+  });
+  observer.observe(document, {
+    attributes: true, characterData: true, childList: true, subtree: true});
+  // style changes from CSS alone do not mutate the DOM, so check now and
+  // then as well; this costs nothing over the wire
+  interval = setInterval(function () {
+    var result = check();
+    if (result !== null) {
+      finish(result);
+    }
+  }, 100);
+  timer = setTimeout(function () { finish(null); }, timeout);
+}
+"""
+
+
+class DomWait(object):
+    """Waits resolved inside the browser as soon as the DOM matches.
+
+    Each wait is a single execute_async_script call, which watches the DOM
+    with a MutationObserver instead of polling over the wire. If the script
+    cannot run, for example because the page navigated away while waiting,
+    the wait falls back to polling with WebDriverWait.
+    """
+
+    def __init__(self, view):
+        self.view = view
+        self.driver = view.selenium
+        self.timeout = view.timeout
+
+    def _until(self, condition, fallback, locator=(None, None), target=None):
+        # the async script must be allowed to outlive the wait itself
+        if getattr(self.driver, '_dom_wait_timeout', None) != self.timeout:
+            self.driver.set_script_timeout(self.timeout + 5)
+            self.driver._dom_wait_timeout = self.timeout
+        try:
+            result = self.driver.execute_async_script(
+                WAIT_SCRIPT, condition, locator[0], locator[1], target,
+                self.timeout * 1000)
+        except WebDriverException:
+            return self.view.wait.until(fallback)
+        if result is None:
+            raise TimeoutException('Timed out waiting for {0} {1}'.format(
+                condition, locator[1] or ''))
+        return result
+
+    def until_present(self, locator):
+        return self._until('present', expected.presence_of_element_located(locator), locator)
+
+    def until_visible(self, locator):
+        return self._until('visible', expected.visibility_of_element_located(locator), locator)
+
+    def until_stale(self, element):
+        return self._until('stale', expected.staleness_of(element), target=element)
+
+    def until_title(self):
+        return self._until('title', lambda s: s.title)
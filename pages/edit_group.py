@@ -10,6 +10,8 @@ from pages.base import Base
 
 
 class EditGroupPage(Base):
+    URL_TEMPLATE = '/{locale}/group/{slug}/edit/'
+
     _description_button_locator = (By.ID, 'description-tab')
     _description_tab_locator = (By.ID, 'description')
     _access_button_locator = (By.ID, 'access-tab')
@@ -18,7 +20,7 @@ class EditGroupPage(Base):
     _invitations_tab_locator = (By.ID, 'invitations')
 
     def wait_for_page_to_load(self):
-        self.wait.until(lambda s: self.is_element_displayed(*self._description_button_locator))
+        self.dom_wait.until_visible(self._description_button_locator)
         return self
 
     @property
@@ -67,9 +69,8 @@ class EditGroupPage(Base):
             def click_update(self):
                 el = self.find_element(*self._update_locator)
                 el.click()
-                self.wait.until(expected.staleness_of(el))
-                self.wait.until(expected.presence_of_element_located(
-                    self._update_locator))
+                self.page.dom_wait.until_stale(el)
+                self.page.dom_wait.until_present(self._update_locator)
 
         class DeletePanel(Region):
             _delete_acknowledgement_locator = (By.ID, 'delete-checkbox')
@@ -15,7 +15,7 @@ class GroupInfoPage(Base):
     _irc_channel_locator = (By.ID, 'group-irc')
 
     def wait_for_page_to_load(self):
-        self.wait.until(lambda _: self.find_element(By.CSS_SELECTOR, 'html.js body#group-show'))
+        self.dom_wait.until_present((By.CSS_SELECTOR, 'html.js body#group-show'))
         return self
 
     def delete_group(self):
@@ -0,0 +1,165 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import re
+import time
+import uuid
+from multiprocessing.pool import ThreadPool
+from urlparse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from pages.html_tree import form_fields, parse, select
+from pages.link_crawler import LinkExtractor
+
+# 100ns intervals between the UUID epoch (1582-10-15) and the Unix epoch
+UUID_EPOCH_OFFSET = 0x01b21dd213814000
+
+
+class GroupProvisioningError(Exception):
+    pass
+
+
+def form_defaults(html, selector):
+    """Return what a browser would submit for the first form matching selector."""
+    forms = select(parse(html), selector)
+    return dict(form_fields(forms[0])) if forms else {}
+
+
+class GroupProvisioner(object):
+    """Creates groups by posting the create group form over HTTP.
+
+    Requests are made with the session cookies of a logged in browser. The
+    groups are remembered along with the session which created them, so
+    they can all be deleted concurrently with teardown. sweep deletes groups
+    of the same users left over by earlier runs which never tore down. Names
+    end in a time based UUID, which tells how old a leftover group is.
+    """
+
+    _edit_url_re = re.compile(r'/group/([^/]+)/edit/?$')
+    _group_url_re = re.compile(r'/group/([^/]+)/?$')
+
+    def __init__(self, base_url, locale='en-US', prefix='moz-group-', workers=8):
+        self.base_url = base_url
+        self.locale = locale
+        self.prefix = prefix
+        self.workers = workers
+        self.sessions = {}
+        self.created = []
+
+    def url(self, path):
+        return '%s/%s/%s' % (self.base_url, self.locale, path)
+
+    def session_for(self, selenium):
+        cookies = selenium.get_cookies()
+        key = tuple(sorted((c['name'], c['value']) for c in cookies))
+        if key not in self.sessions:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.workers)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            for cookie in cookies:
+                session.cookies.set(cookie['name'], cookie['value'], path=cookie.get('path', '/'))
+            self.sessions[key] = session
+        return self.sessions[key]
+
+    def create(self, selenium, name=None):
+        """Create a group as the browser's user and return its slug."""
+        name = name or '%s%s' % (self.prefix, uuid.uuid1())
+        session = self.session_for(selenium)
+        form_url = self.url('groups/add/')
+        r = session.get(form_url)
+        r.raise_for_status()
+        fields = form_defaults(r.text, 'form.add-group')
+        if 'csrfmiddlewaretoken' not in fields:
+            raise GroupProvisioningError('No CSRF token in the form at %s, is the user logged in?' % r.url)
+        fields['name'] = name
+        r = session.post(form_url, data=fields, headers={'Referer': form_url})
+        r.raise_for_status()
+        match = self._edit_url_re.search(r.url)
+        if match is None:
+            raise GroupProvisioningError('Creating %s ended up at %s' % (name, r.url))
+        slug = match.group(1)
+        self.created.append((session, slug))
+        return slug
+
+    def delete(self, session, slug):
+        """Delete the group, returning True unless it could not be.
+
+        The form's CSRF token is posted, which newer Django versions mask
+        so it differs from the csrftoken cookie.
+        """
+        edit_url = self.url('group/%s/edit/' % slug)
+        url = self.url('group/%s/delete/' % slug)
+        try:
+            r = session.get(edit_url)
+            # already gone, for example deleted by the test itself
+            if r.status_code == requests.codes.not_found:
+                return True
+            fields = form_defaults(r.text, 'form[action="%s"]' % urlsplit(url).path)
+            if 'csrfmiddlewaretoken' not in fields:
+                return False
+            r = session.post(url, data=fields, headers={'Referer': edit_url})
+        except requests.RequestException:
+            return False
+        return r.ok or r.status_code == requests.codes.not_found
+
+    def teardown(self):
+        """Delete all created groups, returning the slugs of those left."""
+        created, self.created = self.created, []
+        results = self._map(lambda args: self.delete(*args), created)
+        return [slug for (session, slug), deleted in zip(created, results) if not deleted]
+
+    def created_at(self, slug):
+        """Return when the group was created according to its name, if known."""
+        try:
+            created = uuid.UUID(slug[len(self.prefix):])
+        except ValueError:
+            return None
+        if created.version != 1:
+            return None
+        return (created.time - UUID_EPOCH_OFFSET) / 1e7
+
+    def orphans(self, session):
+        """Return slugs of groups named with our prefix found by searching."""
+        r = session.get(self.url('search/'), params={'q': self.prefix})
+        r.raise_for_status()
+        extractor = LinkExtractor()
+        extractor.feed(r.text)
+        slugs = []
+        for link in extractor.pop_links():
+            match = self._group_url_re.search(link.split('?')[0])
+            if match and match.group(1).startswith(self.prefix) and match.group(1) not in slugs:
+                slugs.append(match.group(1))
+        return slugs
+
+    def sweep(self, max_age=3600):
+        """Delete leftover groups which any of the known sessions can delete.
+
+        Only groups older than max_age seconds, or of unknown age, are
+        deleted so those of runs still in progress are left alone. Groups
+        curated by other users simply fail to delete. Groups created by
+        this provisioner are left to teardown, so sweep before tearing
+        down. Returns the deleted slugs.
+        """
+        ours = set(slug for session, slug in self.created)
+        found = []
+        for session in self.sessions.values():
+            for slug in self.orphans(session):
+                created = self.created_at(slug)
+                if slug not in ours and (created is None or time.time() - created > max_age):
+                    found.append((session, slug))
+        results = self._map(lambda args: self.delete(*args), found)
+        return [slug for (session, slug), deleted in zip(found, results) if deleted]
+
+    def _map(self, func, items):
+        if len(items) <= 1:
+            return [func(item) for item in items]
+        pool = ThreadPool(min(self.workers, len(items)))
+        try:
+            return pool.map(func, items)
+        finally:
+            pool.close()
+            pool.join()
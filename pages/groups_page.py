@@ -7,13 +7,16 @@ from selenium.webdriver.support import expected_conditions as expected
 
 from pages.base import Base
 from pages.create_group_page import CreateGroupPage
+from pages.navigation import navigates_to
 
 
 class GroupsPage(Base):
+    URL_TEMPLATE = '/{locale}/groups/'
 
     _create_group_main_button = (By.CLASS_NAME, 'large')
     _alert_message_locator = (By.CSS_SELECTOR, '.alert-info')
 
+    @navigates_to('pages.create_group_page.CreateGroupPage')
     def click_create_group_main_button(self):
         self.find_element(*self._create_group_main_button).click()
         return CreateGroupPage(self.selenium, self.base_url)
@@ -8,6 +8,7 @@ from pages.base import Base
 
 
 class Home(Base):
+    URL_TEMPLATE = '/{locale}'
 
     _groups_link_locator = (By.CSS_SELECTOR, 'section.groups > a')
     _functional_areas_link_locator = (By.CSS_SELECTOR, 'section.functional-areas > a')
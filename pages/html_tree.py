@@ -0,0 +1,453 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Parses HTML into a tree which can be searched like the browser's DOM.
+
+Only the standard library is used. find_elements takes the same
+strategies as WebDriver, with the subset of CSS our locators use:
+type, ID, class and attribute selectors, the four combinators, selector
+lists and the :first-child, :last-child, :nth-child(), :nth-of-type(),
+:first-of-type, :last-of-type and :not() pseudo-classes.
+
+Without style sheets whether an element is displayed can only be guessed
+from the hidden attribute, hidden inputs and inline styles, and its text
+is the text of such elements.
+"""
+
+import re
+from htmlentitydefs import name2codepoint
+from HTMLParser import HTMLParser
+
+VOID_TAGS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+    'param', 'source', 'track', 'wbr'])
+
+BLOCK_TAGS = frozenset([
+    'address', 'article', 'aside', 'blockquote', 'dd', 'details', 'dialog', 'div',
+    'dl', 'dt', 'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2',
+    'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol', 'option', 'p',
+    'pre', 'section', 'table', 'tr', 'ul'])
+
+# never rendered, whatever their style
+UNRENDERED_TAGS = frozenset(['head', 'noscript', 'script', 'style', 'template', 'title'])
+
+# start tags closing an open element of the given tags
+IMPLIED_END_TAGS = {
+    'li': ('li',),
+    'dt': ('dt', 'dd'),
+    'dd': ('dt', 'dd'),
+    'option': ('option',),
+    'tr': ('tr', 'td', 'th'),
+    'td': ('td', 'th'),
+    'th': ('td', 'th'),
+}
+
+# elements containing an open element of the given tags shield it from
+# being closed by the start tags above
+SCOPE_TAGS = frozenset(['ul', 'ol', 'dl', 'select', 'table', 'tbody', 'thead'])
+
+_whitespace_re = re.compile(r'\s+')
+
+_hidden_style_re = re.compile(r'(?:^|;)\s*(?:display\s*:\s*none|visibility\s*:\s*hidden)', re.I)
+
+
+class SelectorError(ValueError):
+    pass
+
+
+class UnsupportedLocator(ValueError):
+    pass
+
+
+class Element(object):
+    __slots__ = ('tag', 'attrs', 'children', 'parent')
+
+    def __init__(self, tag, attrs=None, parent=None):
+        self.tag = tag
+        self.attrs = attrs or {}
+        self.children = []
+        self.parent = parent
+
+    def __repr__(self):
+        return '<Element %s%s>' % (self.tag, '#' + self.attrs['id'] if 'id' in self.attrs else '')
+
+    def get(self, name, default=None):
+        return self.attrs.get(name, default)
+
+    @property
+    def classes(self):
+        return self.attrs.get('class', '').split()
+
+    @property
+    def elements(self):
+        return [c for c in self.children if isinstance(c, Element)]
+
+    def iter(self):
+        """Yields the descendants in document order."""
+        stack = list(reversed(self.elements))
+        while stack:
+            element = stack.pop()
+            yield element
+            stack.extend(reversed(element.elements))
+
+    def ancestors(self):
+        parent = self.parent
+        while parent is not None:
+            yield parent
+            parent = parent.parent
+
+    def text_content(self):
+        return u''.join(c if not isinstance(c, Element) else c.text_content()
+                        for c in self.children)
+
+    def is_displayed(self):
+        return all(e.is_rendered() for e in [self] + list(self.ancestors())
+                   if e.tag != '#document')
+
+    def is_rendered(self):
+        if self.tag in UNRENDERED_TAGS or 'hidden' in self.attrs:
+            return False
+        if self.tag == 'input' and self.attrs.get('type', '').lower() == 'hidden':
+            return False
+        return not _hidden_style_re.search(self.attrs.get('style', ''))
+
+    def inner_text(self):
+        """Returns the displayed text, like WebElement.text."""
+        if not self.is_displayed():
+            return u''
+        parts = []
+        self._collect_text(parts, self.tag == 'pre')
+        lines = (u' '.join(line.split()) for line in u''.join(parts).split(u'\n'))
+        return u'\n'.join(line for line in lines if line)
+
+    def _collect_text(self, parts, preformatted=False):
+        # source line breaks are spaces, lines break at br and blocks only
+        for child in self.children:
+            if not isinstance(child, Element):
+                parts.append(child if preformatted else _whitespace_re.sub(u' ', child))
+            elif child.tag == 'br':
+                parts.append(u'\n')
+            elif child.is_rendered():
+                block = child.tag in BLOCK_TAGS
+                if block:
+                    parts.append(u'\n')
+                child._collect_text(parts, preformatted or child.tag == 'pre')
+                if block:
+                    parts.append(u'\n')
+
+    def find_elements(self, by, value):
+        """Returns the descendants found with a WebDriver strategy."""
+        if by == 'css selector':
+            return select(self, value)
+        if by == 'id':
+            return [e for e in self.iter() if e.attrs.get('id') == value]
+        if by == 'name':
+            return [e for e in self.iter() if e.attrs.get('name') == value]
+        if by == 'class name':
+            return [e for e in self.iter() if value in e.classes]
+        if by == 'tag name':
+            return [e for e in self.iter() if e.tag == value.lower()]
+        if by in ('link text', 'partial link text'):
+            links = [e for e in self.iter() if e.tag == 'a']
+            if by == 'link text':
+                return [e for e in links if e.inner_text().strip() == value]
+            return [e for e in links if value in e.inner_text()]
+        raise UnsupportedLocator('Cannot find elements by %s without a browser' % by)
+
+
+class TreeBuilder(HTMLParser):
+
+    def __init__(self):
+        HTMLParser.__init__(self)
+        self.document = Element('#document')
+        self.current = self.document
+
+    def handle_starttag(self, tag, attrs):
+        self._close_implied(tag)
+        element = Element(tag, dict((k, v if v is not None else u'') for k, v in attrs),
+                          self.current)
+        self.current.children.append(element)
+        if tag not in VOID_TAGS:
+            self.current = element
+
+    def handle_startendtag(self, tag, attrs):
+        self._close_implied(tag)
+        self.current.children.append(Element(
+            tag, dict((k, v if v is not None else u'') for k, v in attrs), self.current))
+
+    def handle_endtag(self, tag):
+        element = self.current
+        while element is not None and element.tag != tag:
+            element = element.parent
+        if element is not None and element.parent is not None:
+            self.current = element.parent
+
+    def _close_implied(self, tag):
+        if tag in BLOCK_TAGS:
+            self._close(('p',))
+        if tag in IMPLIED_END_TAGS:
+            self._close(IMPLIED_END_TAGS[tag])
+
+    def _close(self, closed):
+        element = self.current
+        while element.parent is not None and element.tag not in SCOPE_TAGS:
+            if element.tag in closed:
+                self.current = element.parent
+                return
+            element = element.parent
+
+    def handle_data(self, data):
+        if data:
+            self.current.children.append(data)
+
+    def handle_entityref(self, name):
+        codepoint = name2codepoint.get(name)
+        self.handle_data(unichr(codepoint) if codepoint else u'&%s;' % name)
+
+    def handle_charref(self, name):
+        try:
+            self.handle_data(unichr(int(name[1:], 16) if name[:1] in 'xX' else int(name)))
+        except ValueError:
+            self.handle_data(u'&#%s;' % name)
+
+
+def parse(html):
+    """Parses an HTML document into a tree of Elements."""
+    if isinstance(html, bytes):
+        html = html.decode('utf-8', 'replace')
+    builder = TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.document
+
+
+def form_fields(form, submitter=None):
+    """Returns the (name, value) pairs a browser would submit for form.
+
+    Values are those of the parsed document, the defaults unless changed
+    in the tree. The submitter's own name and value are included if given.
+    """
+    fields = []
+    for element in form.iter():
+        name = element.get('name')
+        if not name or 'disabled' in element.attrs:
+            continue
+        if element.tag == 'input':
+            kind = element.get('type', 'text').lower()
+            if kind in ('checkbox', 'radio'):
+                if 'checked' in element.attrs:
+                    fields.append((name, element.get('value', 'on')))
+            elif kind not in ('submit', 'button', 'image', 'reset', 'file'):
+                fields.append((name, element.get('value', '')))
+        elif element.tag == 'textarea':
+            fields.append((name, element.get('value', element.text_content())))
+        elif element.tag == 'select':
+            options = [o for o in element.iter() if o.tag == 'option']
+            selected = [o for o in options if 'selected' in o.attrs] or options[:1]
+            fields.extend((name, o.get('value', o.text_content().strip())) for o in selected)
+    if submitter is not None and submitter.get('name'):
+        fields.append((submitter.get('name'), submitter.get('value', '')))
+    return fields
+
+
+# Selectors
+
+_token_re = re.compile(r"""
+    \s*(?P<combinator>[>+~,])\s*
+  | (?P<descendant>\s+)
+  | (?P<tag>\*|[a-zA-Z][\w-]*)
+  | \#(?P<id>[\w-]+)
+  | \.(?P<class>[\w-]+)
+  | \[\s*(?P<attr>[\w:-]+)\s*(?:(?P<op>[~^$*|]?=)\s*
+        (?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[^\]\s"']+))\s*)?\]
+  | :(?P<pseudo>[\w-]+)(?:\(\s*(?P<arg>[^)]*?)\s*\))?
+""", re.X)
+
+_nth_re = re.compile(r'^(?:(?P<a>[+-]?\d*)n\s*(?:(?P<sign>[+-])\s*(?P<b>\d+))?|(?P<only>[+-]?\d+))$')
+
+
+def _nth(arg):
+    arg = arg.replace(' ', '').lower()
+    if arg == 'odd':
+        return 2, 1
+    if arg == 'even':
+        return 2, 0
+    match = _nth_re.match(arg)
+    if match is None:
+        raise SelectorError('Invalid :nth argument %r' % arg)
+    if match.group('only') is not None:
+        return 0, int(match.group('only'))
+    a = match.group('a')
+    a = -1 if a == '-' else 1 if a in ('', '+') else int(a)
+    b = int(match.group('b') or 0) * (-1 if match.group('sign') == '-' else 1)
+    return a, b
+
+
+def _nth_matches(position, a, b):
+    if a == 0:
+        return position == b
+    return (position - b) % a == 0 and (position - b) // a >= 0
+
+
+def _position(element, of_type=False, from_end=False):
+    siblings = element.parent.elements if element.parent is not None else [element]
+    if of_type:
+        siblings = [e for e in siblings if e.tag == element.tag]
+    if from_end:
+        siblings = siblings[::-1]
+    return siblings.index(element) + 1
+
+
+class Compound(object):
+    """A sequence of simple selectors all matching one element."""
+
+    def __init__(self):
+        self.tests = []
+
+    def matches(self, element):
+        return all(test(element) for test in self.tests)
+
+    def add_tag(self, tag):
+        if tag != '*':
+            tag = tag.lower()
+            self.tests.append(lambda e: e.tag == tag)
+
+    def add_attribute(self, name, op=None, value=None):
+        name = name.lower()
+        if op is None:
+            self.tests.append(lambda e: name in e.attrs)
+            return
+        check = {
+            '=': lambda v: v == value,
+            '~=': lambda v: value in v.split(),
+            '^=': lambda v: bool(value) and v.startswith(value),
+            '$=': lambda v: bool(value) and v.endswith(value),
+            '*=': lambda v: bool(value) and value in v,
+            '|=': lambda v: v == value or v.startswith(value + '-'),
+        }[op]
+        self.tests.append(lambda e: name in e.attrs and check(e.attrs[name]))
+
+    def add_pseudo(self, name, arg):
+        name = name.lower()
+        if name == 'not':
+            if not arg:
+                raise SelectorError(':not() needs an argument')
+            inner = _parse_compound(arg)
+            self.tests.append(lambda e: not inner.matches(e))
+            return
+        if name in ('first-child', 'last-child', 'first-of-type', 'last-of-type'):
+            a, b = 0, 1
+        elif name in ('nth-child', 'nth-of-type', 'nth-last-child', 'nth-last-of-type'):
+            if not arg:
+                raise SelectorError(':%s() needs an argument' % name)
+            a, b = _nth(arg)
+        elif name == 'checked':
+            self.tests.append(lambda e: 'checked' in e.attrs or 'selected' in e.attrs)
+            return
+        else:
+            raise SelectorError('Unsupported pseudo-class :%s' % name)
+        of_type = name.endswith('of-type')
+        from_end = name.startswith(('last', 'nth-last'))
+        self.tests.append(lambda e: _nth_matches(_position(e, of_type, from_end), a, b))
+
+
+def _parse_compound(text):
+    compound = Compound()
+    position = 0
+    while position < len(text):
+        match = _token_re.match(text, position)
+        if match is None or match.group('combinator') or match.group('descendant'):
+            raise SelectorError('Invalid selector %r' % text)
+        _add_simple(compound, match)
+        position = match.end()
+    return compound
+
+
+def _add_simple(compound, match):
+    groups = match.groupdict()
+    if groups['tag']:
+        compound.add_tag(groups['tag'])
+    elif groups['id']:
+        compound.add_attribute('id', '=', groups['id'])
+    elif groups['class']:
+        compound.add_attribute('class', '~=', groups['class'])
+    elif groups['attr']:
+        value = next((v for v in (groups['dq'], groups['sq'], groups['bare']) if v is not None),
+                     None)
+        compound.add_attribute(groups['attr'], groups['op'], value)
+    else:
+        compound.add_pseudo(groups['pseudo'], groups['arg'])
+
+
+_selector_cache = {}
+
+
+def parse_selector(text):
+    """Parses a selector list into lists of (combinator, Compound) pairs.
+
+    The combinator is the one joining a compound to the one before it.
+    """
+    if text in _selector_cache:
+        return _selector_cache[text]
+    selectors = []
+    current = []
+    compound = None
+    combinator = None
+    position = 0
+    stripped = text.strip()
+    while position < len(stripped):
+        match = _token_re.match(stripped, position)
+        if match is None:
+            raise SelectorError('Invalid selector %r at %d' % (text, position))
+        position = match.end()
+        if match.group('combinator') or match.group('descendant'):
+            if compound is None:
+                raise SelectorError('Invalid selector %r' % text)
+            current.append((combinator, compound))
+            compound = None
+            combinator = match.group('combinator') or ' '
+            if combinator == ',':
+                selectors.append(current)
+                current, combinator = [], None
+            continue
+        if compound is None:
+            compound = Compound()
+        _add_simple(compound, match)
+    if compound is None:
+        raise SelectorError('Invalid selector %r' % text)
+    current.append((combinator, compound))
+    selectors.append(current)
+    _selector_cache[text] = selectors
+    return selectors
+
+
+def _matches(element, selector, index):
+    combinator, compound = selector[index]
+    if not compound.matches(element):
+        return False
+    if index == 0:
+        return True
+    if combinator == '>':
+        parent = element.parent
+        return parent is not None and parent.tag != '#document' and \
+            _matches(parent, selector, index - 1)
+    if combinator == ' ':
+        return any(_matches(a, selector, index - 1) for a in element.ancestors()
+                   if a.tag != '#document')
+    siblings = element.parent.elements
+    previous = siblings[:siblings.index(element)]
+    if combinator == '+':
+        return bool(previous) and _matches(previous[-1], selector, index - 1)
+    return any(_matches(s, selector, index - 1) for s in previous)
+
+
+def select(root, text):
+    """Returns the descendants of root matching the selector list.
+
+    Like querySelectorAll on an element, the whole selector is matched
+    against the document, only the results are limited to descendants.
+    """
+    selectors = parse_selector(text)
+    return [e for e in root.iter()
+            if any(_matches(e, s, len(s) - 1) for s in selectors)]
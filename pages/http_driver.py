@@ -0,0 +1,320 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from urllib import urlencode
+from urlparse import urljoin
+
+import requests
+from pypom.driver import registerDriver
+from pypom.selenium_driver import Selenium
+from selenium.common.exceptions import (InvalidSelectorException,
+                                        NoSuchElementException,
+                                        StaleElementReferenceException,
+                                        WebDriverException)
+from selenium.webdriver.common.keys import Keys
+from zope.interface import Interface
+
+from pages.html_tree import (SelectorError, UnsupportedLocator, form_fields,
+                             parse)
+
+SUBMIT_KEYS = (Keys.RETURN, Keys.ENTER)
+
+
+class HttpDriver(object):
+    """Stands in for WebDriver on pages which work without JavaScript.
+
+    Pages are requested with requests and parsed into a tree searched like
+    the browser's DOM, so page objects run unchanged as long as they only
+    read the server rendered HTML, follow links and submit forms. Anything
+    needing a script, such as execute_script, raises WebDriverException and
+    DomWait falls back to polling. The html element is given the js class
+    the site's scripts would add, which page objects wait for.
+
+    Displayed state and text are guessed without style sheets, see
+    pages.html_tree.
+    """
+
+    def __init__(self, session=None, timeout=30):
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.current_url = 'about:blank'
+        self.page_source = u''
+        self.document = parse(u'')
+        self.loads = 0
+        self._history = []
+
+    # Navigation
+
+    def get(self, url):
+        self._load(self.session.get(url, timeout=self.timeout))
+
+    def _load(self, response, remember=True):
+        if remember and self.current_url != 'about:blank':
+            self._history.append(self.current_url)
+        self.current_url = response.url
+        self.page_source = response.text
+        self.document = parse(response.text)
+        self.loads += 1
+        html = next((e for e in self.document.elements if e.tag == 'html'), None)
+        if html is not None:
+            html.attrs['class'] = ' '.join(html.classes + ['js'])
+
+    def refresh(self):
+        self._load(self.session.get(self.current_url, timeout=self.timeout), remember=False)
+
+    def back(self):
+        if self._history:
+            self._load(self.session.get(self._history.pop(), timeout=self.timeout),
+                       remember=False)
+
+    def submit(self, form, submitter=None):
+        data = [(k, v.encode('utf-8')) for k, v in form_fields(form, submitter)]
+        action = urljoin(self.current_url, form.get('action') or self.current_url)
+        if form.get('method', 'get').lower() == 'post':
+            response = self.session.post(action, data=data, timeout=self.timeout)
+        else:
+            response = self.session.get(
+                action.partition('?')[0] + '?' + urlencode(data), timeout=self.timeout)
+        self._load(response)
+
+    @property
+    def title(self):
+        title = next((e for e in self.document.iter() if e.tag == 'title'), None)
+        return u' '.join(title.text_content().split()) if title is not None else u''
+
+    # Finding elements
+
+    def find_element(self, by='id', value=None):
+        return _first(self.find_elements(by, value), by, value)
+
+    def find_elements(self, by='id', value=None):
+        return _find(self, self.document, by, value)
+
+    def _element(self, element):
+        return HttpElement(self, element)
+
+    # Cookies
+
+    def get_cookies(self):
+        return [{'name': c.name, 'value': c.value, 'path': c.path, 'domain': c.domain,
+                 'secure': bool(c.secure)} for c in self.session.cookies]
+
+    def add_cookie(self, cookie):
+        self.session.cookies.set(cookie['name'], cookie['value'], path=cookie.get('path', '/'))
+
+    def delete_cookie(self, name):
+        self.session.cookies.pop(name, None)
+
+    def delete_all_cookies(self):
+        self.session.cookies.clear()
+
+    # What needs a browser
+
+    def execute(self, command, params=None):
+        raise WebDriverException('%s needs a browser' % command)
+
+    def execute_script(self, script, *args):
+        raise WebDriverException('Scripts need a browser')
+
+    execute_async_script = execute_script
+
+    def set_script_timeout(self, timeout):
+        pass
+
+    def implicitly_wait(self, timeout):
+        pass
+
+    def quit(self):
+        self.session.close()
+
+    close = quit
+
+
+class HttpElement(object):
+
+    def __init__(self, driver, element):
+        self._driver = driver
+        self._document = driver.document
+        self._element = element
+
+    def __eq__(self, other):
+        return isinstance(other, HttpElement) and other._element is self._element
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return id(self._element)
+
+    @property
+    def element(self):
+        if self._driver.document is not self._document:
+            raise StaleElementReferenceException('The page was left since the element was found')
+        return self._element
+
+    @property
+    def tag_name(self):
+        return self.element.tag
+
+    @property
+    def text(self):
+        return self.element.inner_text()
+
+    def get_attribute(self, name):
+        element = self.element
+        if name in ('href', 'src') and name in element.attrs:
+            return urljoin(self._driver.current_url, element.attrs[name])
+        if name in ('checked', 'selected', 'disabled', 'hidden', 'required', 'multiple'):
+            return 'true' if name in element.attrs else None
+        if name in ('text', 'innerText'):
+            return element.inner_text()
+        if name == 'textContent':
+            return element.text_content()
+        if name == 'value' and element.tag == 'textarea':
+            return element.get('value', element.text_content())
+        return element.get(name)
+
+    def is_displayed(self):
+        return self.element.is_displayed()
+
+    def is_enabled(self):
+        return 'disabled' not in self.element.attrs
+
+    def is_selected(self):
+        element = self.element
+        return 'checked' in element.attrs or 'selected' in element.attrs
+
+    def find_element(self, by='id', value=None):
+        return _first(self.find_elements(by, value), by, value)
+
+    def find_elements(self, by='id', value=None):
+        return _find(self._driver, self.element, by, value)
+
+    def clear(self):
+        self.element.attrs['value'] = u''
+
+    def send_keys(self, *values):
+        element = self.element
+        text = u''.join(values)
+        typed = text
+        for key in SUBMIT_KEYS:
+            typed = typed.split(key)[0]
+        element.attrs['value'] = element.get('value', u'') + typed
+        if typed != text:
+            self.submit()
+
+    def click(self):
+        element = self.element
+        kind = element.get('type', 'submit' if element.tag == 'button' else '').lower()
+        if element.tag == 'a' and element.get('href') and \
+                not element.get('href').startswith(('#', 'javascript:')):
+            self._driver.get(urljoin(self._driver.current_url, element.get('href')))
+        elif element.tag == 'input' and kind == 'checkbox':
+            if element.attrs.pop('checked', None) is None:
+                element.attrs['checked'] = u''
+        elif element.tag == 'input' and kind == 'radio':
+            for other in self._form().iter():
+                if other.tag == 'input' and other.get('name') == element.get('name'):
+                    other.attrs.pop('checked', None)
+            element.attrs['checked'] = u''
+        elif element.tag == 'option':
+            select = next(a for a in element.ancestors() if a.tag == 'select')
+            for option in select.iter():
+                option.attrs.pop('selected', None)
+            element.attrs['selected'] = u''
+        elif element.tag in ('button', 'input') and kind in ('submit', 'image'):
+            self._driver.submit(self._form(), submitter=element)
+        else:
+            raise WebDriverException('Clicking a %s needs a browser' % element.tag)
+
+    def submit(self):
+        self._driver.submit(self._form())
+
+    def _form(self):
+        form = next((a for a in self.element.ancestors() if a.tag == 'form'), None)
+        if form is None:
+            raise WebDriverException('The element is not in a form')
+        return form
+
+
+class FrozenDriver(HttpDriver):
+    """A parsed copy of the page a WebDriver is on, to read from at once.
+
+    Elements are found in the copy, so they cannot be interacted with and
+    the copy does not change when the page does.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.session = None
+        self.timeout = 0
+        self.current_url = driver.current_url
+        self.page_source = driver.page_source
+        self.document = parse(self.page_source)
+        self.loads = 0
+        self._history = []
+
+    def _frozen(self, *args, **kwargs):
+        raise WebDriverException('The page is frozen')
+
+    get = refresh = back = submit = _frozen
+
+    def _element(self, element):
+        return FrozenElement(self, element)
+
+    def quit(self):
+        pass
+
+    close = quit
+
+
+class FrozenWait(object):
+    """Stands in for WebDriverWait on a frozen page, which cannot change."""
+
+    def until(self, method, message=''):
+        raise WebDriverException('Waiting on a frozen page would only time out')
+
+    until_not = until
+
+
+class FrozenElement(HttpElement):
+
+    def _frozen(self, *args, **kwargs):
+        raise WebDriverException('The page is frozen')
+
+    click = clear = send_keys = submit = _frozen
+
+
+def _find(driver, root, by, value):
+    try:
+        return [driver._element(e) for e in root.find_elements(by, value)]
+    except SelectorError as e:
+        raise InvalidSelectorException(str(e))
+    except UnsupportedLocator as e:
+        raise WebDriverException(str(e))
+
+
+def _first(elements, by, value):
+    if not elements:
+        raise NoSuchElementException('Unable to locate element: %s=%s' % (by, value))
+    return elements[0]
+
+
+class IHttpDriver(Interface):
+    """Marker interface for HttpDriver"""
+
+
+class IFrozenDriver(Interface):
+    """Marker interface for FrozenDriver"""
+
+
+class FrozenSelenium(Selenium):
+
+    def wait_factory(self, timeout):
+        return FrozenWait()
+
+
+# PyPOM finds elements and waits through the same adapter as for Selenium
+registerDriver(IHttpDriver, Selenium, class_implements=[HttpDriver])
+registerDriver(IFrozenDriver, FrozenSelenium, class_implements=[FrozenDriver])
@@ -0,0 +1,114 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from urlparse import parse_qsl, urlparse
+
+import requests
+from selenium.common.exceptions import NoSuchElementException
+
+from tests import restmail
+
+
+class HttpLoginError(Exception):
+    pass
+
+
+class HttpLogin(object):
+    """Logs in by email over HTTP instead of through the Auth0 lock.
+
+    The sign in link is followed to the provider's authorize endpoint,
+    whose parameters are sent to /passwordless/start as the lock would.
+    This is the same for the Auth0 and Legacy variants, which differ only
+    in how the lock looks. The mailed link is then followed back to the
+    site and the site's session cookies are handed to the browser.
+    """
+
+    def __init__(self, inbox=restmail.inbox, timeout=30, mail_timeout=60):
+        self.enabled = False
+        self.inbox = inbox
+        self.timeout = timeout
+        self.mail_timeout = mail_timeout
+        self.logins = 0
+        self.fallbacks = 0
+
+    def authorize(self, session, sign_in_url):
+        """Return the provider's URL and the site's authorize parameters."""
+        response = session.get(sign_in_url, timeout=self.timeout)
+        response.raise_for_status()
+        for r in response.history + [response]:
+            url = urlparse(r.url)
+            if url.path.endswith('/authorize'):
+                return '%s://%s' % (url.scheme, url.netloc), dict(parse_qsl(url.query))
+        raise HttpLoginError('Signing in at %s did not lead to an authorize endpoint' % sign_in_url)
+
+    def request_login_link(self, session, sign_in_url, email):
+        provider, params = self.authorize(session, sign_in_url)
+        if 'client_id' not in params:
+            raise HttpLoginError('No client_id in the authorize parameters')
+        response = session.post(provider + '/passwordless/start', json={
+            'client_id': params.pop('client_id'),
+            'connection': 'email',
+            'email': email,
+            'send': 'link',
+            'authParams': params}, timeout=self.timeout)
+        if not response.ok:
+            raise HttpLoginError('Requesting a login link failed with %s: %s' % (
+                response.status_code, response.text[:200]))
+
+    def session_cookies(self, sign_in_url, email):
+        """Log in and return the site's cookies in WebDriver's format."""
+        session = requests.Session()
+        # a late mail of an earlier attempt carries another login's state
+        self.inbox.clear(email)
+        self.request_login_link(session, sign_in_url, email)
+        link = self.inbox.login_link(email, timeout=self.mail_timeout)
+        if link is None:
+            raise HttpLoginError('No login link in the mail to %s' % email)
+        session.get(link, timeout=self.timeout).raise_for_status()
+        host = urlparse(sign_in_url).hostname
+        cookies = []
+        for cookie in session.cookies:
+            domain = cookie.domain.lstrip('.')
+            if host != domain and not host.endswith('.' + domain):
+                continue
+            cookies.append(dict((k, v) for k, v in (
+                ('name', cookie.name),
+                ('value', cookie.value),
+                ('path', cookie.path),
+                ('secure', bool(cookie.secure)),
+                ('httpOnly', cookie.has_nonstandard_attr('HttpOnly')),
+                ('expiry', cookie.expires)) if v is not None))
+        return cookies
+
+    def login(self, page, email):
+        """Log the page's browser in, returning False if it did not work.
+
+        Does nothing unless enabled, so the browser login can be used.
+        """
+        if not self.enabled:
+            return False
+        try:
+            sign_in_url = page.find_element(*page._sign_in_button_locator).get_attribute('href')
+            cookies = self.session_cookies(sign_in_url, email)
+        except (HttpLoginError, NoSuchElementException, requests.RequestException,
+                restmail.MailTimeout):
+            self.fallbacks += 1
+            return False
+        for cookie in cookies:
+            page.selenium.add_cookie(cookie)
+        page.selenium.get(page.selenium.current_url)
+        if page.is_user_loggedin:
+            self.logins += 1
+            return True
+        page.selenium.delete_all_cookies()
+        page.selenium.get(page.selenium.current_url)
+        self.fallbacks += 1
+        return False
+
+    @property
+    def stats(self):
+        return {'logins': self.logins, 'fallbacks': self.fallbacks}
+
+
+http_login = HttpLogin()
@@ -8,6 +8,7 @@ from pages.base import Base
 
 
 class Invite(Base):
+    URL_TEMPLATE = '/{locale}/invite/'
 
     _recipient_field_locator = (By.ID, 'id_recipient')
     _vouch_reason_field_locator = (By.ID, 'id_description')
@@ -0,0 +1,126 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import time
+
+STAT_KEYS = ('hits', 'revalidated', 'fetched')
+
+
+class LinkCache(object):
+    """On-disk record of links that were last seen working.
+
+    Each URL maps to its ETag, Last-Modified, status, final URL and the
+    time it was checked. Entries younger than ttl are trusted without a
+    request, older ones are revalidated with a conditional request.
+
+    LinkCrawler checks links on several threads, so changes and counts go
+    through a lock.
+    """
+
+    def __init__(self, path='.link_cache.json', ttl=3600):
+        self.path = path
+        self.ttl = ttl
+        self.enabled = True
+        self.stats = dict.fromkeys(STAT_KEYS, 0)
+        self._entries = None
+        self._updated = {}
+        self._lock = threading.Lock()
+
+    @property
+    def entries(self):
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._read()
+            return self._entries
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (IOError, ValueError):
+            return {}
+
+    def get(self, url):
+        if not self.enabled:
+            return None
+        return self.entries.get(url)
+
+    def is_fresh(self, entry):
+        return entry is not None and time.time() - entry['checked'] < self.ttl
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, response):
+        if not self.enabled:
+            return
+        entries = self.entries
+        with self._lock:
+            self._store(entries, url, response)
+
+    def _store(self, entries, url, response):
+        entry = entries.get(url, {})
+        entry.update({
+            'status': response.status_code,
+            'final_url': response.url,
+            'checked': time.time()})
+        # a 304 carries no validators of its own, keep the previous ones
+        if response.status_code != 304:
+            entry['etag'] = response.headers.get('ETag')
+            entry['last_modified'] = response.headers.get('Last-Modified')
+        entries[url] = entry
+        self._updated[url] = entry
+
+    def discard(self, url):
+        if self.enabled:
+            entries = self.entries
+            with self._lock:
+                entries.pop(url, None)
+                self._updated[url] = None
+
+    def count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def save(self):
+        """Merge this process' changes into the cache file.
+
+        Every xdist worker saves its own changes, so the file is re-read
+        and replaced atomically while holding a lock on path.lock, as
+        tests.user_leases does.
+        """
+        if not self.enabled or not self._updated:
+            return
+        with open(self.path + '.lock', 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            entries = self._read()
+            for url, entry in self._updated.items():
+                if entry is None:
+                    entries.pop(url, None)
+                else:
+                    entries[url] = entry
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp = tempfile.mkstemp(dir=directory)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entries, f, indent=2, sort_keys=True)
+            os.rename(tmp, self.path)
+        self._updated = {}
+
+    def add_stats(self, stats):
+        for key in STAT_KEYS:
+            self.stats[key] += stats.get(key, 0)
+
+
+cache = LinkCache()
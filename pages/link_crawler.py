@@ -2,14 +2,139 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+import hashlib
+import re
+import time
+import urllib
+from collections import namedtuple
+from HTMLParser import HTMLParser
+from multiprocessing.pool import ThreadPool
+from urlparse import parse_qsl, urljoin, urlsplit, urlunsplit
+
 import requests
-from BeautifulSoup import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from pages.link_cache import cache as link_cache
+
+
+class LinkStatus(namedtuple('LinkStatus', 'url status reason latency final_url')):
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return self.status in (requests.codes.ok, requests.codes.not_modified)
+
+    @property
+    def message(self):
+        return u'{0.final_url} returned: {0.status} {0.reason}'.format(self)
+
+
+class CrawlReport(namedtuple('CrawlReport', 'graph pages external')):
+    """Result of LinkCrawler.crawl.
+
+    graph maps every crawled page to the links found on it, while pages and
+    external hold a LinkStatus for each crawled page and checked external
+    link respectively.
+    """
+    __slots__ = ()
+
+    @property
+    def broken(self):
+        return [r for r in self.pages + self.external if not r.ok]
+
+    def referrers(self, url):
+        return [page for page, links in self.graph.items() if url in links]
+
+
+class LinkExtractor(HTMLParser):
+    """Incrementally collects hrefs of anchors inside one container.
+
+    The container is the first element matching the tag name (any tag if
+    name is True) and all of the given attributes. Only elements with the
+    same tag name are counted to find its end, as void elements such as
+    <br> have no closing tag.
+    """
+
+    def __init__(self, name=True, attrs=None):
+        HTMLParser.__init__(self)
+        self.name = name
+        self.attrs = attrs or {}
+        self.tag = None
+        self.depth = 0
+        self.done = False
+        self.links = []
+
+    def matches(self, tag, attrs):
+        if self.name is not True and tag != self.name:
+            return False
+        attrs = dict(attrs)
+        for key, value in self.attrs.items():
+            if key == 'class':
+                if not set(value.split()) <= set((attrs.get(key) or '').split()):
+                    return False
+            elif attrs.get(key) != value:
+                return False
+        return True
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if self.tag is None:
+            if self.matches(tag, attrs):
+                self.tag = tag
+                self.depth = 1
+            return
+        if tag == self.tag:
+            self.depth += 1
+        elif tag == 'a':
+            href = dict(attrs).get('href')
+            if href is not None:
+                self.links.append(href)
+
+    def handle_endtag(self, tag):
+        if self.tag is not None and not self.done and tag == self.tag:
+            self.depth -= 1
+            self.done = self.depth == 0
+
+    def pop_links(self):
+        links, self.links = self.links, []
+        return links
+
+
+class LocaleExtractor(HTMLParser):
+    """Collects the locales offered by the footer's language selector."""
+
+    def __init__(self):
+        HTMLParser.__init__(self)
+        self.in_select = False
+        self.locales = set()
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'select':
+            self.in_select = attrs.get('id') == 'language'
+        elif tag == 'option' and self.in_select and attrs.get('value'):
+            self.locales.add(attrs['value'])
+
+    def handle_endtag(self, tag):
+        if tag == 'select':
+            self.in_select = False
 
 
 class LinkCrawler(object):
 
-    def __init__(self, base_url):
+    _ignored_schemes = ('mailto', 'javascript', 'tel', 'irc', 'data')
+
+    def __init__(self, base_url, workers=8, cache=link_cache, locales=None):
         self.base_url = base_url
+        self.workers = workers
+        self.cache = cache
+        self._locales = locales
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=workers, pool_maxsize=workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
 
     def collect_links(self, url, relative=True, name=True, **kwargs):
         """Collects links for given page URL.
@@ -19,9 +144,14 @@ class LinkCrawler(object):
         Use kwargs to pass id of element or its class name.
         Because 'class' is a reserved keyword in Python,
         you need to pass class as: **{'class': 'container row'}.
+        """
+        return list(self.iter_links(url, relative, name, **kwargs))
 
-        Read more about searching elements with BeautifulSoup.
-        See: http://goo.gl/85BuZ
+    def iter_links(self, url, relative=True, name=True, chunk_size=8192, **kwargs):
+        """Yields links for given page URL while the page is downloading.
+
+        Takes the same arguments as collect_links. The download stops as
+        soon as the matching element has been closed.
         """
 
         # support for relative URLs
@@ -29,21 +159,176 @@ class LinkCrawler(object):
             url = '%s%s' % (self.base_url, url)
 
         # get the page and verify status code is OK
-        r = requests.get(url)
-        assert requests.codes.ok == r.status_code
+        r = self.session.get(url, stream=True)
+        try:
+            assert requests.codes.ok == r.status_code
+            r.encoding = r.encoding or 'utf-8'
+            extractor = LinkExtractor(name, kwargs)
+            for chunk in r.iter_content(chunk_size, decode_unicode=True):
+                extractor.feed(chunk)
+                for u in extractor.pop_links():
+                    # prepend base_url to relative links
+                    yield u if u.startswith('http') else '%s%s' % (self.base_url, u)
+                if extractor.done:
+                    break
+        finally:
+            r.close()
+
+    def check(self, url):
+        """Returns a LinkStatus for the given URL.
+
+        A HEAD request is tried first, falling back to GET for servers that
+        do not answer HEAD requests properly. Links verified recently are not
+        requested at all, and known links are requested conditionally so an
+        unchanged page answers with 304 Not Modified.
+        """
+        entry = self.cache.get(url)
+        if self.cache.is_fresh(entry):
+            self.cache.count('hits')
+            return LinkStatus(url, entry['status'], 'cached', 0, entry['final_url'])
+        headers = self.cache.conditional_headers(entry)
+        start = time.time()
+        try:
+            r = self.session.head(url, headers=headers, allow_redirects=True, verify=False)
+            if r.status_code not in (requests.codes.ok, requests.codes.not_modified):
+                # only the status is needed, so leave the body unread
+                r = self.session.get(url, headers=headers, verify=False, stream=True)
+                r.close()
+        except requests.RequestException as e:
+            self.cache.discard(url)
+            return LinkStatus(url, None, repr(e), time.time() - start, url)
+        result = LinkStatus(url, r.status_code, r.reason, time.time() - start, r.url)
+        if result.ok:
+            self.cache.store(url, r)
+            self.cache.count(
+                'revalidated' if r.status_code == requests.codes.not_modified else 'fetched')
+        else:
+            self.cache.discard(url)
+        return result
+
+    def verify_many(self, urls):
+        """Checks URLs concurrently and returns a LinkStatus for each.
+
+        Duplicate URLs are only checked once, and results are returned in
+        the order the URLs were first seen.
+        """
+        unique_urls = []
+        for url in urls:
+            if url not in unique_urls:
+                unique_urls.append(url)
+        return self._map(self.check, unique_urls)
 
-        # collect links
-        parsed_html = BeautifulSoup(r.text)
-        urls = [anchor['href'] for anchor in
-                parsed_html.find(name, attrs=kwargs).findAll('a')]
+    def _map(self, func, items):
+        pool = ThreadPool(min(self.workers, len(items)) or 1)
+        try:
+            return pool.map(func, items)
+        finally:
+            pool.close()
+
+    @property
+    def locales(self):
+        """The locales the site is offered in, read from its language selector."""
+        if self._locales is None:
+            extractor = LocaleExtractor()
+            try:
+                r = self.session.get('%s/' % self.base_url, verify=False)
+                extractor.feed(r.text)
+            except requests.RequestException:
+                pass
+            self._locales = extractor.locales
+        return self._locales
+
+    def normalize(self, url):
+        """Returns a key identifying the page behind a URL.
+
+        The locale prefix, fragment and trailing slash are dropped and query
+        parameters are sorted, so /en-US/about/ and /fr/about#top are one page.
+        Only locales the site offers count as a prefix.
+        """
+        scheme, netloc, path, query, _ = urlsplit(url)
+        segments = path.split('/')
+        if len(segments) > 1 and segments[1] in self.locales:
+            del segments[1]
+        path = '/'.join(segments).rstrip('/') or '/'
+        query = urllib.urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+        return urlunsplit((scheme.lower(), netloc.lower(), path, query, ''))
+
+    def is_internal(self, url):
+        return urlsplit(url).netloc.lower() == urlsplit(self.base_url).netloc.lower()
+
+    def _fetch_page(self, url):
+        """Returns the LinkStatus of a page and the absolute links on it."""
+        start = time.time()
+        try:
+            r = self.session.get(url, verify=False, stream=True)
+        except requests.RequestException as e:
+            return LinkStatus(url, None, repr(e), time.time() - start, url), []
+        links = []
+        try:
+            if r.status_code == requests.codes.ok and \
+                    'html' in r.headers.get('Content-Type', ''):
+                r.encoding = r.encoding or 'utf-8'
+                extractor = LinkExtractor()
+                for chunk in r.iter_content(8192, decode_unicode=True):
+                    extractor.feed(chunk)
+                for href in extractor.pop_links():
+                    link = urljoin(r.url, href.strip())
+                    if urlsplit(link).scheme not in self._ignored_schemes:
+                        links.append(link.partition('#')[0])
+        finally:
+            r.close()
+        return LinkStatus(url, r.status_code, r.reason, time.time() - start, r.url), links
+
+    def crawl(self, start_paths=('/',), max_depth=3, max_pages=200,
+              exclude=(r'/logout',), check_external=True):
+        """Walks the site breadth first and returns a CrawlReport.
+
+        Internal pages are fetched concurrently a level at a time, up to
+        max_depth levels and max_pages pages. External links are checked
+        once each but never followed. Paths matching any of the exclude
+        patterns are neither fetched nor checked.
+        """
+        exclude = [re.compile(pattern) for pattern in exclude]
+        # store short digests instead of whole URLs to keep the set compact
+        visited = set()
+
+        def first_visit(url):
+            digest = hashlib.md5(self.normalize(url).encode('utf-8')).digest()[:8]
+            if digest in visited:
+                return False
+            visited.add(digest)
+            return True
 
-        # prepend base_url to relative links
-        return map(
-            lambda u: u if u.startswith('http') else '%s%s' % (self.base_url, u), urls)
+        graph = {}
+        pages = []
+        external = []
+        frontier = [u for u in ('%s%s' % (self.base_url, p) for p in start_paths)
+                    if first_visit(u)]
+        for depth in range(max_depth + 1):
+            frontier = frontier[:max_pages - len(pages)]
+            if not frontier:
+                break
+            next_frontier = []
+            for status, links in self._map(self._fetch_page, frontier):
+                pages.append(status)
+                graph[status.url] = links
+                if depth == max_depth:
+                    continue
+                for link in links:
+                    if any(p.search(urlsplit(link).path) for p in exclude):
+                        continue
+                    if not first_visit(link):
+                        continue
+                    if self.is_internal(link):
+                        next_frontier.append(link)
+                    elif check_external:
+                        external.append(link)
+            frontier = next_frontier
+        return CrawlReport(graph, pages, self.verify_many(external))
 
     def verify_status_code_is_ok(self, url):
-        r = requests.get(url, verify=False)
-        if not r.status_code == requests.codes.ok:
-            return u'{0.url} returned: {0.status_code} {0.reason}'.format(r)
+        result = self.check(url)
+        if not result.ok:
+            return result.message
         else:
             return True
@@ -0,0 +1,175 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Counts what every page object locator matches in saved HTML.
+
+Run as python -m pages.locator_health with a directory of snapshots, each
+named after the page class it shows, such as Profile.html or
+Profile.private.html, to check that page's locators including those of
+its regions and base classes. Snapshots named otherwise are checked
+against every locator. With --url a single page is requested instead.
+
+Region locators are searched for in the whole document rather than
+below their region's root, so their counts can be too high. XPath is
+not supported and reported as such.
+"""
+
+import argparse
+import glob
+import importlib
+import inspect
+import io
+import os
+import pkgutil
+import sys
+import time
+from collections import namedtuple
+
+import requests
+from pypom import Page, Region
+from selenium.webdriver.common.by import By
+
+from pages.html_tree import SelectorError, UnsupportedLocator, parse
+
+STRATEGIES = frozenset(v for k, v in vars(By).items() if k.isupper())
+
+
+class Locator(namedtuple('Locator', 'page owner attribute by value')):
+    """A locator declared on owner, a page class or a region within page."""
+    __slots__ = ()
+
+    @property
+    def name(self):
+        return '{0}.{1}'.format(self.owner, self.attribute)
+
+
+class Check(namedtuple('Check', 'snapshot locator count error')):
+    """How many elements a locator matched in a snapshot.
+
+    count is None if the locator could not be evaluated, with the reason
+    in error.
+    """
+    __slots__ = ()
+
+    @property
+    def status(self):
+        if self.count is None:
+            return self.error
+        return str(self.count) if self.count else 'missing'
+
+
+def page_classes():
+    """Every page and region class defined in the modules under pages."""
+    import pages
+    found = []
+    for _, name, _ in pkgutil.iter_modules(pages.__path__):
+        module = importlib.import_module('pages.' + name)
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ == module.__name__ and issubclass(cls, (Page, Region)):
+                found.append(cls)
+    return found
+
+
+def _declared(cls, owner, page):
+    for attribute, value in sorted(vars(cls).items()):
+        if attribute.startswith('_') and isinstance(value, tuple) and len(value) == 2 and \
+                value[0] in STRATEGIES:
+            yield Locator(page, owner, attribute, value[0], value[1])
+        elif inspect.isclass(value) and issubclass(value, (Page, Region)):
+            for locator in _declared(value, '{0}.{1}'.format(owner, attribute), page):
+                yield locator
+
+
+def locators(cls):
+    """The locators of a page or region class, with inherited ones."""
+    found = []
+    for base in reversed(inspect.getmro(cls)):
+        if base not in (object, Page, Region) and issubclass(base, (Page, Region)):
+            found.extend(_declared(base, base.__name__, cls.__name__))
+    return found
+
+
+def all_locators(classes):
+    """The locators declared by any of the classes, each once."""
+    return [locator for cls in classes for locator in _declared(cls, cls.__name__, cls.__name__)]
+
+
+def check(snapshot, document, located):
+    checks = []
+    for locator in located:
+        try:
+            count = len(document.find_elements(locator.by, locator.value))
+        except UnsupportedLocator:
+            checks.append(Check(snapshot, locator, None, 'unsupported'))
+        except SelectorError:
+            checks.append(Check(snapshot, locator, None, 'invalid'))
+        else:
+            checks.append(Check(snapshot, locator, count, None))
+    return checks
+
+
+def check_snapshots(paths, classes=None):
+    """Check each snapshot against the locators of the page it is named after."""
+    classes = dict((cls.__name__, cls) for cls in classes or page_classes())
+    every = all_locators(classes.values())
+    checks = []
+    for path in paths:
+        snapshot = os.path.basename(path)
+        cls = classes.get(snapshot.partition('.')[0])
+        with io.open(path, encoding='utf-8', errors='replace') as f:
+            document = parse(f.read())
+        checks.extend(check(snapshot, document, locators(cls) if cls else every))
+    return checks
+
+
+def report(checks, out, missing_only=False):
+    for c in checks:
+        if not missing_only or not c.count:
+            out.write(u'{0:<28} {1:>11}  {2:<60} {3}\n'.format(
+                c.snapshot, c.status, c.locator.name, c.locator.value))
+    missing = sum(1 for c in checks if c.count == 0)
+    failed = sum(1 for c in checks if c.count is None)
+    out.write(u'{0} checks, {1} matched nothing, {2} could not be evaluated\n'.format(
+        len(checks), missing, failed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('snapshots', nargs='?', metavar='path',
+                        help='directory of saved pages, or a single page.')
+    parser.add_argument('--url',
+                        help='request this page instead of reading snapshots.')
+    parser.add_argument('--page', metavar='class',
+                        help='page class the URL shows. (default: check every locator)')
+    parser.add_argument('--missing', action='store_true', default=False,
+                        help='only list locators matching nothing.')
+    args = parser.parse_args()
+    start = time.time()
+    if args.url:
+        classes = dict((cls.__name__, cls) for cls in page_classes())
+        if args.page and args.page not in classes:
+            parser.error('unknown page class {0}'.format(args.page))
+        try:
+            response = requests.get(args.url, timeout=30)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            parser.error('could not request {0}: {1}'.format(args.url, e))
+        located = locators(classes[args.page]) if args.page else all_locators(classes.values())
+        checks = check(args.page or args.url, parse(response.text), located)
+    elif args.snapshots:
+        if not os.path.exists(args.snapshots):
+            parser.error('no such file or directory: {0}'.format(args.snapshots))
+        paths = [args.snapshots]
+        if os.path.isdir(args.snapshots):
+            paths = sorted(glob.glob(os.path.join(args.snapshots, '*.htm*')))
+        checks = check_snapshots(paths)
+    else:
+        parser.error('give a snapshot directory or --url')
+    out = io.open(sys.stdout.fileno(), 'w', encoding='utf-8', closefd=False)
+    report(checks, out, args.missing)
+    out.write(u'in {0:.2f}s\n'.format(time.time() - start))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import time
+
+# Only these keys are accepted by add_cookie across drivers; the domain is
+# left out so the cookie is scoped to whatever page the browser is on.
+COOKIE_KEYS = ('name', 'value', 'path', 'secure', 'httpOnly', 'expiry')
+
+
+class LoginCache(object):
+    """Session cookies of logged in users, keyed by (base_url, email).
+
+    There is one cache per process, so each xdist worker keeps its own.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._cookies = {}
+
+    def get(self, base_url, email):
+        cookies = self._cookies.get((base_url, email))
+        if cookies is None:
+            return None
+        now = time.time()
+        if any(c.get('expiry') and c['expiry'] <= now for c in cookies):
+            self.invalidate(base_url, email)
+            return None
+        return cookies
+
+    def set(self, base_url, email, cookies):
+        self._cookies[(base_url, email)] = [
+            dict((k, c[k]) for k in COOKIE_KEYS if k in c) for c in cookies]
+
+    def invalidate(self, base_url, email):
+        self._cookies.pop((base_url, email), None)
+
+    def restore(self, page, email):
+        """Inject cached cookies into the browser and verify the session.
+
+        Returns True when the user is logged in after a single reload.
+        """
+        if not self.enabled:
+            return False
+        cookies = self.get(page.base_url, email)
+        if cookies is None:
+            self.misses += 1
+            return False
+        for cookie in cookies:
+            page.selenium.add_cookie(cookie)
+        page.selenium.get(page.selenium.current_url)
+        if page.is_user_loggedin:
+            self.hits += 1
+            return True
+        # The server rejected the session, start over with a clean slate
+        self.invalidate(page.base_url, email)
+        page.selenium.delete_all_cookies()
+        page.selenium.get(page.selenium.current_url)
+        self.misses += 1
+        return False
+
+    def save(self, page, email):
+        if self.enabled:
+            self.set(page.base_url, email, page.selenium.get_cookies())
+
+    @property
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+cache = LoginCache()
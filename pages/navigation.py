@@ -0,0 +1,177 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import heapq
+import importlib
+import inspect
+import itertools
+import pkgutil
+from collections import namedtuple
+from string import Formatter
+
+from pypom import Page, Region
+
+# Rough WebDriver commands per step: a load is a get and a wait for the
+# page, a link a find, a click and the wait, and a menu item additionally
+# opens the dropdown and waits for it twice.
+DIRECT_COST = 2
+LINK_COST = 3
+MENU_COST = 7
+
+
+def navigates_to(target, cost=LINK_COST):
+    """Declare that a page or region method clicks through to target.
+
+    The target is given by dotted name, as the page modules import each
+    other lazily.
+    """
+    def decorate(method):
+        method.navigates_to = target
+        method.navigation_cost = cost
+        return method
+    return decorate
+
+
+class Route(namedtuple('Route', 'source target region method cost')):
+    """A step from source to target, by loading its URL if method is None."""
+
+    @property
+    def direct(self):
+        return self.method is None
+
+    def follow(self, page, url_kwargs):
+        if self.direct:
+            locale = page.url_kwargs.get('locale', 'en-US')
+            return self.target(page.selenium, page.base_url, locale=locale, **url_kwargs).open()
+        view = getattr(page, self.region) if self.region else page
+        return getattr(view, self.method)().wait_for_page_to_load()
+
+    def __str__(self):
+        if self.direct:
+            return 'open {0}'.format(self.target.__name__)
+        return '.'.join(filter(None, [self.source.__name__, self.region, self.method]))
+
+
+class Navigator(object):
+    """Finds the cheapest way to a page through links, menus or its URL.
+
+    Every page class under pages is a node. Methods decorated with
+    navigates_to add an edge from the page they are on, or whose region
+    they belong to, and every page declaring a URL_TEMPLATE can be loaded
+    from anywhere. Links land on a page the site chooses, such as the
+    user's own profile, so they are only taken when no URL arguments were
+    asked for.
+    """
+
+    def __init__(self):
+        self.navigations = 0
+        self.direct = 0
+        self.saved = 0
+        self._pages = None
+        self._routes = {}
+
+    @property
+    def pages(self):
+        if self._pages is None:
+            import pages
+            from pages.base import Base
+            for _, name, _ in pkgutil.iter_modules(pages.__path__):
+                importlib.import_module('pages.' + name)
+            self._pages = set()
+            stack = [Base]
+            while stack:
+                cls = stack.pop()
+                self._pages.add(cls)
+                stack.extend(cls.__subclasses__())
+        return self._pages
+
+    def routes(self, source):
+        """The routes clicking through from a page of class source."""
+        if source not in self._routes:
+            routes = []
+            for cls in inspect.getmro(source):
+                for name, value in vars(cls).items():
+                    if inspect.isclass(value) and issubclass(value, (Page, Region)) and \
+                            isinstance(getattr(source, name.lower(), None), property):
+                        routes.extend(self._declared(source, value, name.lower()))
+                routes.extend(self._declared(source, cls, None))
+            self._routes[source] = routes
+        return self._routes[source]
+
+    def _declared(self, source, cls, region):
+        for name, method in vars(cls).items():
+            target = getattr(method, 'navigates_to', None)
+            if target is not None:
+                module, _, attribute = target.rpartition('.')
+                target = getattr(importlib.import_module(module), attribute)
+                yield Route(source, target, region, name, method.navigation_cost)
+
+    def url_template(self, cls):
+        """The URL_TEMPLATE the page declares, or None if it has none.
+
+        Pages inherit Base.URL_TEMPLATE, the home page, without being there.
+        """
+        from pages.base import Base
+        for c in inspect.getmro(cls):
+            if c is Base:
+                return None
+            if 'URL_TEMPLATE' in vars(c):
+                return vars(c)['URL_TEMPLATE']
+        return None
+
+    def can_open(self, cls, url_kwargs):
+        template = self.url_template(cls)
+        if template is None:
+            return False
+        fields = set(field for _, field, _, _ in Formatter().parse(template) if field)
+        return fields <= set(url_kwargs) | {'locale'}
+
+    def path(self, source, target, url_kwargs, direct=True):
+        """The cheapest list of routes from source to target, or None."""
+        order = itertools.count()
+        queue = [(0, next(order), [], source)]
+        done = set()
+        while queue:
+            cost, _, path, page = heapq.heappop(queue)
+            if page is target and path:
+                return path
+            if page in done:
+                continue
+            done.add(page)
+            routes = [r for r in self.routes(page)
+                      if r.target is not target or not url_kwargs]
+            if direct and self.can_open(target, url_kwargs):
+                routes.append(Route(page, target, None, None, DIRECT_COST))
+            for route in routes:
+                heapq.heappush(queue, (cost + route.cost, next(order), path + [route], route.target))
+        return None
+
+    def goto(self, page, target, **url_kwargs):
+        """Navigate from page to a page of class target and return it."""
+        if target not in self.pages:
+            raise ValueError('{0} is not a page under pages'.format(target.__name__))
+        path = self.path(type(page), target, url_kwargs)
+        if path is None:
+            raise ValueError('No way from {0} to {1} with {2}'.format(
+                type(page).__name__, target.__name__, url_kwargs))
+        clicked = self.path(type(page), target, url_kwargs, direct=False)
+        self.navigations += 1
+        if clicked is not None and any(r.direct for r in path):
+            self.direct += 1
+            self.saved += sum(r.cost for r in clicked) - sum(r.cost for r in path)
+        for route in path:
+            page = route.follow(page, url_kwargs)
+        return page
+
+    @property
+    def stats(self):
+        return {'navigations': self.navigations, 'direct': self.direct, 'saved': self.saved}
+
+    def add_stats(self, stats):
+        self.navigations += stats.get('navigations', 0)
+        self.direct += stats.get('direct', 0)
+        self.saved += stats.get('saved', 0)
+
+
+navigator = Navigator()
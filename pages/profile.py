@@ -29,7 +29,7 @@ class Profile(Base):
     _view_as_locator = (By.ID, 'view-privacy-mode')
 
     def wait_for_page_to_load(self):
-        self.wait.until(lambda _: self.find_element(By.CSS_SELECTOR, 'html.js body#profile'))
+        self.dom_wait.until_present((By.CSS_SELECTOR, 'html.js body#profile'))
         return self
 
     def view_profile_as(self, view_as):
@@ -30,7 +30,7 @@ class Register(Base):
     _first_city_search_result_locator = (By.CSS_SELECTOR, '#select2-id_city-results > li.select2-results__option--highlighted:first-child')
 
     def wait_for_page_to_load(self):
-        self.wait.until(lambda _: self.find_element(By.CSS_SELECTOR, 'html.js body#edit-profile'))
+        self.dom_wait.until_present((By.CSS_SELECTOR, 'html.js body#edit-profile'))
         return self
 
     @property
@@ -2,14 +2,19 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+from collections import namedtuple
+
 from pypom import Region
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as expected
 
 from pages.base import Base
 
+SearchResultRecord = namedtuple('SearchResultRecord', 'name profile_url photo_url')
+
 
 class Search(Base):
+    URL_TEMPLATE = '/{locale}/search/?q={query}'
 
     _result_locator = (By.CSS_SELECTOR, '#content-wrapper > #main div.result')
     _search_button_locator = (By.CSS_SELECTOR, 'button[type = "submit"]')
@@ -23,7 +28,7 @@ class Search(Base):
     _group_name_locator = (By.CSS_SELECTOR, '.group-name')
 
     def wait_for_page_to_load(self):
-        self.wait.until(lambda _: self.find_element(By.CSS_SELECTOR, 'html.js body#search'))
+        self.dom_wait.until_present((By.CSS_SELECTOR, 'html.js body#search'))
         return self
 
     @property
@@ -60,6 +65,29 @@ class Search(Base):
     def search_results(self):
         return [self.SearchResult(self, el) for el in self.find_elements(*self._result_locator)]
 
+    @property
+    def search_result_records(self):
+        # Read every result in a single script call rather than one
+        # find_element and text call per result and field
+        script = """
+            var locators = arguments[1];
+            function read(result, selector, property) {
+              var element = result.querySelector(selector);
+              return element ? element[property].trim() : null;
+            }
+            return Array.prototype.map.call(
+              document.querySelectorAll(arguments[0]), function (result) {
+                return [read(result, locators[0], 'innerText'),
+                        read(result, locators[1], 'href'),
+                        read(result, locators[2], 'src')];
+              });
+        """
+        locators = [self.SearchResult._name_locator[1],
+                    self.SearchResult._profile_page_link_locator[1],
+                    self.SearchResult._photo_locator[1]]
+        rows = self.selenium.execute_script(script, self._result_locator[1], locators)
+        return [SearchResultRecord(*row) for row in rows]
+
     def open_group(self, name):
         self.wait.until(expected.visibility_of_element_located(
             (By.CSS_SELECTOR, '.group-name[title="{}"]'.format(name)))).click()
@@ -70,6 +98,7 @@ class Search(Base):
 
         _profile_page_link_locator = (By.CSS_SELECTOR, 'li a')
         _name_locator = (By.CSS_SELECTOR, '.result .details h2')
+        _photo_locator = (By.CSS_SELECTOR, 'img')
 
         def open_profile_page(self):
             self.find_element(*self._profile_page_link_locator).click()
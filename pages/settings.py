@@ -12,6 +12,7 @@ from selenium.webdriver.support.select import Select
 
 from pages.base import Base
 from pages.groups_page import GroupsPage
+from pages.snapshot import Field, Snapshot
 
 
 class Settings(Base):
@@ -101,9 +102,8 @@ class Settings(Base):
             def click_update(self):
                 el = self.find_element(*self._update_locator)
                 el.click()
-                self.wait.until(expected.staleness_of(el))
-                self.wait.until(expected.presence_of_element_located(
-                    self._update_locator))
+                self.page.dom_wait.until_stale(el)
+                self.page.dom_wait.until_present(self._update_locator)
 
         class DeleteAccount(Region):
 
@@ -122,18 +122,20 @@ class Settings(Base):
                 from pages.confirm_profile_delete import ConfirmProfileDelete
                 return ConfirmProfileDelete(self.page.selenium, self.page.base_url)
 
-        class SkillsForm(Region):
+        class SkillsForm(Snapshot, Region):
             _skills_locator = (By.CSS_SELECTOR, '#skills .select2-selection__choice')
             _skills_field_locator = (By.CSS_SELECTOR, '#skills input')
             _delete_skill_buttons_locator = (By.CSS_SELECTOR, '#skills .select2-selection__choice__remove')
             _skills_first_result_locator = (By.CSS_SELECTOR, '.select2-results li:not(.loading-results):first-child')
             _update_locator = (By.ID, 'form-submit-skills')
 
+            _snapshot_fields = {
+                'skills': Field(_skills_locator, many=True)}
+
             @property
             def skills(self):
                 # Return skills list with leading `x` button stripped
-                skills = self.find_elements(*self._skills_locator)
-                return [skills[i].text[1:] for i in range(0, len(skills))]
+                return [skill[1:] for skill in self.snapshot_value('skills')]
 
             def add_skill(self, skill_name):
                 element = self.find_element(*self._skills_field_locator)
@@ -141,6 +143,7 @@ class Settings(Base):
                 self.wait.until(expected.presence_of_element_located(
                     self._skills_first_result_locator))
                 element.send_keys(Keys.RETURN)
+                self.refresh_snapshot()
 
             @property
             def delete_skill_buttons(self):
@@ -149,6 +152,7 @@ class Settings(Base):
             def delete_skill(self, skill):
                 skill_index = self.skills.index(skill)
                 self.delete_skill_buttons[skill_index].click()
+                self.refresh_snapshot()
 
             def click_update(self):
                 self.find_element(*self._update_locator).click()
@@ -161,7 +165,7 @@ class Settings(Base):
         def contributions(self):
             return self.Contributions(self.page, self.find_element(*self._contributions_form_locator))
 
-        class Contributions(Region):
+        class Contributions(Snapshot, Region):
 
             _select_month_locator = (By.ID, 'id_date_mozillian_month')
             _select_year_locator = (By.ID, 'id_date_mozillian_year')
@@ -171,6 +175,12 @@ class Settings(Base):
             _selected_year_locator = (By.CSS_SELECTOR, '#id_date_mozillian_year > option[selected="selected"]')
             _update_locator = (By.ID, 'form-submit-contribution')
 
+            _snapshot_fields = {
+                'month': Field(_selected_month_locator),
+                'year': Field(_selected_year_locator),
+                'months_values': Field(_month_locator, 'value', many=True),
+                'years_values': Field(_year_locator, 'value', many=True)}
+
             def select_month(self, option_month):
                 element = self.find_element(*self._select_month_locator)
                 select = Select(element)
@@ -184,22 +194,22 @@ class Settings(Base):
             @property
             def month(self):
                 # Return selected month text
-                return self.find_element(*self._selected_month_locator).text
+                return self.snapshot_value('month')
 
             @property
             def year(self):
                 # Return selected year text
-                return self.find_element(*self._selected_year_locator).text
+                return self.snapshot_value('year')
 
             @property
             def months_values(self):
                 # Return all month values
-                return [month.get_attribute('value') for month in self.find_elements(*self._month_locator)]
+                return self.snapshot_value('months_values')
 
             @property
             def years_values(self):
                 # Return all year values
-                return [year.get_attribute('value') for year in self.find_elements(*self._year_locator)]
+                return self.snapshot_value('years_values')
 
             def select_random_month(self):
                 return self.select_month(random.choice(self.months_values[1:]))
@@ -210,9 +220,9 @@ class Settings(Base):
             def click_update(self):
                 el = self.find_element(*self._update_locator)
                 el.click()
-                self.wait.until(expected.staleness_of(el))
-                self.wait.until(expected.presence_of_element_located(
-                    self._update_locator))
+                self.page.dom_wait.until_stale(el)
+                self.page.dom_wait.until_present(self._update_locator)
+                self.refresh_snapshot()
 
     class Groups(Region):
 
@@ -273,21 +283,18 @@ class Settings(Base):
             def click_update(self):
                 el = self.find_element(*self._update_locator)
                 el.click()
-                self.wait.until(expected.staleness_of(el))
-                self.wait.until(expected.presence_of_element_located(
-                    self._update_locator))
+                self.page.dom_wait.until_stale(el)
+                self.page.dom_wait.until_present(self._update_locator)
 
-    class DeveloperTab(Region):
+    class DeveloperTab(Snapshot, Region):
 
         _services_bugzilla_locator = (By.ID, 'services-bugzilla-url')
         _services_mozilla_reps_locator = (By.ID, 'services-mozilla-reps')
 
-        def get_services_urls(self):
-            locs = [self._services_bugzilla_locator, self._services_mozilla_reps_locator]
-            urls = []
-
-            for element in locs:
-                url = self.find_element(*element).get_attribute('href')
-                urls.append(url)
+        _snapshot_fields = {
+            'bugzilla_url': Field(_services_bugzilla_locator, 'href'),
+            'mozilla_reps_url': Field(_services_mozilla_reps_locator, 'href')}
 
-            return urls
+        def get_services_urls(self):
+            return [self.snapshot_value('bugzilla_url'),
+                    self.snapshot_value('mozilla_reps_url')]
@@ -0,0 +1,105 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from collections import namedtuple
+
+from selenium.common.exceptions import NoSuchElementException
+
+# Finds elements like WebDriver's find_elements for each By strategy
+FIND_ELEMENTS_SCRIPT = """
+function findElements(root, by, value) {
+  switch (by) {
+    case 'id': return toArray(root.querySelectorAll('[id="' + value + '"]'));
+    case 'name': return toArray(root.querySelectorAll('[name="' + value + '"]'));
+    case 'class name': return toArray(root.querySelectorAll('.' + value));
+    case 'link text':
+    case 'partial link text':
+      return toArray(root.querySelectorAll('a')).filter(function (link) {
+        var text = link.innerText.trim();
+        return by === 'link text' ? text === value : text.indexOf(value) !== -1;
+      });
+    case 'xpath':
+      var result = document.evaluate(
+        value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+      var found = [];
+      for (var i = 0; i < result.snapshotLength; i++) {
+        found.push(result.snapshotItem(i));
+      }
+      return found;
+    default: return toArray(root.querySelectorAll(value));
+  }
+}
+
+function toArray(nodes) {
+  return Array.prototype.slice.call(nodes);
+}
+"""
+
+SNAPSHOT_SCRIPT = FIND_ELEMENTS_SCRIPT + """
+var root = arguments[0] || document;
+var fields = arguments[1];
+
+function read(element, attribute) {
+  if (attribute === null) {
+    return element.innerText.trim();
+  }
+  var value = attribute in element ? element[attribute] : element.getAttribute(attribute);
+  return value === undefined ? null : value;
+}
+
+var snapshot = {};
+for (var name in fields) {
+  var field = fields[name];
+  var found = findElements(root, field[0], field[1]);
+  var values = (field[3] ? found : found.slice(0, 1)).map(function (element) {
+    return read(element, field[2]);
+  });
+  snapshot[name] = field[3] ? values : values.length ? values[0] : null;
+}
+return snapshot;
+"""
+
+
+class Field(namedtuple('Field', 'locator attribute many')):
+    """A value read by Snapshot.
+
+    The attribute is read like WebElement.get_attribute, or the visible
+    text is read when it is None. With many set, a list is read from all
+    elements matching the locator.
+    """
+    __slots__ = ()
+
+    def __new__(cls, locator, attribute=None, many=False):
+        return super(Field, cls).__new__(cls, locator, attribute, many)
+
+
+class Snapshot(object):
+    """Mixin reading all of _snapshot_fields with a single script call.
+
+    For a Region the locators are relative to its root. The snapshot is
+    kept until refresh_snapshot is called, which should follow anything
+    that changes the page.
+    """
+
+    _snapshot_fields = {}
+    _snapshot = None
+
+    @property
+    def snapshot(self):
+        if self._snapshot is None:
+            fields = dict((name, [f.locator[0], f.locator[1], f.attribute, f.many])
+                          for name, f in self._snapshot_fields.items())
+            self._snapshot = self.selenium.execute_script(
+                SNAPSHOT_SCRIPT, getattr(self, 'root', None), fields)
+        return self._snapshot
+
+    def snapshot_value(self, name):
+        value = self.snapshot[name]
+        if value is None and not self._snapshot_fields[name].many:
+            raise NoSuchElementException(
+                'Unable to locate element: {}'.format(self._snapshot_fields[name].locator))
+        return value
+
+    def refresh_snapshot(self):
+        self._snapshot = None
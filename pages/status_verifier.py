@@ -0,0 +1,181 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import json
+import re
+import time
+from collections import namedtuple
+from multiprocessing.pool import ThreadPool
+from urlparse import urljoin, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+StatusCheck = namedtuple('StatusCheck', 'path status location')
+Hop = namedtuple('Hop', 'url status location latency reused')
+
+
+class StatusResult(namedtuple('StatusResult', 'check url status location latency')):
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return self.status == self.check.status and (
+            self.check.location is None or
+            re.search(self.check.location, self.location or '') is not None)
+
+    @property
+    def message(self):
+        if self.status != self.check.status:
+            return 'Expected %s but got %s. %s' % (self.check.status, self.status, self.url)
+        return 'Expected Location matching %s but got %s. %s' % (
+            self.check.location, self.location, self.url)
+
+
+def load_checks(path):
+    """Reads status checks from a JSON file.
+
+    The file holds a list of locales and a list of checks, each with a path,
+    the expected status and optionally a regular expression the Location
+    header must match. Paths containing {locale} are expanded once for
+    every locale, so they need at least one.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    checks = []
+    for row in data['checks']:
+        paths = [row['path']]
+        if '{locale}' in row['path']:
+            if not data.get('locales'):
+                raise ValueError('%s: %s needs a list of locales' % (path, row['path']))
+            paths = [row['path'].format(locale=l) for l in data['locales']]
+        for path in paths:
+            checks.append(StatusCheck(path, row['status'], row.get('location')))
+    return checks
+
+
+class RedirectChain(namedtuple('RedirectChain', 'url hops max_length max_hops')):
+    """The hops taken from url until a non-redirect response.
+
+    A chain still redirecting after max_hops hops is flagged as truncated.
+    Each hop records whether its connection was reused from an earlier
+    hop, which shows when a chain pays for extra TLS handshakes.
+    """
+    __slots__ = ()
+
+    @property
+    def latency(self):
+        return sum(hop.latency for hop in self.hops)
+
+    @property
+    def is_loop(self):
+        urls = [hop.url for hop in self.hops]
+        return len(urls) != len(set(urls))
+
+    @property
+    def is_too_long(self):
+        return len([hop for hop in self.hops if 300 <= hop.status < 400]) > self.max_length
+
+    @property
+    def is_truncated(self):
+        return len(self.hops) >= self.max_hops and not self.is_loop and \
+            300 <= self.hops[-1].status < 400
+
+    def scheme_changes(self, old, new):
+        schemes = [urlsplit(hop.url).scheme for hop in self.hops]
+        return any(a == old and b == new for a, b in zip(schemes, schemes[1:]))
+
+    @property
+    def is_downgraded(self):
+        return self.scheme_changes('https', 'http')
+
+    @property
+    def is_upgraded(self):
+        return self.scheme_changes('http', 'https')
+
+    @property
+    def flags(self):
+        return [name for name in ('loop', 'too_long', 'truncated', 'downgraded', 'upgraded')
+                if getattr(self, 'is_' + name)]
+
+    def describe(self):
+        """A single line without timings, stable enough to diff between runs."""
+        hops = ' -> '.join('%s %s' % (hop.status, hop.url) for hop in self.hops)
+        flags = ' [%s]' % ', '.join(self.flags) if self.flags else ''
+        return '%s: %s%s' % (self.url, hops, flags)
+
+
+def dump_chains(chains, path):
+    with open(path, 'w') as f:
+        for chain in sorted(chains, key=lambda c: c.url):
+            f.write(chain.describe() + '\n')
+
+
+class StatusVerifier(object):
+    """Requests paths concurrently and compares the first response.
+
+    Redirects are not followed, only the first status and Location header
+    are compared with what is expected.
+    """
+
+    def __init__(self, base_url, workers=8):
+        self.base_url = base_url
+        self.workers = workers
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def verify(self, check):
+        url = self.base_url + check.path
+        start = time.time()
+        response = self.session.get(url, allow_redirects=False)
+        return StatusResult(check, url, response.status_code,
+                            response.headers.get('Location'), time.time() - start)
+
+    def verify_many(self, checks):
+        pool = ThreadPool(min(self.workers, len(checks)) or 1)
+        try:
+            return pool.map(self.verify, checks)
+        finally:
+            pool.close()
+
+    def follow(self, path, max_hops=10, max_length=3):
+        """Follows redirects from path one hop at a time.
+
+        Stops after max_hops hops or when a URL repeats. Chains with more
+        than max_length redirects are flagged as too long.
+        """
+        # a session of its own, so connection counts are not shared with
+        # other chains being followed at the same time
+        session = requests.Session()
+        url = self.base_url + path
+        hops = []
+        try:
+            while len(hops) < max_hops:
+                pool = session.get_adapter(url).get_connection(url)
+                connections = pool.num_connections
+                start = time.time()
+                response = session.get(url, allow_redirects=False)
+                location = response.headers.get('Location')
+                hops.append(Hop(url, response.status_code, location,
+                                time.time() - start, pool.num_connections == connections))
+                if not response.is_redirect or url in [h.url for h in hops[:-1]]:
+                    break
+                url = urljoin(url, location)
+        finally:
+            session.close()
+        return RedirectChain(self.base_url + path, hops, max_length, max_hops)
+
+    def follow_many(self, paths, **kwargs):
+        pool = ThreadPool(min(self.workers, len(paths)) or 1)
+        try:
+            return pool.map(lambda path: self.follow(path, **kwargs), paths)
+        finally:
+            pool.close()
+
+    @staticmethod
+    def report(results):
+        return '\n'.join('%6.3fs %s %s %s' % (r.latency, r.status, r.url, r.location or '')
+                         for r in sorted(results, key=lambda r: -r.latency))
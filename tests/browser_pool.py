@@ -0,0 +1,143 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Keeps a browser alive between tests on the same xdist worker.
+
+Enabled with --reuse-browser=N. Between tests the browser's extra windows
+are closed, cookies and storage of the page it was left on are cleared,
+and it is sent to about:blank. Cookies of other sites the test visited,
+such as the login provider, would survive this, so a browser which went
+through the provider, see provider_visited, is quit instead. Tests which
+reach the provider other than through Base.login should be marked with
+pristine_browser to get a browser of their own.
+
+Remote browsers, such as those of SauceLabs, are never reused, as their
+jobs are named after the test which started them. A reused local browser
+keeps writing to the driver log of the test which started it, which is
+the log reported for the tests reusing it.
+"""
+
+import json
+
+import pytest
+from selenium.webdriver.support.event_firing_webdriver import \
+    EventFiringWebDriver
+
+RESET_STORAGE_SCRIPT = """
+try {
+  window.localStorage.clear();
+  window.sessionStorage.clear();
+} catch (e) {}
+"""
+
+
+class BrowserPool(object):
+
+    def __init__(self, max_uses):
+        self.max_uses = max_uses
+        self._idle = {}
+
+    def acquire(self, request, driver_class, driver_kwargs, capabilities):
+        if not self.max_uses or request.node.get_marker('pristine_browser') or \
+                'command_executor' in driver_kwargs:
+            driver = self.start(request, driver_class, driver_kwargs)
+            driver._pool_key = None
+            return driver
+        key = driver_class.__name__, json.dumps(capabilities, sort_keys=True, default=str)
+        for other in [k for k in self._idle if k != key]:
+            # one browser per worker, so drop those started with other capabilities
+            self.discard(self._idle.pop(other))
+        driver = self._idle.pop(key, None)
+        if driver is not None and not self.is_healthy(driver):
+            self.discard(driver)
+            driver = None
+        if driver is None:
+            driver = self.start(request, driver_class, driver_kwargs)
+            driver._pool_key = key
+            driver._pool_uses = 0
+            driver._pool_log = driver_kwargs.get('log_path')
+        else:
+            # pytest-selenium reports the log it passed the driver for this test
+            request.config._driver_log = driver._pool_log
+        driver._pool_uses += 1
+        return driver
+
+    def release(self, request, driver):
+        reuse = driver._pool_key is not None and \
+            driver._pool_uses < self.max_uses and \
+            not getattr(driver, '_pool_provider_visited', False) and \
+            not getattr(request.node, '_browser_failed', False)
+        if reuse and self.reset(driver):
+            self._idle[driver._pool_key] = driver
+        else:
+            self.discard(driver)
+
+    def start(self, request, driver_class, driver_kwargs):
+        # as pytest-selenium's own driver fixture does
+        driver = driver_class(**driver_kwargs)
+        event_listener = request.config.getoption('event_listener')
+        if event_listener is not None:
+            mod_name, class_name = event_listener.rsplit('.', 1)
+            mod = __import__(mod_name, fromlist=[class_name])
+            driver = EventFiringWebDriver(driver, getattr(mod, class_name)())
+        return driver
+
+    def is_healthy(self, driver):
+        try:
+            driver.window_handles
+            return True
+        except Exception:
+            return False
+
+    def reset(self, driver):
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.execute_script(RESET_STORAGE_SCRIPT)
+            driver.delete_all_cookies()
+            driver.get('about:blank')
+            return True
+        except Exception:
+            return False
+
+    def discard(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        for driver in self._idle.values():
+            self.discard(driver)
+        self._idle = {}
+
+
+def provider_visited(driver):
+    """Keep driver from being reused, as it holds the login provider's cookies."""
+    driver._pool_provider_visited = True
+
+
+def pytest_addoption(parser):
+    parser.getgroup('selenium').addoption(
+        '--reuse-browser', type=int, default=0, metavar='count',
+        help='reuse each browser for up to this many tests on a worker, '
+             'resetting it in between. (default: %(default)s, disabled)')
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    if outcome.get_result().failed:
+        # a browser that saw a failure may be in any state, don't reuse it
+        item._browser_failed = True
+
+
+@pytest.fixture(scope='session')
+def browser_pool(request):
+    pool = BrowserPool(request.config.getoption('reuse_browser'))
+    yield pool
+    pool.close()
@@ -6,8 +6,130 @@ import uuid
 from urlparse import urlparse
 
 import pytest
+import requests
 
+from pages.group_provisioner import GroupProvisioner
+from pages.http_login import HttpLogin, http_login
+from pages.link_cache import cache as link_cache
+from pages.login_cache import cache as login_cache
+from pages.navigation import navigator
 from tests import restmail
+from tests.fake_mozillians import FakeMozillians
+from tests.fake_restmail import FakeRestmail
+from tests.user_leases import leases as user_leases
+
+pytest_plugins = ['tests.browser_pool', 'tests.duration_scheduling', 'tests.http_cassette',
+                  'tests.tab_scheduler', 'tests.tracing', 'tests.webdriver_commands']
+
+# slugs of created groups which could not be deleted
+leftover_groups = []
+
+
+def pytest_addoption(parser):
+    parser.addoption('--no-http-driver', action='store_true', default=False,
+                     help='run tests marked no_javascript in a browser instead of '
+                          'requesting their pages over HTTP.')
+    parser.addoption('--no-login-cache', action='store_true', default=False,
+                     help='always log in through Auth0 instead of reusing '
+                          'cached session cookies.')
+    parser.addoption('--http-login', action='store_true', default=False,
+                     help='request login links over HTTP instead of through the '
+                          'Auth0 lock in every test, not only those marked http_login.')
+    parser.addoption('--link-cache', default='.link_cache.json', metavar='path',
+                     help='file recording links verified by LinkCrawler, '
+                          'use an empty value to disable. (default: %(default)s)')
+    parser.addoption('--link-cache-ttl', type=float, default=3600, metavar='seconds',
+                     help='trust links verified this recently without '
+                          'requesting them again. (default: %(default)s)')
+    parser.addoption('--redirect-chains', metavar='path',
+                     help='write the followed redirect chains to a file, '
+                          'one line per chain for diffing between runs.')
+    parser.addoption('--restmail-url', default=restmail.RESTMAIL_URL, metavar='url',
+                     help='restmail service to read login links from, such as '
+                          'the one started by tests.fake_mozillians. (default: %(default)s)')
+    parser.addoption('--sweep-groups', type=float, metavar='seconds',
+                     help='also delete moz-group-* groups older than this, left '
+                          'over by earlier runs, when tearing down created groups.')
+    parser.addoption('--user-lease-dir', metavar='path',
+                     help='directory holding the locks through which processes '
+                          'share stored users. (default: a temporary directory)')
+    parser.addoption('--user-lease-timeout', type=float, default=600, metavar='seconds',
+                     help='fail a test which could not lease a user in this '
+                          'long. (default: %(default)s)')
+
+
+def pytest_configure(config):
+    login_cache.enabled = not config.getoption('no_login_cache')
+    link_cache.path = config.getoption('link_cache')
+    link_cache.enabled = bool(link_cache.path)
+    link_cache.ttl = config.getoption('link_cache_ttl')
+    user_leases.directory = config.getoption('user_lease_dir') or user_leases.directory
+    user_leases.timeout = config.getoption('user_lease_timeout')
+    from pages.base import Base
+    Base.mailbox = staticmethod(user_leases.mailbox)
+    restmail.inbox.url = config.getoption('restmail_url')
+
+
+def pytest_sessionfinish(session):
+    link_cache.save()
+    if hasattr(session.config, 'slaveoutput'):
+        session.config.slaveoutput['login_cache'] = login_cache.stats
+        session.config.slaveoutput['http_login'] = http_login.stats
+        session.config.slaveoutput['link_cache'] = link_cache.stats
+        session.config.slaveoutput['navigation'] = navigator.stats
+        session.config.slaveoutput['user_leases'] = user_leases.stats
+        session.config.slaveoutput['leftover_groups'] = leftover_groups
+        session.config.slaveoutput['restmail'] = restmail.inbox.stats
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    # xdist 1.22 renamed the node's slaveoutput, keeping the old name only on workers
+    output = getattr(node, 'workeroutput', getattr(node, 'slaveoutput', {}))
+    stats = output.get('login_cache', {})
+    login_cache.hits += stats.get('hits', 0)
+    login_cache.misses += stats.get('misses', 0)
+    stats = output.get('http_login', {})
+    http_login.logins += stats.get('logins', 0)
+    http_login.fallbacks += stats.get('fallbacks', 0)
+    link_cache.add_stats(output.get('link_cache', {}))
+    navigator.add_stats(output.get('navigation', {}))
+    user_leases.add_stats(output.get('user_leases', {}))
+    leftover_groups.extend(output.get('leftover_groups', []))
+    restmail.inbox.add_stats(output.get('restmail', {}))
+
+
+def pytest_terminal_summary(terminalreporter):
+    if login_cache.hits or login_cache.misses:
+        terminalreporter.write_sep('-', 'login cache')
+        terminalreporter.write_line('{hits} hits, {misses} misses'.format(
+            **login_cache.stats))
+    if any(link_cache.stats.values()):
+        terminalreporter.write_sep('-', 'link cache')
+        terminalreporter.write_line(
+            '{hits} hits, {revalidated} revalidated, {fetched} fetched'.format(
+                **link_cache.stats))
+    if navigator.navigations:
+        terminalreporter.write_sep('-', 'navigation')
+        terminalreporter.write_line(
+            '{navigations} navigations, {direct} loaded directly instead of clicked through, '
+            'about {saved} WebDriver commands saved'.format(**navigator.stats))
+    if user_leases.leases:
+        terminalreporter.write_sep('-', 'user leases')
+        terminalreporter.write_line(
+            '{leases} leases, {waited:.1f}s waited in total, {longest:.1f}s at most'.format(
+                **user_leases.stats))
+    times = restmail.inbox.delivery_times
+    if times:
+        terminalreporter.write_sep('-', 'restmail')
+        terminalreporter.write_line(
+            '{0} mails, delivered in {1:.1f}s on average, {2:.1f}s at most'.format(
+                len(times), sum(times) / len(times), max(times)))
+    if leftover_groups:
+        terminalreporter.write_sep('-', 'leftover groups')
+        terminalreporter.write_line(
+            '{0} created groups could not be deleted, --sweep-groups removes them '
+            'later: {1}'.format(len(leftover_groups), ', '.join(leftover_groups)))
 
 
 @pytest.fixture(scope='session')
@@ -25,6 +147,28 @@ def capabilities(request, capabilities):
     return capabilities
 
 
+@pytest.fixture
+def driver(request, driver_class, driver_kwargs, capabilities, browser_pool):
+    if request.node.get_marker('no_javascript') and \
+            not request.config.getoption('no_http_driver'):
+        # pages read as served, without starting a browser
+        from pages.http_driver import HttpDriver
+        driver = HttpDriver()
+        yield driver
+        driver.quit()
+        return
+    driver = browser_pool.acquire(request, driver_class, driver_kwargs, capabilities)
+    request.node._driver = driver
+    yield driver
+    browser_pool.release(request, driver)
+
+
+@pytest.fixture(autouse=True)
+def _http_login(request):
+    http_login.enabled = request.config.getoption('http_login') or \
+        bool(request.node.get_marker('http_login'))
+
+
 @pytest.fixture
 def new_email():
     return 'mozillians_{0}@restmail.net'.format(uuid.uuid1())
@@ -43,7 +187,13 @@ def stored_users(base_url, variables):
 @pytest.fixture(scope='function')
 def vouched_user(request, stored_users):
     slave_id = getattr(request.config, 'slaveinput', {}).get('slaveid', 'gw0')
-    return stored_users['vouched'][int(slave_id[2:])]
+    # nondestructive tests only read the user, so they may share it
+    lease = user_leases.acquire(
+        stored_users['vouched'], shared=bool(request.node.get_marker('nondestructive')),
+        offset=int(slave_id[2:]))
+    request.node.add_report_section('setup', 'user lease', lease.describe())
+    yield lease.user
+    lease.release()
 
 
 @pytest.fixture(scope='session')
@@ -61,10 +211,63 @@ def github_non_nda_user(stored_users):
     return stored_users['github_non_nda']
 
 
+@pytest.fixture(scope='session')
+def group_provisioner(request, base_url):
+    provisioner = GroupProvisioner(base_url)
+    yield provisioner
+    max_age = request.config.getoption('sweep_groups')
+    if max_age is not None:
+        provisioner.sweep(max_age)
+    leftover_groups.extend(provisioner.teardown())
+
+
+@pytest.fixture
+def create_group(base_url, selenium, group_provisioner):
+    """Create a group as the logged in user and open its edit page."""
+    from pages.edit_group import EditGroupPage
+
+    def create_group(name=None):
+        slug = group_provisioner.create(selenium, name)
+        return EditGroupPage(selenium, base_url, slug=slug).open()
+    return create_group
+
+
 @pytest.fixture
 def login_link(username):
-    mail = restmail.get_mail(username)
-    mail_content = mail[0]['text'].replace('\n', ' ').replace('amp;', '').split(" ")
-    for link in mail_content:
-        if 'passwordless/verify_redirect' in link:
-            return link
+    return restmail.inbox.login_link(username)
+
+
+def clear_mail(username):
+    # a late mail of an earlier attempt would be taken for the next link
+    restmail.inbox.clear(username)
+
+
+# The site and restmail stand-ins the offline tests run against
+
+
+@pytest.fixture
+def fake_restmail():
+    server = FakeRestmail().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def site(fake_restmail):
+    server = FakeMozillians(fake_restmail).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def fake_login(site, fake_restmail):
+    """Log in to the fake site over HTTP, returning a requests session."""
+    http_login = HttpLogin(inbox=restmail.Inbox(url=fake_restmail.url, max_interval=0.5),
+                           timeout=5)
+
+    def login(email):
+        session = requests.Session()
+        for cookie in http_login.session_cookies(site.site_url + '/oidc/authenticate/', email):
+            session.cookies.set(cookie['name'], cookie['value'])
+        return session
+    return login
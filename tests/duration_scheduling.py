@@ -0,0 +1,177 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Hands out tests to xdist workers longest first.
+
+Durations of each test are kept in --duration-history between runs. When
+the history knows any of the collected tests, the load scheduler is
+replaced by one giving each idle worker the longest test left, so the
+slow profile and group tests start early instead of leaving one worker
+running alone at the end. Tests without history are expected to take as
+long as the median known test. Without history xdist schedules as usual.
+"""
+
+import heapq
+import json
+import os
+import time
+
+import pytest
+
+# weight of the latest run when updating the recorded duration of a test
+SMOOTHING = 0.5
+
+
+class DurationHistory(object):
+
+    def __init__(self, path=None):
+        self.path = path
+        self.durations = {}
+        self.recorded = {}
+
+    def load(self, path):
+        self.path = path
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.durations = json.load(f)
+
+    def expected(self, nodeids):
+        known = sorted(self.durations[n] for n in nodeids if n in self.durations)
+        if not known:
+            return None
+        median = known[len(known) // 2]
+        return [self.durations.get(n, median) for n in nodeids]
+
+    def record(self, report):
+        self.recorded[report.nodeid] = self.recorded.get(report.nodeid, 0) + report.duration
+
+    def save(self):
+        if not self.path or not self.recorded:
+            return
+        for nodeid, duration in self.recorded.items():
+            previous = self.durations.get(nodeid, duration)
+            self.durations[nodeid] = round(
+                SMOOTHING * duration + (1 - SMOOTHING) * previous, 3)
+        with open(self.path + '.tmp', 'w') as f:
+            json.dump(self.durations, f, indent=0, sort_keys=True)
+        os.rename(self.path + '.tmp', self.path)
+
+
+def plan(durations, workers):
+    """Return the makespan of running durations longest first on workers."""
+    loads = [0] * workers
+    for duration in sorted(durations, reverse=True):
+        heapq.heapreplace(loads, loads[0] + duration)
+    return max(loads)
+
+
+def make_scheduler_class():
+    # imported here so the plugin loads when xdist is not installed
+    from xdist.scheduler import LoadScheduling
+
+    class DurationScheduling(LoadScheduling):
+        """LoadScheduling keeping pending tests sorted longest first.
+
+        Each worker is only sent enough tests to know what runs next, so
+        the longest test left always goes to whichever worker frees up.
+        """
+
+        def __init__(self, config, log, history):
+            LoadScheduling.__init__(self, config, log)
+            self.history = history
+            self.expected = None
+            self.planned = None
+            self.workers = 0
+            self.started = None
+            self.finished = {}
+
+        def schedule(self):
+            if self.collection is not None or not self._collection_has_history():
+                return LoadScheduling.schedule(self)
+            if not self._check_nodes_have_same_collection():
+                self.log('**Different tests collected, aborting run**')
+                return
+            self.collection = list(self.node2collection.values())[0]
+            self.pending[:] = sorted(range(len(self.collection)),
+                                     key=lambda i: self.expected[i], reverse=True)
+            self.workers = len(self.nodes)
+            self.planned = plan(self.expected, self.workers)
+            self.started = time.time()
+            # deal the longest tests out one per worker before queueing more
+            for _ in range(2):
+                for node in self.nodes:
+                    self._send_tests(node, 1)
+            if not self.pending:
+                for node in self.nodes:
+                    node.shutdown()
+
+        def check_schedule(self, node, duration=0):
+            if self.expected is None:
+                return LoadScheduling.check_schedule(self, node, duration)
+            if node.shutting_down:
+                return
+            # a worker holds on to its last test until it knows the next one
+            if self.pending and len(self.node2pending[node]) < 2:
+                self._send_tests(node, 2 - len(self.node2pending[node]))
+
+        def mark_test_complete(self, node, item_index, duration=0):
+            if self.started is not None:
+                self.finished[node.gateway.id] = time.time() - self.started
+            LoadScheduling.mark_test_complete(self, node, item_index, duration)
+
+        def _collection_has_history(self):
+            collection = list(self.node2collection.values())[0]
+            self.expected = self.history.expected(collection)
+            return self.expected is not None
+
+        @property
+        def actual(self):
+            return max(self.finished.values()) if self.finished else None
+
+    return DurationScheduling
+
+
+history = DurationHistory()
+
+
+def pytest_addoption(parser):
+    parser.getgroup('xdist').addoption(
+        '--duration-history', default='.test_durations.json', metavar='path',
+        help='file recording how long each test took, used to start the '
+             'longest tests first. use an empty value to disable. '
+             '(default: %(default)s)')
+
+
+def pytest_configure(config):
+    # the xdist master sees the reports of every worker and does the recording
+    if not hasattr(config, 'slaveinput'):
+        history.load(config.getoption('duration_history'))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    if not history.path or config.getvalue('dist') != 'load':
+        return None
+    config._duration_scheduler = make_scheduler_class()(config, log, history)
+    return config._duration_scheduler
+
+
+def pytest_runtest_logreport(report):
+    if history.path:
+        history.record(report)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if exitstatus in (0, 1):
+        history.save()
+
+
+def pytest_terminal_summary(terminalreporter):
+    scheduler = getattr(terminalreporter.config, '_duration_scheduler', None)
+    if scheduler is None or scheduler.planned is None:
+        return
+    terminalreporter.write_sep('-', 'duration scheduling')
+    terminalreporter.write_line(
+        'planned makespan {0:.1f}s, actual {1:.1f}s on {2} workers'.format(
+            scheduler.planned, scheduler.actual or 0, scheduler.workers))
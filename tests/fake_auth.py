@@ -0,0 +1,193 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import json
+import threading
+import uuid
+from BaseHTTPServer import BaseHTTPRequestHandler
+from Cookie import SimpleCookie
+from SocketServer import TCPServer, ThreadingMixIn
+from urllib import urlencode
+from urlparse import parse_qsl, urlparse
+
+CLIENT_ID = 'mozillians-test'
+
+LOGIN_MAIL = """Click and confirm that you want to sign in to Mozillians.
+
+{link}
+
+This link will expire in five minutes.
+"""
+
+
+class FakeAuthHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.handle_request('GET')
+
+    def do_POST(self):
+        self.handle_request('POST')
+
+    def handle_request(self, method):
+        url = urlparse(self.path)
+        self.query = dict(parse_qsl(url.query))
+        self.server.requests.append((method, url.path))
+        handler = self.route(method, url.path)
+        (handler or self.not_found)()
+
+    def route(self, method, path):
+        if method == 'POST':
+            return {'/passwordless/start': self.passwordless_start}.get(path)
+        return {
+            '/': self.home,
+            '/oidc/authenticate/': self.authenticate,
+            '/oidc/callback/': self.callback,
+            '/authorize': self.authorize,
+            '/login': self.lock,
+            '/passwordless/verify_redirect': self.verify_redirect,
+        }.get(path)
+
+    # The site
+
+    def home(self):
+        email = self.server.sessions.get(self.cookie('sessionid'))
+        if email:
+            link = '<a id="nav-logout" href="/logout/">Log out {0}</a>'.format(email)
+        else:
+            link = '<a id="nav-login" href="/oidc/authenticate/">Log in</a>'
+        self.send_body('<html><body>{0}</body></html>'.format(link), 'text/html')
+
+    def authenticate(self):
+        state = uuid.uuid4().hex
+        self.redirect(self.server.provider_url + '/authorize?' + urlencode({
+            'client_id': CLIENT_ID,
+            'response_type': 'code',
+            'scope': 'openid email',
+            'redirect_uri': self.server.site_url + '/oidc/callback/',
+            'state': state,
+            'nonce': uuid.uuid4().hex,
+        }), cookies={'oidc_state': state})
+
+    def callback(self):
+        email = self.server.codes.pop(self.query.get('code'), None)
+        if email is None or self.query.get('state') != self.cookie('oidc_state'):
+            return self.send_body('Invalid login', status=400)
+        session = uuid.uuid4().hex
+        self.server.sessions[session] = email
+        self.redirect(self.after_login(email), cookies={'sessionid': session})
+
+    def after_login(self, email):
+        return '/'
+
+    # The provider
+
+    def authorize(self):
+        if self.query.get('client_id') != CLIENT_ID:
+            return self.send_body('Unknown client', status=400)
+        transaction = uuid.uuid4().hex
+        self.server.transactions[transaction] = self.query
+        self.redirect('/login?' + urlencode({'state': transaction, 'client': CLIENT_ID}),
+                      cookies={'auth0': transaction})
+
+    def lock(self):
+        self.send_body('<html><body><div id="lock"></div></body></html>', 'text/html')
+
+    def passwordless_start(self):
+        data = json.loads(self.read_body())
+        params = data.get('authParams', {})
+        if data.get('client_id') != CLIENT_ID or data.get('connection') != 'email' or \
+                data.get('send') != 'link' or not params.get('redirect_uri') or \
+                not params.get('state') or not data.get('email'):
+            return self.send_body(json.dumps({'error': 'bad.request'}), 'application/json', 400)
+        code = uuid.uuid4().hex
+        self.server.verifications[code] = (data['email'], params)
+        link = self.server.provider_url + '/passwordless/verify_redirect?' + urlencode(
+            dict(params, verification_code=code, connection='email',
+                 client_id=CLIENT_ID, email=data['email']))
+        self.server.restmail.deliver(data['email'], LOGIN_MAIL.format(
+            link=link.replace('&', '&amp;')), delay=self.server.mail_delay)
+        self.send_body(json.dumps({'email': data['email']}), 'application/json')
+
+    def verify_redirect(self):
+        verification = self.server.verifications.pop(self.query.get('verification_code'), None)
+        if verification is None:
+            return self.send_body('Invalid or expired link', status=400)
+        email, params = verification
+        code = uuid.uuid4().hex
+        self.server.codes[code] = email
+        self.redirect(params['redirect_uri'] + '?' + urlencode(
+            {'code': code, 'state': params['state']}))
+
+    # Helpers
+
+    def read_body(self):
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def cookie(self, name):
+        cookies = SimpleCookie(self.headers.get('Cookie', ''))
+        return cookies[name].value if name in cookies else None
+
+    def redirect(self, location, cookies=None, status=302):
+        self.send_response(status)
+        self.send_header('Location', location)
+        for name, value in (cookies or {}).items():
+            self.send_header('Set-Cookie', '{0}={1}; Path=/; HttpOnly'.format(name, value))
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def send_body(self, body, content_type='text/plain', status=200):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def not_found(self):
+        self.send_body('Not found', status=404)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeAuth(ThreadingMixIn, TCPServer):
+    """Local stand-in for the site's OIDC login and Auth0's passwordless API.
+
+    One server plays both parts, reached as the site through 127.0.0.1 and
+    as the provider through localhost so their cookies stay apart. Login
+    links are mailed to the given FakeRestmail.
+    """
+
+    allow_reuse_address = True
+    daemon_threads = True
+    handler_class = FakeAuthHandler
+
+    def __init__(self, restmail, port=0):
+        TCPServer.__init__(self, ('127.0.0.1', port), self.handler_class)
+        self.restmail = restmail
+        self.mail_delay = 0
+        self.requests = []
+        self.transactions = {}
+        self.verifications = {}
+        self.codes = {}
+        self.sessions = {}
+        self._thread = None
+
+    @property
+    def site_url(self):
+        return 'http://127.0.0.1:%s' % self.server_address[1]
+
+    @property
+    def provider_url(self):
+        return 'http://localhost:%s' % self.server_address[1]
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
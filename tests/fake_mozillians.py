@@ -0,0 +1,1307 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Local stand-in for the Mozillians site, to run the page objects offline.
+
+    python -m tests.fake_mozillians --variables fake-variables.json
+
+starts it along with a restmail stand-in and prints how to run the tests
+against it. Pages are rendered from small templates which have the IDs,
+classes and structure our locators expect, not the real site's markup.
+"""
+
+import argparse
+import cgi
+import json
+import re
+import threading
+import uuid
+from collections import OrderedDict
+from string import Template
+from urllib import quote, unquote_plus, urlencode
+from urlparse import parse_qs
+
+from tests.fake_auth import FakeAuth, FakeAuthHandler
+from tests.fake_restmail import FakeRestmail
+
+LOCALES = OrderedDict([('en-US', 'English'), ('es', 'Espa&ntilde;ol'), ('de', 'Deutsch')])
+
+YOUR_PROFILE = {'es': 'Tu perfil', 'de': 'Dein Profil'}
+
+COUNTRIES = OrderedDict([('us', 'United States'), ('de', 'Germany'), ('gr', 'Greece')])
+
+REGIONS = {
+    'United States': ['California', 'Colorado', 'Oregon'],
+    'Germany': ['Berlin', 'Bavaria'],
+    'Greece': ['Attica'],
+}
+
+CITIES = {
+    'California': ['Mountain View', 'San Francisco'],
+    'Colorado': ['Denver'],
+    'Oregon': ['Portland'],
+    'Berlin': ['Berlin'],
+    'Bavaria': ['Munich'],
+    'Attica': ['Athens'],
+}
+
+SKILLS = ['css', 'django', 'html', 'javascript', 'python', 'selenium', 'testing']
+
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+          'August', 'September', 'October', 'November', 'December']
+
+YEARS = range(2017, 1997, -1)
+
+INVITED = ("%s has been invited to Mozillians. They'll receive an email with "
+           "instructions on how to join. You can invite another Mozillian if you like.")
+
+# The same users in every run, for the variables file
+SEED_USERS = [
+    {'username': 'vouched.one', 'full_name': 'Vouched One',
+     'email': 'mozillians.vouched.one@restmail.net', 'skills': ['testing']},
+    {'username': 'vouched.two', 'full_name': 'Vouched Two',
+     'email': 'mozillians.vouched.two@restmail.net', 'city': 'San Francisco'},
+    {'username': 'vouched.three', 'full_name': 'Vouched Three',
+     'email': 'mozillians.vouched.three@restmail.net', 'country': 'Germany',
+     'region': 'Berlin', 'city': 'Berlin'},
+    {'username': 'unvouched', 'full_name': 'Unvouched Mozillian',
+     'email': 'mozillians.unvouched@restmail.net', 'vouched': False},
+    {'username': 'private.mozillian', 'full_name': 'Private Mozillian',
+     'email': 'mozillians.private@restmail.net', 'public': True, 'private_groups': True,
+     'groups': ['web-qa']},
+    {'username': 'Mozillians.User', 'full_name': 'Mozillians User',
+     'email': 'mozillians.user@restmail.net', 'public': True, 'bio': 'Testing all the things.'},
+    {'username': 'mbrandt', 'full_name': 'Matt Brandt', 'email': 'mbrandt@mozilla.com',
+     'ircname': 'mbrandt', 'groups': ['web-qa'], 'skills': ['selenium', 'python']},
+    {'username': 'mattb', 'full_name': 'Matthew Baker', 'email': 'mattb@mozilla.com',
+     'city': 'Denver', 'region': 'Colorado'},
+    {'username': 'test.user', 'full_name': 'Test User', 'email': 'test.user@mozilla.com'},
+]
+
+SEED_GROUPS = [
+    {'name': 'Web QA', 'curator': 'mbrandt', 'description': 'Testing the web.',
+     'irc_channel': '#webqa'},
+]
+
+STYLE = """
+.tab-pane, .dropdown-menu, .search-options, .select2-dropdown, .hidden { display: none; }
+.tab-pane.active, .dropdown-menu.open, .search-options.open, .select2-dropdown.open { display: block; }
+.select2-search__field { min-width: 10em; }
+"""
+
+# Behaviour shared by all pages: menus, tabs, acknowledgements, the
+# multiple select2 widgets, the single ones of the location fields and the
+# privacy preview of profiles.
+SCRIPT = r"""
+document.documentElement.className = 'js';
+
+function on(selector, type, handler) {
+  document.addEventListener(type, function (event) {
+    var target = event.target.closest && event.target.closest(selector);
+    if (target) {
+      handler.call(target, event);
+    }
+  });
+}
+
+function each(selector, callback) {
+  Array.prototype.forEach.call(document.querySelectorAll(selector), callback);
+}
+
+function fetchOptions(url, params, callback) {
+  var query = Object.keys(params).map(function (key) {
+    return key + '=' + encodeURIComponent(params[key]);
+  });
+  var request = new XMLHttpRequest();
+  request.open('GET', url + '?' + query.join('&'));
+  request.onload = function () {
+    callback(JSON.parse(request.responseText));
+  };
+  request.send();
+}
+
+on('.dropdown-toggle', 'click', function (event) {
+  event.preventDefault();
+  document.querySelector('.dropdown-menu').classList.toggle('open');
+});
+
+on('.search-options-toggle', 'click', function () {
+  document.querySelector('.search-options').classList.toggle('open');
+});
+
+on('[data-toggle="tab"]', 'click', function (event) {
+  event.preventDefault();
+  var pane = document.querySelector(this.getAttribute('href'));
+  Array.prototype.forEach.call(pane.parentNode.children, function (sibling) {
+    sibling.classList.remove('active');
+  });
+  pane.classList.add('active');
+});
+
+on('.acknowledge', 'change', function () {
+  document.querySelector(this.getAttribute('data-target')).classList.toggle('disabled', !this.checked);
+});
+
+on('.disabled', 'click', function (event) {
+  event.preventDefault();
+});
+
+on('[name="accepting_new_members"]', 'change', function () {
+  document.getElementById('id_new_member_criteria_fieldset').classList.toggle(
+    'hidden', this.value !== 'by_request');
+});
+
+on('#accounts-addfield', 'click', function () {
+  var rows = document.querySelectorAll('.externalaccount-fieldrow');
+  var row = rows[rows.length - 1].cloneNode(true);
+  row.querySelector('input').value = '';
+  this.parentNode.insertBefore(row, this);
+});
+
+function select2Update(widget) {
+  var values = Array.prototype.map.call(
+    widget.querySelectorAll('.select2-selection__choice'), function (choice) {
+      return choice.getAttribute('data-value');
+    });
+  widget.querySelector('input[type="hidden"]').value = values.join(',');
+}
+
+function select2Choose(widget, option) {
+  var choice = document.createElement('li');
+  choice.className = 'select2-selection__choice';
+  choice.setAttribute('data-value', option.getAttribute('data-value'));
+  choice.innerHTML = '<span class="select2-selection__choice__remove">\u00d7</span>';
+  choice.appendChild(document.createTextNode(option.textContent));
+  var search = widget.querySelector('.select2-search');
+  search.parentNode.insertBefore(choice, search);
+  widget.querySelector('.select2-results').innerHTML = '';
+  widget.querySelector('.select2-search__field').value = '';
+  select2Update(widget);
+}
+
+on('.select2 .select2-search__field', 'input', function () {
+  var field = this;
+  var term = field.value;
+  var widget = field.closest('.select2');
+  var results = widget.querySelector('.select2-results');
+  results.innerHTML = '<li class="loading-results">Searching\u2026</li>';
+  fetchOptions(widget.getAttribute('data-source'), {q: term}, function (options) {
+    if (field.value !== term) {
+      return;
+    }
+    results.innerHTML = '';
+    options.forEach(function (item) {
+      var option = document.createElement('li');
+      option.className = 'select2-results__option';
+      option.setAttribute('data-value', item.id);
+      option.textContent = item.text;
+      results.appendChild(option);
+    });
+  });
+});
+
+on('.select2 .select2-search__field', 'keydown', function (event) {
+  if (event.keyCode !== 13) {
+    return;
+  }
+  event.preventDefault();
+  var widget = this.closest('.select2');
+  var option = widget.querySelector('.select2-results__option');
+  if (option) {
+    select2Choose(widget, option);
+  }
+});
+
+on('.select2 .select2-results__option', 'click', function () {
+  select2Choose(this.closest('.select2'), this);
+});
+
+on('.select2-selection__choice__remove', 'click', function () {
+  var widget = this.closest('.select2');
+  var choice = this.parentNode;
+  choice.parentNode.removeChild(choice);
+  select2Update(widget);
+});
+
+on('.select2-single', 'click', function () {
+  var dropdown = document.querySelector('.select2-dropdown');
+  var field = this.getAttribute('data-field');
+  var input = dropdown.querySelector('.select2-search__field');
+  dropdown.setAttribute('data-field', field);
+  dropdown.querySelector('ul').id = 'select2-id_' + field + '-results';
+  dropdown.querySelector('ul').innerHTML = '';
+  input.value = '';
+  dropdown.classList.add('open');
+  input.focus();
+});
+
+on('.select2-dropdown .select2-search__field', 'input', function () {
+  var field = this;
+  var term = field.value;
+  var dropdown = field.closest('.select2-dropdown');
+  var name = dropdown.getAttribute('data-field');
+  var results = dropdown.querySelector('ul');
+  fetchOptions('/api/' + name + '/', {
+    q: term,
+    country: document.getElementById('id_country').value,
+    region: document.getElementById('id_region').value
+  }, function (options) {
+    if (field.value !== term || dropdown.getAttribute('data-field') !== name) {
+      return;
+    }
+    results.innerHTML = '';
+    options.forEach(function (item) {
+      var option = document.createElement('li');
+      option.className = 'select2-results__option select2-results__option--highlighted';
+      option.textContent = item.text;
+      results.appendChild(option);
+    });
+  });
+});
+
+on('.select2-dropdown .select2-results__option', 'click', function () {
+  var dropdown = this.closest('.select2-dropdown');
+  var name = dropdown.getAttribute('data-field');
+  document.getElementById('id_' + name).value = this.textContent;
+  document.getElementById('select2-id_' + name + '-container').textContent = this.textContent;
+  dropdown.classList.remove('open');
+});
+
+// Previewing a profile takes sections out of the document, as they would
+// not be rendered for the chosen audience at all.
+var hiddenSections = [];
+
+on('#view-privacy-mode', 'change', function () {
+  var levels = ['public', 'mozillians', 'private'];
+  var allowed = levels.indexOf(this.value);
+  hiddenSections.forEach(function (hidden) {
+    hidden.placeholder.parentNode.replaceChild(hidden.section, hidden.placeholder);
+  });
+  hiddenSections = [];
+  each('[data-privacy]', function (section) {
+    if (levels.indexOf(section.getAttribute('data-privacy')) > allowed) {
+      var placeholder = document.createComment(section.id);
+      section.parentNode.replaceChild(placeholder, section);
+      hiddenSections.push({section: section, placeholder: placeholder});
+    }
+  });
+});
+"""
+
+LAYOUT = Template("""<!DOCTYPE html>
+<html lang="$locale">
+<head>
+<meta charset="utf-8">
+<title>$title</title>
+<link rel="search" type="application/opensearchdescription+xml" href="/opensearch.xml">
+<style>$style</style>
+</head>
+<body id="$body_id">
+<header>
+<div id="nav-main">$nav</div>
+<div class="search-right">
+<form action="/$locale/search/" method="get"><input class="search-query" type="search" name="q"></form>
+</div>
+</header>
+<div id="content-wrapper">
+<div id="main">
+$content
+</div>
+</div>
+<footer>
+<ul class="footer-nav details">
+<li><a href="/$locale/about/">About the Mozillians</a></li>
+<li><a href="/$locale/">Home</a></li>
+</ul>
+<form id="language-switcher" method="get" action="">
+<select id="language" name="lang">$languages</select>
+<button type="submit">Go</button>
+</form>
+</footer>
+<script>$script</script>
+</body>
+</html>
+""")
+
+NAV_LOGGED_IN = Template("""<a class="dropdown-toggle" href="#"><i class="icon-menu">Menu</i></a>
+<ul class="dropdown-menu">
+<li><a id="nav-profile" href="/$locale/u/$username/">View profile</a></li>
+$vouched_items
+<li><a id="nav-edit-profile" href="/$locale/user/edit/">Settings</a></li>
+<li><a id="nav-logout" href="/$locale/logout/">Log out</a></li>
+</ul>""")
+
+NAV_VOUCHED = Template("""<li><a id="nav-groups" href="/$locale/groups/">Groups</a></li>
+<li><a id="nav-invite" href="/$locale/invite/">Invite</a></li>""")
+
+NAV_ANONYMOUS = '<a id="nav-login" href="/oidc/authenticate/">Log in</a>'
+
+HOME = Template("""<h1>Mozillians</h1>
+<p>The community directory for Mozilla contributors.</p>
+$sections""")
+
+HOME_VOUCHED = Template("""<section class="groups"><a href="/$locale/groups/">Groups</a></section>
+<section class="functional-areas"><a href="/$locale/groups/?functional_areas=1">Functional areas</a></section>""")
+
+ABOUT = Template("""<h1>About the Mozillians</h1>
+<section id="privacy"><h2>Privacy</h2><p>Read <a href="/$locale/about/#privacy">how we use your data</a>.</p></section>
+<section id="get-involved"><h2>Get involved</h2><p><a href="/$locale/">Find Mozillians</a> near you.</p></section>""")
+
+SEARCH = Template("""<form class="search-form" method="get" action="/$locale/search/">
+<input type="search" name="q" value="$query">
+<button type="submit" class="btn primary">Search</button>
+<button type="button" class="btn primary search-options-toggle">Advanced options</button>
+<div class="search-options">
+<label><input type="checkbox" id="id_nonvouched_only" name="nonvouched_only"> Non-vouched only</label>
+<label><input type="checkbox" id="id_picture_only" name="picture_only"> With photos only</label>
+</div>
+</form>
+$groups
+$results""")
+
+SEARCH_RESULT = Template("""<div class="result">
+<ul><li><a href="/$locale/u/$username/"><img src="/media/avatar.png" alt="$full_name" width="64" height="64"></a></li></ul>
+<div class="details"><h2>$full_name</h2></div>
+</div>""")
+
+SEARCH_PAGINATION = """<form id="pagination-form" method="get" action="">
+<select name="page"><option>1</option></select>
+</form>"""
+
+NOT_FOUND = """<div class="well">
+<h2 id="not-found">Sorry, we cannot find any mozillians with those criteria.</h2>
+<p>Here are a few things you can try:</p>
+<p>Check the spelling, or search for fewer words.</p>
+</div>"""
+
+LOCATION = Template("""<h2>Mozillians in $place</h2>
+<div class="row">
+$results
+</div>""")
+
+LOCATION_RESULT = Template("""<div class="result">
+<a href="/$locale/u/$username/"><img src="/media/avatar.png" alt="$full_name" width="64" height="64"></a>
+<div class="details"><h3>$full_name</h3></div>
+</div>""")
+
+PROFILE = Template("""$alerts
+<div id="profile-stats"><div class="profile-photo"><img src="/media/avatar.png" alt="" width="128" height="128"></div></div>
+<div id="profile-info">
+<h1 class="p-name">$full_name</h1>
+$details
+$view_as
+</div>
+<div id="bio"><div class="note"><p>$bio</p></div></div>
+$sections
+<div id="location">$location</div>""")
+
+VIEW_AS = """<label for="view-privacy-mode">View as</label>
+<select id="view-privacy-mode">
+<option value="private" selected="selected">Myself</option>
+<option value="mozillians">Mozillian</option>
+<option value="public">Public</option>
+</select>"""
+
+SETTINGS = Template("""<ul class="nav nav-tabs">
+<li id="profile-tab"><a href="#profile" data-toggle="tab">Profile</a></li>
+<li id="youandmozilla-tab"><a href="#youandmozilla" data-toggle="tab">You and Mozilla</a></li>
+<li id="mygroups-tab"><a href="#mygroups" data-toggle="tab">Groups</a></li>
+<li id="extaccounts-tab"><a href="#extaccounts" data-toggle="tab">External accounts</a></li>
+<li id="developer-tab"><a href="#developer" data-toggle="tab">Developer</a></li>
+</ul>
+<div class="tab-content">
+<div id="profile" class="tab-pane$profile_active">
+<form class="edit-profile" method="post" action="">
+$csrf<input type="hidden" name="form" value="basic">
+<label for="id_full_name">Full name</label><input type="text" id="id_full_name" name="full_name" value="$full_name">
+<label for="id_bio">Bio</label><textarea id="id_bio" name="bio">$bio</textarea>
+<button type="submit" id="form-submit-basic">Update</button>
+</form>
+<hr>
+<form class="edit-profile" method="post" action="">
+$csrf<input type="hidden" name="form" value="skills">
+<div id="skills" class="select2" data-source="/api/skills/">$skills</div>
+<button type="submit" id="form-submit-skills">Update</button>
+</form>
+<div class="panel panel-danger">
+<label><input type="checkbox" id="delete-checkbox" class="acknowledge" data-target="#delete-profile"> I understand</label>
+<a id="delete-profile" class="btn delete disabled" href="/$locale/user/delete_confirm/">Delete profile</a>
+</div>
+</div>
+<div id="youandmozilla" class="tab-pane$youandmozilla_active">
+<form class="edit-profile" method="post" action="">
+$csrf<input type="hidden" name="form" value="contribution">
+<select id="id_date_mozillian_month" name="date_mozillian_month">$months</select>
+<select id="id_date_mozillian_year" name="date_mozillian_year">$years</select>
+<button type="submit" id="form-submit-contribution">Update</button>
+</form>
+</div>
+<div id="mygroups" class="tab-pane$mygroups_active">
+$mygroups
+</div>
+<div id="extaccounts" class="tab-pane$extaccounts_active">
+<form method="post" action="">
+<div>$csrf<input type="hidden" name="form" value="accounts"></div>
+<div class="external-accounts">
+$accounts
+<button type="button" id="accounts-addfield">Add account</button>
+</div>
+<div class="irc">
+<label for="id_ircname">IRC nickname</label><input type="text" id="id_ircname" name="ircname" value="$ircname">
+<button type="submit" id="form-submit-irc">Update</button>
+</div>
+</form>
+</div>
+<div id="developer" class="tab-pane$developer_active">
+<p><a id="services-bugzilla-url" href="/services/bugzilla/">Bugzilla</a></p>
+<p><a id="services-mozilla-reps" href="/services/reps/">Mozilla Reps</a></p>
+</div>
+</div>""")
+
+ACCOUNT_ROW = Template("""<div class="externalaccount-fieldrow">
+<select name="account_type"><option value="GITHUB"$github>GitHub</option><option value="WEBSITE"$website>Website</option></select>
+<input type="text" name="account_identifier" value="$identifier">
+</div>""")
+
+SELECT2_MULTIPLE = Template("""<ul class="select2-selection__rendered">
+$choices
+<li class="select2-search"><input class="select2-search__field" type="search" autocomplete="off"></li>
+</ul>
+<input type="hidden" name="$name" value="$value">
+<ul class="select2-results"></ul>""")
+
+SELECT2_CHOICE = Template(
+    '<li class="select2-selection__choice" data-value="$value">'
+    '<span class="select2-selection__choice__remove">&times;</span>$text</li>')
+
+SELECT2_SINGLE = Template("""<label>$label</label>
+<input type="hidden" id="id_$name" name="$name" value="$value">
+<span class="select2-single" data-field="$name"><span id="select2-id_$name-container" class="select2-selection__rendered">$shown</span></span>""")
+
+REGISTER = Template("""$errors
+<h1>Create your profile</h1>
+<form class="edit-profile" method="post" action="">
+$csrf
+<label for="id_full_name">Full name</label><input type="text" id="id_full_name" name="full_name" value="$full_name">
+$country
+$region
+$city
+<div class="g-recaptcha">
+<iframe src="/recaptcha/" width="304" height="78" frameborder="0"></iframe>
+<input type="hidden" id="g-recaptcha-response" name="g-recaptcha-response">
+</div>
+<label><input type="checkbox" id="id_optin" name="optin"> I agree to the privacy policy</label>
+$optin_error
+<button type="submit" id="form-submit-registration">Create profile</button>
+</form>
+<span class="select2-dropdown"><input class="select2-search__field" type="search" autocomplete="off"><ul class="select2-results__options"></ul></span>""")
+
+RECAPTCHA = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><style>
+.recaptcha-checkbox-checkmark { display: inline-block; width: 24px; height: 24px; border: 2px solid #999; }
+.recaptcha-checkbox-checked .recaptcha-checkbox-checkmark { background: #3a3; }
+</style></head>
+<body><div class="recaptcha-checkbox"><span class="recaptcha-checkbox-checkmark"></span> I'm not a robot</div>
+<script>
+document.querySelector('.recaptcha-checkbox-checkmark').addEventListener('click', function () {
+  this.parentNode.classList.add('recaptcha-checkbox-checked');
+  parent.document.getElementById('g-recaptcha-response').value = 'passed';
+});
+</script></body></html>
+"""
+
+CONFIRM_DELETE = Template("""<h1>Are you sure you want to delete your profile?</h1>
+<form method="post" action="/$locale/user/delete/">
+$csrf
+<button type="submit" id="delete-action">Delete my profile</button>
+<a id="cancel-action" href="/$locale/user/edit/">Cancel</a>
+</form>""")
+
+GROUPS = Template("""$alert
+<h1>Groups</h1>
+<a class="button large" href="/$locale/groups/add/">Create a new group</a>
+<ul class="groups">$groups</ul>""")
+
+CREATE_GROUP = Template("""<h1>Create a group</h1>
+$error
+<form class="add-group" method="post" action="">
+$csrf
+<label for="id_name">Name</label><input type="text" id="id_name" name="name">
+<p>
+<label><input type="radio" id="id_is_access_group_0" name="is_access_group" value="0" checked> Tag</label>
+<label><input type="radio" id="id_is_access_group_1" name="is_access_group" value="1"> Access group</label>
+</p>
+<button type="submit" class="btn btn-primary">Create group</button>
+</form>""")
+
+GROUP = Template("""<h1>$name</h1>
+<div class="group-description">$description</div>
+<p id="group-irc">$irc_channel</p>
+$curator""")
+
+GROUP_CURATOR = Template("""<a href="/$locale/group/$slug/edit/">Edit group</a>
+<form method="post" action="/$locale/group/$slug/delete/">
+$csrf<button type="submit" class="button delete right">Delete group</button>
+</form>""")
+
+EDIT_GROUP = Template("""<h1>$name</h1>
+<ul class="nav nav-tabs">
+<li><a id="description-tab" href="#description" data-toggle="tab">Description</a></li>
+<li><a id="access-tab" href="#access" data-toggle="tab">Access</a></li>
+<li><a id="invitations-tab" href="#invitations" data-toggle="tab">Invitations</a></li>
+</ul>
+<div class="tab-content">
+<div id="description" class="tab-pane$description_active">
+<form id="description-form" method="post" action="">
+$csrf<input type="hidden" name="form" value="description">
+<label for="id_description">Description</label><textarea id="id_description" name="description">$description</textarea>
+<label for="id_irc_channel">IRC channel</label><input type="text" id="id_irc_channel" name="irc_channel" value="$irc_channel">
+<button type="submit" id="form-submit-description">Update</button>
+</form>
+<div class="panel panel-danger">
+<label><input type="checkbox" id="delete-checkbox" class="acknowledge" data-target="#delete-group"> I understand</label>
+<form method="post" action="/$locale/group/$slug/delete/">
+$csrf<button type="submit" id="delete-group" class="btn disabled">Delete group</button>
+</form>
+</div>
+</div>
+<div id="access" class="tab-pane$access_active">
+<form id="grouptype-form" method="post" action="">
+$csrf<input type="hidden" name="form" value="grouptype">
+$accepting
+<fieldset id="id_new_member_criteria_fieldset" class="$criteria_hidden">
+<textarea name="new_member_criteria">$new_member_criteria</textarea>
+</fieldset>
+<button type="submit" id="form-submit-grouptype">Update</button>
+</form>
+</div>
+<div id="invitations" class="tab-pane$invitations_active">
+<form id="invitations-form">$invitees</form>
+<form id="invite-form" method="post" action="">
+$csrf<input type="hidden" name="form" value="invite">
+<div class="select2" data-source="/api/users/">$invite</div>
+<button type="submit" id="form-submit-invite">Invite</button>
+</form>
+</div>
+</div>""")
+
+INVITEE = Template("""<div class="invitee"><a href="/$locale/u/$username/"><img src="/media/avatar.png" alt="" width="32" height="32"></a><a href="/$locale/u/$username/">$full_name</a></div>""")
+
+INVITE = Template("""<h1>Invite a Mozillian</h1>
+<form method="post" action="">
+$csrf
+<label for="id_recipient">Email</label><input type="text" id="id_recipient" name="recipient" value="$recipient">
+$error
+<label for="id_description">Why are you inviting them?</label><textarea id="id_description" name="description">$description</textarea>
+<button type="submit">Send invite</button>
+</form>""")
+
+LOCK = Template("""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Sign in</title><style>.hidden { display: none; }</style></head>
+<body>
+<form id="lock" action="" onsubmit="return false">
+<input type="email" id="field-email" name="email" placeholder="yours@example.com">
+<button type="button" id="enter-initial">Enter</button>
+<div id="passwordless" class="hidden">
+<button type="button" data-handler="send-passwordless-link">Send me a login link</button>
+</div>
+<p id="sent" class="hidden">Check your inbox for a login link.</p>
+</form>
+<script>
+var params = $params;
+document.getElementById('enter-initial').addEventListener('click', function () {
+  document.getElementById('passwordless').classList.remove('hidden');
+});
+document.querySelector('[data-handler="send-passwordless-link"]').addEventListener('click', function () {
+  var request = new XMLHttpRequest();
+  request.open('POST', '/passwordless/start');
+  request.setRequestHeader('Content-Type', 'application/json');
+  request.onload = function () {
+    document.getElementById('sent').classList.remove('hidden');
+  };
+  request.send(JSON.stringify({
+    client_id: params.client_id, connection: 'email', send: 'link',
+    email: document.getElementById('field-email').value, authParams: params.authParams}));
+});
+</script>
+</body></html>
+""")
+
+OPENSEARCH = """<?xml version="1.0" encoding="UTF-8"?>
+<OpenSearchDescription xmlns="http://a9.com/-/spec/opensearch/1.1/">
+<ShortName>Mozillians</ShortName>
+<Url type="text/html" template="/en-US/search/?q={searchTerms}"/>
+</OpenSearchDescription>
+"""
+
+# A transparent single pixel GIF
+AVATAR = ('GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04\x01\x00'
+          '\x00\x00\x00,\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;')
+
+
+def escape(value):
+    return cgi.escape(unicode(value).encode('utf-8') if isinstance(value, unicode) else str(value),
+                      quote=True)
+
+
+def slugify(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+def make_user(username, full_name, email, **fields):
+    user = {
+        'username': username,
+        'full_name': full_name,
+        'email': email,
+        'bio': '',
+        'ircname': '',
+        'website': '',
+        'skills': [],
+        'groups': [],
+        'languages': ['English'],
+        'country': 'United States',
+        'region': 'California',
+        'city': 'Mountain View',
+        'vouched': True,
+        'vouched_by': 'Matt Brandt',
+        'public': False,
+        'private_groups': False,
+        'registered': True,
+        'month': '3',
+        'year': '2012',
+        'accounts': [('GITHUB', username)],
+    }
+    user.update(fields)
+    return user
+
+
+def make_group(name, curator, description='', irc_channel=''):
+    return {
+        'name': name,
+        'slug': slugify(name),
+        'curator': curator,
+        'description': description,
+        'irc_channel': irc_channel,
+        'accepting_new_members': 'yes',
+        'new_member_criteria': '',
+        'invites': [],
+    }
+
+
+def login_required(vouched=False):
+    """Redirect anonymous users home, and unregistered ones to register."""
+    def decorator(view):
+        def wrapper(self):
+            if self.user is None:
+                return self.redirect('/%s/' % self.locale)
+            if not self.user['registered']:
+                return self.redirect('/%s/user/register/' % self.locale)
+            if vouched and not self.user['vouched']:
+                return self.redirect('/%s/' % self.locale)
+            if self.command == 'POST' and not self.check_csrf():
+                return self.send_body('CSRF verification failed', status=403)
+            return view(self)
+        return wrapper
+    return decorator
+
+
+class FakeMozilliansHandler(FakeAuthHandler):
+
+    _locale_re = re.compile(r'^/([a-z]{2}(?:-[A-Z]{2})?)(/.*)?$')
+
+    # (path pattern below the locale, allowed methods, view)
+    site_routes = [
+        (r'/', 'GET', 'home'),
+        (r'/about/', 'GET', 'about'),
+        (r'/search/', 'GET', 'search'),
+        (r'/u/(?P<username>[^/]+)/', 'GET', 'profile'),
+        (r'/country/(?P<country>[^/]+)/(?:region/(?P<region>[^/]+)/)?(?:city/(?P<city>[^/]+)/)?',
+         'GET', 'location'),
+        (r'/user/edit/', 'GET POST', 'settings'),
+        (r'/user/register/', 'GET POST', 'register'),
+        (r'/user/delete_confirm/', 'GET', 'confirm_delete'),
+        (r'/user/delete/', 'POST', 'delete_profile'),
+        (r'/logout/', 'GET', 'logout'),
+        (r'/groups/', 'GET', 'groups'),
+        (r'/groups/add/', 'GET POST', 'create_group'),
+        (r'/group/(?P<slug>[^/]+)/', 'GET', 'group'),
+        (r'/group/(?P<slug>[^/]+)/edit/', 'GET POST', 'edit_group'),
+        (r'/group/(?P<slug>[^/]+)/delete/', 'POST', 'delete_group'),
+        (r'/invite/', 'GET POST', 'invite'),
+        (r'/invite/success/', 'GET', 'invite_success'),
+    ]
+
+    def route(self, method, path):
+        self.user = self.server.user_by_email(self.server.sessions.get(self.cookie('sessionid')))
+        self.locale = 'en-US'
+        self._csrf_token = None
+        self._form = None
+        handler = FakeAuthHandler.route(self, method, path)
+        if handler is not None and path != '/':
+            return handler
+        handler = {
+            '/opensearch.xml': lambda: self.send_body(
+                OPENSEARCH, 'application/opensearchdescription+xml'),
+            '/media/avatar.png': lambda: self.send_body(AVATAR, 'image/gif'),
+            '/recaptcha/': lambda: self.send_body(RECAPTCHA, 'text/html'),
+            '/services/bugzilla/': lambda: self.send_json({'is_vouched': True}),
+            '/services/reps/': lambda: self.send_json({'is_vouched': True}),
+            '/api/skills/': self.api_skills,
+            '/api/users/': self.api_users,
+            '/api/country/': self.api_countries,
+            '/api/region/': self.api_regions,
+            '/api/city/': self.api_cities,
+        }.get(path)
+        if handler is not None:
+            return handler if method == 'GET' else None
+        match = self._locale_re.match(path)
+        if match is None or match.group(1) not in LOCALES:
+            return lambda: self.redirect('/en-US' + self.path, status=301)
+        self.locale, rest = match.group(1), match.group(2) or '/'
+        if 'lang' in self.query and self.query['lang'] in LOCALES:
+            return lambda: self.redirect('/%s%s' % (self.query['lang'], rest))
+        if method == 'GET' and not rest.endswith('/'):
+            query = self.path.partition('?')[2]
+            return lambda: self.redirect('/%s%s/%s' % (
+                self.locale, rest, '?' + query if query else ''), status=301)
+        for pattern, methods, view in self.site_routes:
+            match = re.match(pattern + '$', rest)
+            if match and method in methods.split():
+                self.args = dict((k, unquote_plus(v)) for k, v in match.groupdict().items()
+                                 if v is not None)
+                return getattr(self, view)
+        return None
+
+    def after_login(self, email):
+        user = self.server.user_by_email(email) or self.server.add_user(email)
+        return '/en-US/' if user['registered'] else '/en-US/user/register/'
+
+    def lock(self):
+        params = dict(self.server.transactions.get(self.query.get('state'), {}))
+        client_id = params.pop('client_id', None)
+        data = json.dumps({'client_id': client_id, 'authParams': params})
+        self.send_body(LOCK.substitute(params=data.replace('</', '<\\/')), 'text/html')
+
+    # Pages
+
+    def home(self):
+        sections = ''
+        if self.user and self.user['registered'] and self.user['vouched']:
+            sections = HOME_VOUCHED.substitute(locale=self.locale)
+        self.render('home', 'Mozillians', HOME.substitute(sections=sections))
+
+    def about(self):
+        self.render('about', 'About', ABOUT.substitute(locale=self.locale))
+
+    def search(self):
+        query = self.query.get('q', '').strip()
+        users = []
+        groups = ''
+        if query:
+            users = [u for u in self.server.search(query) if self.can_see(u)]
+            if self.logged_in:
+                groups = ''.join(
+                    '<p><a class="group-name" title="%s" href="/%s/group/%s/">%s</a></p>' % (
+                        escape(g['name']), self.locale, g['slug'], escape(g['name']))
+                    for g in self.server.groups.values() if query.lower() in g['name'].lower())
+        if 'nonvouched_only' in self.query:
+            users = [u for u in users if not u['vouched']]
+        if users:
+            results = '<div class="row">%s</div>\n%s' % (
+                ''.join(self.fill(SEARCH_RESULT, u) for u in users), SEARCH_PAGINATION)
+        else:
+            results = NOT_FOUND
+        self.render('search', 'Search', SEARCH.substitute(
+            locale=self.locale, query=escape(query), groups=groups, results=results))
+
+    def profile(self):
+        user = self.server.users.get(self.args['username'])
+        if user is None or not user['registered'] or not self.can_see(user):
+            return self.render('not-found', 'Not found', '<h1>Page not found</h1>', status=404)
+        own = self.user is user
+        levels = ['public', 'mozillians', 'private']
+        visible = levels[:3 if own else 2 if self.logged_in else 1]
+        alerts = ''
+        if own:
+            alerts = '<div class="alert alert-info">%s</div>' % YOUR_PROFILE.get(
+                self.locale, 'Your profile')
+            flash = self.server.flashes.pop(self.cookie('sessionid'), None)
+            if flash:
+                alerts += '\n<div class="alert alert-success">%s</div>' % escape(flash)
+        details = []
+        if 'mozillians' in visible:
+            details.append('<p><a class="email" href="mailto:%s">%s</a></p>' % (
+                escape(user['email']), escape(user['email'])))
+            if user['ircname']:
+                details.append('<p class="nickname">%s</p>' % escape(user['ircname']))
+            if user['website']:
+                details.append('<p><a class="url" href="%s">%s</a></p>' % (
+                    escape(user['website']), escape(user['website'])))
+        if user['vouched']:
+            details.append('<p class="vouched">Vouched by %s</p>' % escape(user['vouched_by']))
+        else:
+            details.append('<p id="pending-approval">Your profile is pending approval.</p>'
+                           if own else '<p>Not vouched yet.</p>')
+        sections = []
+        groups = [self.server.groups[s]['name'] for s in user['groups'] if s in self.server.groups]
+        for name, privacy, values in (
+                ('skills', 'mozillians', user['skills']),
+                ('groups', 'private' if user['private_groups'] else 'mozillians', groups),
+                ('languages', 'public', user['languages'])):
+            if values and privacy in visible:
+                sections.append(
+                    '<div id="%s" data-privacy="%s"><h3>%s</h3><p>%s</p></div>' % (
+                        name, privacy, name.capitalize(), escape(', '.join(values))))
+        self.render('profile', user['full_name'], PROFILE.substitute(
+            alerts=alerts,
+            full_name=escape(user['full_name']),
+            details='\n'.join(details),
+            view_as=VIEW_AS if own else '',
+            bio=escape(user['bio']),
+            sections='\n'.join(sections),
+            location=self.location_links(user)))
+
+    @login_required()
+    def location(self):
+        code = self.args['country']
+        country = COUNTRIES.get(code)
+        if country is None:
+            return self.not_found()
+        users = [u for u in self.server.users.values() if u['registered'] and
+                 u['country'] == country and
+                 u['region'] == self.args.get('region', u['region']) and
+                 u['city'] == self.args.get('city', u['city'])]
+        place = ', '.join(
+            [self.args.get('city') or self.args.get('region') or country] +
+            ([country] if 'region' in self.args else []))
+        self.render('search', 'Mozillians in ' + place, LOCATION.substitute(
+            place=escape(place),
+            results='\n'.join(self.fill(LOCATION_RESULT, u) for u in users)))
+
+    @login_required()
+    def settings(self):
+        user = self.user
+        tab = self.query.get('tab', 'profile')
+        if self.command == 'POST':
+            form = self.read_form()
+            tab = {'basic': 'profile', 'skills': 'profile', 'contribution': 'youandmozilla',
+                   'accounts': 'extaccounts'}.get(form.get('form'), 'profile')
+            if form.get('form') == 'basic':
+                user['full_name'] = form.get('full_name', user['full_name'])
+                user['bio'] = form.get('bio', '')
+            elif form.get('form') == 'skills':
+                user['skills'] = [s for s in form.get('skills', '').split(',') if s]
+            elif form.get('form') == 'contribution':
+                user['month'] = form.get('date_mozillian_month', '')
+                user['year'] = form.get('date_mozillian_year', '')
+            elif form.get('form') == 'accounts':
+                user['ircname'] = form.get('ircname', '')
+                user['accounts'] = [
+                    (kind, identifier) for kind, identifier in zip(
+                        form.getlist('account_type'), form.getlist('account_identifier'))
+                    if identifier]
+            return self.redirect('/%s/user/edit/?tab=%s' % (self.locale, tab))
+        active = dict(('%s_active' % name, ' active' if name == tab else '') for name in (
+            'profile', 'youandmozilla', 'mygroups', 'extaccounts', 'developer'))
+        if user['vouched']:
+            mygroups = ('<p>You are not a member of any group. Why not '
+                        '<a href="/%s/groups/">find the group</a> that fits you?</p>' % self.locale)
+        else:
+            mygroups = '<p>You can join groups once you are vouched.</p>'
+        accounts = user['accounts'] or [('GITHUB', '')]
+        self.render('edit-profile', 'Settings', SETTINGS.substitute(
+            active,
+            locale=self.locale,
+            csrf=self.csrf_input,
+            full_name=escape(user['full_name']),
+            bio=escape(user['bio']),
+            skills=self.select2(
+                'skills', [(s, s) for s in user['skills']]),
+            months=self.options(
+                [('', 'Month')] + [(str(i + 1), m) for i, m in enumerate(MONTHS)], user['month']),
+            years=self.options(
+                [('', 'Year')] + [(str(y), str(y)) for y in YEARS], user['year']),
+            mygroups=mygroups,
+            accounts='\n'.join(ACCOUNT_ROW.substitute(
+                github=' selected' if kind == 'GITHUB' else '',
+                website=' selected' if kind == 'WEBSITE' else '',
+                identifier=escape(identifier)) for kind, identifier in accounts),
+            ircname=escape(user['ircname'])))
+
+    def register(self):
+        user = self.user
+        if user is None:
+            return self.redirect('/%s/' % self.locale)
+        if user['registered']:
+            return self.redirect('/%s/user/edit/' % self.locale)
+        form = {}
+        errors = ''
+        optin_error = ''
+        if self.command == 'POST':
+            if not self.check_csrf():
+                return self.send_body('CSRF verification failed', status=403)
+            form = self.read_form()
+            if not form.get('optin'):
+                optin_error = '<span class="error-message">This field is required.</span>'
+            if optin_error or not form.get('full_name') or not form.get('g-recaptcha-response'):
+                errors = '<div class="alert alert-error">Please correct the errors below.</div>'
+            else:
+                user.update(full_name=form['full_name'], country=form.get('country', ''),
+                            region=form.get('region', ''), city=form.get('city', ''),
+                            registered=True)
+                self.server.flashes[self.cookie('sessionid')] = 'Your account has been created.'
+                return self.redirect('/%s/u/%s/' % (self.locale, quote(user['username'])))
+        fields = dict((name, SELECT2_SINGLE.substitute(
+            name=name, label=name.capitalize(), value=escape(form.get(name, '')),
+            shown=escape(form.get(name) or 'Select a %s' % name)))
+            for name in ('country', 'region', 'city'))
+        self.render('edit-profile', 'Register', REGISTER.substitute(
+            fields, errors=errors, optin_error=optin_error, csrf=self.csrf_input,
+            full_name=escape(form.get('full_name', ''))))
+
+    @login_required()
+    def confirm_delete(self):
+        self.render('confirm-delete', 'Delete profile', CONFIRM_DELETE.substitute(
+            locale=self.locale, csrf=self.csrf_input))
+
+    @login_required()
+    def delete_profile(self):
+        self.server.users.pop(self.user['username'], None)
+        self.server.sessions.pop(self.cookie('sessionid'), None)
+        self.redirect('/%s/' % self.locale)
+
+    def logout(self):
+        self.server.sessions.pop(self.cookie('sessionid'), None)
+        self.redirect('/%s/' % self.locale)
+
+    @login_required(vouched=True)
+    def groups(self):
+        flash = self.server.flashes.pop(self.cookie('sessionid'), None)
+        self.render('groups', 'Groups', GROUPS.substitute(
+            locale=self.locale,
+            alert='<div class="alert alert-info">%s</div>' % escape(flash) if flash else '',
+            groups=''.join('<li><a href="/%s/group/%s/">%s</a></li>' % (
+                self.locale, g['slug'], escape(g['name'])) for g in self.server.groups.values())))
+
+    @login_required(vouched=True)
+    def create_group(self):
+        error = ''
+        if self.command == 'POST':
+            name = self.read_form().get('name', '').strip()
+            group = self.server.add_group(name, self.user['username']) if name else None
+            if group is not None:
+                return self.redirect('/%s/group/%s/edit/' % (self.locale, group['slug']))
+            error = '<p class="error-message">%s</p>' % (
+                'A group with this name already exists.' if name else 'This field is required.')
+        self.render('group-add', 'Create a group', CREATE_GROUP.substitute(
+            error=error, csrf=self.csrf_input))
+
+    @login_required()
+    def group(self):
+        group = self.server.groups.get(self.args['slug'])
+        if group is None:
+            return self.not_found()
+        curator = ''
+        if group['curator'] == self.user['username']:
+            curator = GROUP_CURATOR.substitute(
+                locale=self.locale, slug=group['slug'], csrf=self.csrf_input)
+        self.render('group-show', group['name'], GROUP.substitute(
+            name=escape(group['name']),
+            description=escape(group['description']),
+            irc_channel=escape(group['irc_channel']),
+            curator=curator))
+
+    @login_required(vouched=True)
+    def edit_group(self):
+        group = self.server.groups.get(self.args['slug'])
+        if group is None:
+            return self.not_found()
+        if group['curator'] != self.user['username']:
+            return self.send_body('Forbidden', status=403)
+        tab = self.query.get('tab', 'description')
+        if self.command == 'POST':
+            form = self.read_form()
+            if form.get('form') == 'description':
+                group['description'] = form.get('description', '')
+                group['irc_channel'] = form.get('irc_channel', '')
+            elif form.get('form') == 'grouptype':
+                group['accepting_new_members'] = form.get('accepting_new_members', 'yes')
+                group['new_member_criteria'] = form.get('new_member_criteria', '')
+            elif form.get('form') == 'invite':
+                for username in form.get('invites', '').split(','):
+                    if username in self.server.users and username not in group['invites']:
+                        group['invites'].append(username)
+            tab = {'grouptype': 'access', 'invite': 'invitations'}.get(
+                form.get('form'), 'description')
+            return self.redirect('/%s/group/%s/edit/?tab=%s' % (self.locale, group['slug'], tab))
+        active = dict(('%s_active' % name, ' active' if name == tab else '') for name in (
+            'description', 'access', 'invitations'))
+        accepting = '\n'.join(
+            '<label><input type="radio" id="id_accepting_new_members_%d" '
+            'name="accepting_new_members" value="%s"%s> %s</label>' % (
+                i, value, ' checked' if group['accepting_new_members'] == value else '', label)
+            for i, (value, label) in enumerate(
+                [('yes', 'Open'), ('by_request', 'Reviewed'), ('no', 'Closed')]))
+        self.render('group-edit', group['name'], EDIT_GROUP.substitute(
+            active,
+            locale=self.locale,
+            slug=group['slug'],
+            csrf=self.csrf_input,
+            name=escape(group['name']),
+            description=escape(group['description']),
+            irc_channel=escape(group['irc_channel']),
+            accepting=accepting,
+            criteria_hidden='' if group['accepting_new_members'] == 'by_request' else 'hidden',
+            new_member_criteria=escape(group['new_member_criteria']),
+            invitees=''.join(self.fill(INVITEE, self.server.users[u])
+                             for u in group['invites'] if u in self.server.users),
+            invite=self.select2('invites', [])))
+
+    @login_required(vouched=True)
+    def delete_group(self):
+        group = self.server.groups.get(self.args['slug'])
+        if group is None:
+            return self.not_found()
+        if group['curator'] != self.user['username']:
+            return self.send_body('Forbidden', status=403)
+        self.server.groups.pop(group['slug'], None)
+        self.server.flashes[self.cookie('sessionid')] = 'The group was deleted.'
+        self.redirect('/%s/groups/' % self.locale)
+
+    @login_required(vouched=True)
+    def invite(self):
+        form = {}
+        error = ''
+        if self.command == 'POST':
+            form = self.read_form()
+            recipient = form.get('recipient', '').strip()
+            if re.match(r'^[^@\s]+@[^@\s]+\.[a-z]{2,}$', recipient, re.I):
+                return self.redirect('/%s/invite/success/?%s' % (
+                    self.locale, urlencode({'email': recipient})))
+            error = '<span class="error-message">Enter a valid email address.</span>'
+        self.render('invite', 'Invite', INVITE.substitute(
+            csrf=self.csrf_input,
+            recipient=escape(form.get('recipient', '')),
+            description=escape(form.get('description', '')),
+            error=error))
+
+    @login_required(vouched=True)
+    def invite_success(self):
+        self.render('invite', 'Invitation sent', '<div class="alert alert-success">%s</div>' % (
+            escape(INVITED % self.query.get('email', ''))))
+
+    # select2 data sources
+
+    def api_skills(self):
+        term = self.query.get('q', '').strip().lower()
+        skills = [term] if term else []
+        skills += [s for s in SKILLS if term in s and s != term]
+        self.send_json([{'id': s, 'text': s} for s in skills])
+
+    def api_users(self):
+        term = self.query.get('q', '').strip().lower()
+        self.send_json([{'id': u['username'], 'text': u['full_name']}
+                        for u in self.server.search(term) if u['vouched']] if term else [])
+
+    def api_countries(self):
+        self.send_json(self.matching(COUNTRIES.values()))
+
+    def api_regions(self):
+        self.send_json(self.matching(REGIONS.get(self.query.get('country'), [])))
+
+    def api_cities(self):
+        self.send_json(self.matching(CITIES.get(self.query.get('region'), [])))
+
+    # Helpers
+
+    @property
+    def logged_in(self):
+        return self.user is not None and self.user['registered']
+
+    @property
+    def csrf_token(self):
+        if self._csrf_token is None:
+            self._csrf_token = self.cookie('csrftoken') or uuid.uuid4().hex
+        return self._csrf_token
+
+    @property
+    def csrf_input(self):
+        return '<input type="hidden" name="csrfmiddlewaretoken" value="%s">' % self.csrf_token
+
+    def check_csrf(self):
+        form = self.read_form()
+        token = self.cookie('csrftoken')
+        return token is not None and form.get('csrfmiddlewaretoken') == token
+
+    def read_form(self):
+        if self._form is None:
+            self._form = Form(parse_qs(self.read_body(), keep_blank_values=True))
+        return self._form
+
+    def can_see(self, user):
+        return self.logged_in or user['public']
+
+    def matching(self, values):
+        term = self.query.get('q', '').lower()
+        return [{'id': v, 'text': v} for v in values if term in v.lower()]
+
+    def location_links(self, user):
+        code = next((c for c, name in COUNTRIES.items() if name == user['country']), None)
+        if code is None:
+            return ''
+        country = '/%s/country/%s/' % (self.locale, code)
+        region = '%sregion/%s/' % (country, quote(user['region']))
+        city = '%scity/%s/' % (region, quote(user['city']))
+        return ('<a class="locality" href="%s">%s</a>, <a class="region" href="%s">%s</a>, '
+                '<a class="country-name" href="%s">%s</a>' % (
+                    city, escape(user['city']), region, escape(user['region']),
+                    country, escape(user['country'])))
+
+    def fill(self, template, user):
+        return template.substitute(locale=self.locale, username=quote(user['username']),
+                                   full_name=escape(user['full_name']))
+
+    def options(self, choices, selected):
+        return ''.join('<option value="%s"%s>%s</option>' % (
+            value, ' selected="selected"' if value == selected else '', label)
+            for value, label in choices)
+
+    def select2(self, name, choices):
+        return SELECT2_MULTIPLE.substitute(
+            name=name,
+            value=escape(','.join(value for value, text in choices)),
+            choices=''.join(SELECT2_CHOICE.substitute(value=escape(value), text=escape(text))
+                            for value, text in choices))
+
+    def render(self, body_id, title, content, status=200):
+        user = self.user if self.logged_in else None
+        if user is not None:
+            nav = NAV_LOGGED_IN.substitute(
+                locale=self.locale,
+                username=quote(user['username']),
+                vouched_items=NAV_VOUCHED.substitute(
+                    locale=self.locale) if user['vouched'] else '')
+        elif self.user is not None:
+            nav = '<a id="nav-logout" href="/%s/logout/">Log out</a>' % self.locale
+        else:
+            nav = NAV_ANONYMOUS
+        body = LAYOUT.substitute(
+            locale=self.locale,
+            title=escape(title),
+            style=STYLE,
+            body_id=body_id,
+            nav=nav,
+            content=content,
+            languages=self.options(LOCALES.items(), self.locale),
+            script=SCRIPT)
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        if self.cookie('csrftoken') != self.csrf_token:
+            self.send_header('Set-Cookie', 'csrftoken=%s; Path=/' % self.csrf_token)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, data):
+        self.send_body(json.dumps(data), 'application/json')
+
+
+class Form(dict):
+    """Posted form fields, the last value of each unless asked for all."""
+
+    def __init__(self, fields):
+        dict.__init__(self, ((k, v[-1]) for k, v in fields.items()))
+        self.fields = fields
+
+    def getlist(self, name):
+        return self.fields.get(name, [])
+
+
+class FakeMozillians(FakeAuth):
+    """Local stand-in for the Mozillians site, including its login.
+
+    Users and groups are kept in memory, starting with SEED_USERS and
+    SEED_GROUPS. variables() returns them in the format of the variables
+    file, keyed by the site's host name.
+    """
+
+    handler_class = FakeMozilliansHandler
+
+    def __init__(self, restmail, port=0):
+        FakeAuth.__init__(self, restmail, port)
+        self.mutex = threading.Lock()
+        self.users = OrderedDict((u['username'], make_user(**u)) for u in SEED_USERS)
+        self.groups = OrderedDict()
+        for group in SEED_GROUPS:
+            group = make_group(**group)
+            self.groups[group['slug']] = group
+        self.flashes = {}
+
+    def user_by_email(self, email):
+        return next((u for u in self.users.values() if u['email'] == email), None)
+
+    def add_user(self, email):
+        with self.mutex:
+            base = re.sub(r'[^\w.]+', '', email.partition('@')[0]) or 'mozillian'
+            username, n = base, 1
+            while username in self.users:
+                n += 1
+                username = '%s%d' % (base, n)
+            user = self.users[username] = make_user(
+                username, '', email, registered=False, vouched=False, month='', year='',
+                accounts=[], languages=[])
+            return user
+
+    def add_group(self, name, curator):
+        with self.mutex:
+            group = make_group(name, curator)
+            if not group['slug'] or group['slug'] in self.groups:
+                return None
+            self.groups[group['slug']] = group
+            return group
+
+    def search(self, term):
+        term = term.lower()
+        return [u for u in self.users.values() if u['registered'] and any(
+            term in u[field].lower() for field in ('full_name', 'username', 'email', 'ircname'))]
+
+    def variables(self):
+        def fields(*usernames):
+            return [dict((k, self.users[u][k]) for k in ('username', 'email', 'full_name'))
+                    for u in usernames]
+        return {'127.0.0.1': {'users': {
+            'vouched': fields('vouched.one', 'vouched.two', 'vouched.three'),
+            'unvouched': fields('unvouched')[0],
+            'private': fields('private.mozillian')[0],
+            'github_non_nda': {'username': '', 'password': '', 'secret': ''},
+        }}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--port', type=int, default=8000,
+                        help='port of the site. (default: %(default)s)')
+    parser.add_argument('--restmail-port', type=int, default=0,
+                        help='port of the restmail stand-in. (default: any free port)')
+    parser.add_argument('--variables', default='fake-variables.json', metavar='path',
+                        help='where to write the stored users. (default: %(default)s)')
+    args = parser.parse_args()
+    restmail = FakeRestmail(port=args.restmail_port).start()
+    site = FakeMozillians(restmail, args.port)
+    with open(args.variables, 'w') as f:
+        json.dump(site.variables(), f, indent=2)
+    print('Serving {0}, run the tests with\n\n'
+          '    pytest --base-url {0} --variables {1} --restmail-url {2}\n'.format(
+              site.site_url, args.variables, restmail.url))
+    try:
+        site.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        site.server_close()
+        restmail.stop()
+
+
+if __name__ == '__main__':
+    main()
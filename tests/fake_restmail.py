@@ -0,0 +1,79 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import json
+import threading
+import time
+from BaseHTTPServer import BaseHTTPRequestHandler
+from SocketServer import TCPServer, ThreadingMixIn
+
+
+class FakeRestmailHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def username(self):
+        return self.path.rstrip('/').rpartition('/mail/')[2]
+
+    def do_GET(self):
+        self.server.requests.append(('GET', self.path))
+        self.server.connections.add(self.client_address)
+        self.send_json(self.server.messages(self.username()))
+
+    def do_DELETE(self):
+        self.server.requests.append(('DELETE', self.path))
+        self.server.connections.add(self.client_address)
+        self.server.mailboxes.pop(self.username(), None)
+        self.send_json([])
+
+    def send_json(self, data):
+        body = json.dumps(data)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeRestmail(ThreadingMixIn, TCPServer):
+    """Local restmail.net stand-in serving /mail/<username>.
+
+    Messages are queued with deliver() and only become visible once their
+    delay has passed, which allows testing how quickly a client notices.
+    """
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0):
+        TCPServer.__init__(self, (host, port), FakeRestmailHandler)
+        self.mailboxes = {}
+        self.requests = []
+        self.connections = set()
+        self._thread = None
+
+    @property
+    def url(self):
+        return 'http://%s:%s' % self.server_address
+
+    def deliver(self, username, text, delay=0):
+        username = username.partition('@restmail.net')[0]
+        self.mailboxes.setdefault(username, []).append(
+            (time.time() + delay, {'text': text}))
+
+    def messages(self, username):
+        now = time.time()
+        return [m for t, m in self.mailboxes.get(username, []) if t <= now]
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,297 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Records the HTTP requests made through requests and replays them.
+
+With --cassette a directory is given, which --cassette-mode=record fills
+with the responses to every request made by LinkCrawler, StatusVerifier,
+the restmail client and anything else using requests. Every process
+writes its own pair of files: an index with one JSON line per response,
+holding its headers and where its body is, and a blob with the bodies.
+Recording first deletes the files of earlier recordings.
+--cassette-mode=replay serves the recorded responses without touching the
+network, reading bodies out of the memory mapped blobs only when asked
+for. Requests which were not recorded go to the network, or fail with
+--cassette-strict.
+
+Responses are matched on method, URL and a hash of the request body. A
+request made several times is answered with its recordings in order,
+then with the last one. Cookies are not put into the session's jar on
+replay, and tests using unique URLs such as new restmail users cannot be
+replayed.
+"""
+
+import glob
+import hashlib
+import io
+import json
+import mmap
+import os
+import threading
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+from urllib3._collections import HTTPHeaderDict
+
+# recorded bodies are decoded, so these would no longer be true
+DROPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+_send = HTTPAdapter.__dict__['send']
+
+
+class CassetteMiss(requests.ConnectionError):
+    pass
+
+
+class Cassette(object):
+
+    def __init__(self, directory, mode='replay', strict=False, name='main'):
+        self.directory = directory
+        self.mode = mode
+        self.strict = strict
+        self.name = name
+        self.entries = {}
+        self.recorded = 0
+        self.replayed = 0
+        self.missed = 0
+        self._blobs = []
+        self._pending = []
+        self._cursors = {}
+        self._lock = threading.Lock()
+        self._index = None
+        self._bodies = None
+
+    @staticmethod
+    def key(request):
+        body = request.body or b''
+        if isinstance(body, unicode):
+            body = body.encode('utf-8')
+        elif not isinstance(body, bytes):
+            # a file or generator, which cannot be read without consuming it
+            body = repr(body)
+        return '%s %s %s' % (request.method, request.url, hashlib.sha1(body).hexdigest())
+
+    def open(self):
+        if self.mode == 'record':
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            path = os.path.join(self.directory, self.name)
+            self._index = open(path + '.index', 'w')
+            self._bodies = open(path + '.bodies', 'wb')
+        else:
+            for index in sorted(glob.glob(os.path.join(self.directory, '*.index'))):
+                self._load(index)
+        return self
+
+    def _load(self, index):
+        blob = len(self._blobs)
+        with open(index[:-len('.index')] + '.bodies', 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            self._blobs.append(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b'')
+        with open(index) as f:
+            for line in f:
+                entry = json.loads(line)
+                entry['blob'] = blob
+                self.entries.setdefault(entry.pop('key'), []).append(entry)
+
+    def erase(self):
+        """Delete the recordings in the directory, which replay would merge."""
+        for path in glob.glob(os.path.join(self.directory, '*.index')) + \
+                glob.glob(os.path.join(self.directory, '*.bodies')):
+            os.remove(path)
+
+    def close(self):
+        for finish in list(self._pending):
+            finish()
+        for f in (self._index, self._bodies):
+            if f is not None:
+                f.close()
+        self._index = self._bodies = None
+        for blob in self._blobs:
+            if blob:
+                blob.close()
+        self._blobs = []
+
+    def play(self, adapter, request, send):
+        """Answer the request from the cassette, calling send for real ones."""
+        if self.mode == 'record':
+            return self.record(request, send())
+        key = self.key(request)
+        with self._lock:
+            entries = self.entries.get(key)
+            if entries:
+                cursor = self._cursors.get(key, 0)
+                self._cursors[key] = min(cursor + 1, len(entries) - 1)
+                self.replayed += 1
+            else:
+                self.missed += 1
+        if entries:
+            return self.replay(adapter, request, entries[cursor])
+        if self.strict:
+            raise CassetteMiss('No recorded response to %s %s' % (request.method, request.url),
+                               request=request)
+        return send()
+
+    def record(self, request, response):
+        """Tee the response's body into the cassette as it is streamed.
+
+        The body is recorded once read to the end, so streaming consumers
+        get it as it arrives. Closing the response, or the cassette, reads
+        whatever was left unread first.
+        """
+        raw = response.raw
+        stream, close = raw.stream, raw.close
+        chunks = []
+
+        def tee(*args, **kwargs):
+            for chunk in stream(*args, **kwargs):
+                chunks.append(chunk)
+                yield chunk
+            with self._lock:
+                pending = finish in self._pending
+                if pending:
+                    self._pending.remove(finish)
+            if pending:
+                self._write(request, response, b''.join(chunks))
+
+        def finish():
+            try:
+                for chunk in tee(decode_content=True):
+                    pass
+            except Exception:
+                # the consumer is done with the response, only its recording is lost
+                pass
+            finally:
+                close()
+
+        with self._lock:
+            self._pending.append(finish)
+        raw.stream, raw.close = tee, finish
+        return response
+
+    def _write(self, request, response, body):
+        headers = [(k, v) for k, v in response.headers.items()
+                   if k.lower() not in DROPPED_HEADERS]
+        with self._lock:
+            offset = self._bodies.tell()
+            self._bodies.write(body)
+            self._bodies.flush()
+            self._index.write(json.dumps({
+                'key': self.key(request),
+                'status': response.status_code,
+                'reason': response.reason,
+                'headers': headers,
+                'offset': offset,
+                'length': len(body)}, separators=(',', ':')) + '\n')
+            self._index.flush()
+            self.recorded += 1
+
+    def body(self, entry):
+        blob = self._blobs[entry['blob']]
+        return blob[entry['offset']:entry['offset'] + entry['length']]
+
+    def replay(self, adapter, request, entry):
+        body = self.body(entry)
+        headers = HTTPHeaderDict(entry['headers'])
+        headers['Content-Length'] = str(len(body))
+        raw = HTTPResponse(body=io.BytesIO(body), headers=headers, status=entry['status'],
+                           reason=entry['reason'], preload_content=False, decode_content=False)
+        return adapter.build_response(request, raw)
+
+    @property
+    def stats(self):
+        return {'recorded': self.recorded, 'replayed': self.replayed, 'missed': self.missed}
+
+
+class CassetteAdapter(HTTPAdapter):
+    """Transport adapter answering from a cassette, to mount on one session."""
+
+    def __init__(self, cassette, **kwargs):
+        super(CassetteAdapter, self).__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        return self.cassette.play(self, request, lambda: _send(self, request, **kwargs))
+
+
+def mount_globally(cassette):
+    """Make every HTTPAdapter answer from the cassette until undone.
+
+    The sessions in pages mount adapters of their own, which is why the
+    adapter class rather than the sessions are patched. Returns a function
+    restoring the real transport.
+    """
+    def send(adapter, request, **kwargs):
+        return cassette.play(adapter, request, lambda: _send(adapter, request, **kwargs))
+    HTTPAdapter.send = send
+
+    def undo():
+        HTTPAdapter.send = _send
+    return undo
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('cassette')
+    group.addoption('--cassette', metavar='path',
+                    help='directory of recorded HTTP responses for requests made '
+                         'outside the browser.')
+    group.addoption('--cassette-mode', choices=('record', 'replay'), default='replay',
+                    help='record responses from the network, or replay them. '
+                         '(default: %(default)s)')
+    group.addoption('--cassette-strict', action='store_true', default=False,
+                    help='fail requests which were not recorded instead of '
+                         'making them when replaying.')
+
+
+def pytest_configure(config):
+    directory = config.getoption('cassette')
+    if not directory:
+        return
+    worker = getattr(config, 'slaveinput', {}).get('slaveid')
+    if worker is None and config.getoption('cassette_mode') == 'record':
+        # before any worker starts writing its own files
+        Cassette(directory).erase()
+    if worker is None and getattr(config.option, 'numprocesses', None):
+        # the workers make the requests, the xdist master only sums up
+        config._cassette = Cassette(directory, config.getoption('cassette_mode'))
+        return
+    cassette = Cassette(directory, config.getoption('cassette_mode'),
+                        config.getoption('cassette_strict'), worker or 'main').open()
+    config._cassette = cassette
+    config._cassette_undo = mount_globally(cassette)
+
+
+def pytest_unconfigure(config):
+    undo = getattr(config, '_cassette_undo', None)
+    if undo is not None:
+        undo()
+        config._cassette.close()
+
+
+def pytest_sessionfinish(session):
+    cassette = getattr(session.config, '_cassette', None)
+    if cassette is not None and hasattr(session.config, 'slaveoutput'):
+        session.config.slaveoutput['cassette'] = cassette.stats
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    cassette = getattr(node.config, '_cassette', None)
+    output = getattr(node, 'workeroutput', getattr(node, 'slaveoutput', {}))
+    stats = output.get('cassette', {})
+    if cassette is not None:
+        cassette.recorded += stats.get('recorded', 0)
+        cassette.replayed += stats.get('replayed', 0)
+        cassette.missed += stats.get('missed', 0)
+
+
+def pytest_terminal_summary(terminalreporter):
+    cassette = getattr(terminalreporter.config, '_cassette', None)
+    if cassette is None:
+        return
+    terminalreporter.write_sep('-', 'cassette')
+    terminalreporter.write_line(
+        '{recorded} recorded, {replayed} replayed, {missed} not found'.format(**cassette.stats))
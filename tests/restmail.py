@@ -2,32 +2,87 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
-import json
 import time
 
 import requests
 
+RESTMAIL_URL = 'https://restmail.net'
+
+
+class MailTimeout(Exception):
+    pass
+
+
+class Inbox(object):
+    """Polls restmail over a single keep-alive session.
+
+    The polling interval starts short, as most messages arrive within a
+    second or two, and backs off towards max_interval for slow deliveries.
+    """
+
+    def __init__(self, url=RESTMAIL_URL, interval=0.1, backoff=1.5, max_interval=2):
+        self.url = url
+        self.interval = interval
+        self.backoff = backoff
+        self.max_interval = max_interval
+        self.session = requests.Session()
+        self.delivery_times = []
+
+    def mail_url(self, username):
+        return '%s/mail/%s' % (self.url, username.partition('@restmail.net')[0])
+
+    def clear(self, username):
+        self.session.delete(self.mail_url(username)).raise_for_status()
+
+    def get_mail(self, username, message_count=1, timeout=60):
+        start_time = time.time()
+        end_time = start_time + timeout
+        interval = self.interval
+        while True:
+            response = self.session.get(self.mail_url(username))
+            response.raise_for_status()
+            restmail = response.json()
+            if len(restmail) >= message_count:
+                self.delivery_times.append(time.time() - start_time)
+                # consume the messages so the next call starts from empty
+                self.clear(username)
+                return restmail[-message_count:]
+            remaining = end_time - time.time()
+            if remaining <= 0:
+                break
+            time.sleep(min(interval, remaining))
+            interval = min(interval * self.backoff, self.max_interval)
+        raise MailTimeout('Timeout after %(TIMEOUT)s seconds getting restmail for '
+                          '%(USERNAME)s. Expected %(EXPECTED_MESSAGE_COUNT)s '
+                          'messages but there were %(ACTUAL_MESSAGE_COUNT)s.' % {
+                              'TIMEOUT': timeout,
+                              'USERNAME': username,
+                              'EXPECTED_MESSAGE_COUNT': message_count,
+                              'ACTUAL_MESSAGE_COUNT': len(restmail)})
+
+    def login_link(self, username, timeout=60):
+        """Return the passwordless login link mailed to username."""
+        mail = self.get_mail(username, timeout=timeout)
+        mail_content = mail[0]['text'].replace('\n', ' ').replace('amp;', '').split(' ')
+        for link in mail_content:
+            if 'passwordless/verify_redirect' in link:
+                return link
+
+    @property
+    def last_delivery_time(self):
+        return self.delivery_times[-1] if self.delivery_times else None
+
+    def add_stats(self, stats):
+        self.delivery_times.extend(stats.get('delivery_times', []))
+
+    @property
+    def stats(self):
+        return {'delivery_times': self.delivery_times}
+
+
+# One inbox, and therefore one connection pool, per xdist worker
+inbox = Inbox()
+
 
 def get_mail(username, message_count=1, timeout=60):
-    username = username.partition('@restmail.net')[0]
-    end_time = time.time() + timeout
-    response = requests.delete(
-        'https://restmail.net/mail/%s' % username)
-    response.raise_for_status()
-    while (True):
-        response = requests.get(
-            'https://restmail.net/mail/%s' % username)
-        response.raise_for_status()
-        restmail = json.loads(response.content)
-        if len(restmail) == message_count:
-            return restmail
-        time.sleep(0.5)
-        if (time.time() > end_time):
-            break
-    raise Exception('Timeout after %(TIMEOUT)s seconds getting restmail for '
-                    '%(USERNAME)s. Expected %(EXPECTED_MESSAGE_COUNT)s '
-                    'messages but there were %(ACTUAL_MESSAGE_COUNT)s.' % {
-                        'TIMEOUT': timeout,
-                        'USERNAME': username,
-                        'EXPECTED_MESSAGE_COUNT': message_count,
-                        'ACTUAL_MESSAGE_COUNT': len(restmail)})
+    return inbox.get_mail(username, message_count, timeout)
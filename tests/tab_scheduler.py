@@ -0,0 +1,169 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Runs read-only checks side by side in the tabs of one browser.
+
+A check is a generator function which yields the pages it wants to read,
+as page objects which were not opened yet, and is sent each page once it
+has loaded. The tab_scheduler fixture starts loading the pages of up to
+--tabs checks at once, each in a tab of its own, and resumes a check
+when its tab has finished loading. The browser waits for several pages
+in the time it would wait for one, without another browser's memory.
+
+Checks share the browser's cookies and must not change anything. While a
+check runs the browser is switched to its tab, so it can use its pages
+like any test does, but navigating other than by yielding blocks all
+tabs until the page has loaded.
+"""
+
+import time
+from collections import OrderedDict, deque
+
+import pytest
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+START_LOAD_SCRIPT = """
+document.tabSchedulerLeft = true;
+window.location.assign(arguments[0]);
+"""
+
+LOADED_SCRIPT = """
+return !document.tabSchedulerLeft && document.readyState === 'complete';
+"""
+
+
+class Task(object):
+
+    def __init__(self, name, check):
+        self.name = name
+        self.generator = check()
+        self.page = None
+        self.started = None
+
+
+class TabScheduler(object):
+
+    def __init__(self, driver, tabs=4, timeout=30, poll=0.05):
+        self.driver = driver
+        self.tabs = tabs
+        self.timeout = timeout
+        self.poll = poll
+        self.loads = 0
+
+    def run(self, checks):
+        """Run (name, check) pairs, returning the exceptions of failed checks by name.
+
+        Drivers without windows, such as HttpDriver, run the checks one
+        after the other.
+        """
+        failures = OrderedDict()
+        if self.tabs < 2 or not hasattr(self.driver, 'window_handles'):
+            for name, check in checks:
+                self._run_alone(Task(name, check), failures)
+            return failures
+        first = self.driver.current_window_handle
+        handles = self._open_tabs(min(self.tabs, len(checks)))
+        pending = deque(checks)
+        busy = OrderedDict()
+        try:
+            while pending or busy:
+                for handle in [h for h in handles if h not in busy]:
+                    if not pending:
+                        break
+                    task = Task(*pending.popleft())
+                    self.driver.switch_to.window(handle)
+                    if self._step(task, None, failures):
+                        busy[handle] = task
+                if not self._resume_loaded(busy, failures):
+                    time.sleep(self.poll)
+        finally:
+            for handle in handles:
+                if handle != first:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+            self.driver.switch_to.window(first)
+        return failures
+
+    def _open_tabs(self, count):
+        handles = list(self.driver.window_handles)
+        for _ in range(count - 1):
+            self.driver.execute_script('window.open("about:blank");')
+        opened = [h for h in self.driver.window_handles if h not in handles]
+        return [self.driver.current_window_handle] + opened
+
+    def _resume_loaded(self, busy, failures):
+        resumed = False
+        for handle, task in list(busy.items()):
+            self.driver.switch_to.window(handle)
+            if self._is_loaded():
+                try:
+                    value = task.page.wait_for_page_to_load()
+                except Exception as e:
+                    value = e
+                running = self._step(task, value, failures)
+            elif time.time() - task.started > self.timeout:
+                running = self._step(task, TimeoutException(
+                    'Timed out loading {0}'.format(task.page.seed_url)), failures)
+            else:
+                continue
+            resumed = True
+            if not running:
+                del busy[handle]
+        return resumed
+
+    def _is_loaded(self):
+        try:
+            return self.driver.execute_script(LOADED_SCRIPT)
+        except WebDriverException:
+            # the script ran while the tab was between documents
+            return False
+
+    def _resume(self, task, value, failures):
+        """Send the task its loaded page, or throw an exception into it.
+
+        Returns the page it yields next, or None once it is done.
+        """
+        try:
+            if isinstance(value, Exception):
+                return task.generator.throw(value)
+            return task.generator.send(value)
+        except StopIteration:
+            return None
+        except Exception as e:
+            failures[task.name] = e
+            return None
+
+    def _step(self, task, value, failures):
+        """Resume the task and start loading the page it yields in the
+        current tab. Returns False once it is done.
+        """
+        task.page = self._resume(task, value, failures)
+        if task.page is None:
+            return False
+        task.started = time.time()
+        self.loads += 1
+        self.driver.execute_script(START_LOAD_SCRIPT, task.page.seed_url)
+        return True
+
+    def _run_alone(self, task, failures):
+        page = self._resume(task, None, failures)
+        while page is not None:
+            self.loads += 1
+            try:
+                value = page.open()
+            except Exception as e:
+                value = e
+            page = self._resume(task, value, failures)
+
+
+def pytest_addoption(parser):
+    parser.getgroup('selenium').addoption(
+        '--tabs', type=int, default=4, metavar='count',
+        help='tabs of one browser in which checks run side by side, '
+             'use 1 to run them one after the other. (default: %(default)s)')
+
+
+@pytest.fixture
+def tab_scheduler(request, selenium):
+    return TabScheduler(selenium, request.config.getoption('tabs'))
@@ -4,30 +4,17 @@
 
 import pytest
 
-from pages.home_page import Home
 from pages.link_crawler import LinkCrawler
 
 
 class TestAboutPage:
 
-    @pytest.mark.nondestructive
-    def test_about_page(self, base_url, selenium):
-        home_page = Home(selenium, base_url).open()
-        about_mozillians_page = home_page.footer.click_about_link()
-        assert about_mozillians_page.is_privacy_section_present
-        assert about_mozillians_page.is_get_involved_section_present
-
     @pytest.mark.nondestructive
     def test_that_links_in_the_about_page_return_200_code(self, base_url):
         crawler = LinkCrawler(base_url)
         urls = crawler.collect_links('/about', id='main')
-        bad_urls = []
-
         assert len(urls) > 0
 
-        for url in urls:
-            check_result = crawler.verify_status_code_is_ok(url)
-            if check_result is not True:
-                bad_urls.append(check_result)
+        bad_urls = [r.message for r in crawler.verify_many(urls) if not r.ok]
 
         assert 0 == len(bad_urls), u'%s bad links found. ' % len(bad_urls) + ', '.join(bad_urls)
@@ -12,18 +12,20 @@ class TestAccount:
 
     @pytest.mark.credentials
     @pytest.mark.nondestructive
+    @pytest.mark.pristine_browser
     def test_login_logout(self, base_url, selenium, vouched_user):
         home_page = Home(selenium, base_url).open()
-        home_page.login(vouched_user['email'])
+        home_page.login(vouched_user['email'], cached=False)
         assert home_page.header.is_logout_menu_item_present
         home_page.header.click_logout_menu_item()
         assert home_page.is_sign_in_button_present
 
     @pytest.mark.credentials
     @pytest.mark.nondestructive
+    @pytest.mark.pristine_browser
     def test_logout_verify_bid(self, base_url, selenium, vouched_user):
         home_page = Home(selenium, base_url).open()
-        home_page.login(vouched_user['email'])
+        home_page.login(vouched_user['email'], cached=False)
         assert home_page.header.is_logout_menu_item_present
         selenium.get(base_url + '/logout')
 
@@ -34,13 +36,8 @@ class TestAccount:
     def test_that_links_in_footer_return_200_code(self, base_url):
         crawler = LinkCrawler(base_url)
         urls = crawler.collect_links('/', name='footer')
-        bad_urls = []
-
         assert len(urls) > 0
 
-        for url in urls:
-            check_result = crawler.verify_status_code_is_ok(url)
-            if check_result is not True:
-                bad_urls.append(check_result)
+        bad_urls = [r.message for r in crawler.verify_many(urls) if not r.ok]
 
         assert 0 == len(bad_urls), u'%s bad links found. ' % len(bad_urls) + ', '.join(bad_urls)
@@ -0,0 +1,22 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pytest
+
+from pages.link_crawler import LinkCrawler
+
+
+class TestCrawl:
+
+    @pytest.mark.crawl
+    @pytest.mark.nondestructive
+    def test_that_crawled_links_return_200_code(self, base_url):
+        report = LinkCrawler(base_url).crawl(['/'], max_depth=2, max_pages=100)
+
+        assert len(report.pages) > 1
+
+        bad_urls = [u'%s (linked from %s)' % (r.message, ', '.join(report.referrers(r.url)))
+                    for r in report.broken]
+
+        assert 0 == len(bad_urls), u'%s bad links found. ' % len(bad_urls) + ', '.join(bad_urls)
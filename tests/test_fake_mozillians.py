@@ -0,0 +1,58 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pytest
+import requests
+
+from pages.group_provisioner import GroupProvisioner, form_defaults
+
+
+class TestFakeMozillians:
+
+    @pytest.mark.nondestructive
+    def test_anonymous_pages(self, site):
+        r = requests.get(site.site_url + '/about')
+        assert [301, 301] == [h.status_code for h in r.history]
+        assert r.url.endswith('/en-US/about/')
+        assert 'id="get-involved"' in r.text
+        r = requests.get(site.site_url + '/en-US/search/', params={'q': 'User'})
+        assert 'Mozillians User' in r.text
+        assert 'Test User' not in r.text
+
+    @pytest.mark.nondestructive
+    def test_stored_users_log_in(self, site, fake_login):
+        users = site.variables()['127.0.0.1']['users']
+        session = fake_login(users['vouched'][0]['email'])
+        r = session.get(site.site_url + '/en-US/')
+        assert 'id="nav-groups"' in r.text
+        assert 'section class="groups"' in r.text
+        r = session.get(site.site_url + '/en-US/u/%s/' % users['private']['username'])
+        assert 'id="groups"' not in r.text
+
+    def test_new_user_registers(self, site, fake_login):
+        session = fake_login('new@restmail.net')
+        r = session.get(site.site_url + '/en-US/user/edit/')
+        assert r.url.endswith('/en-US/user/register/')
+        fields = form_defaults(r.text, 'form.edit-profile')
+        fields.update({'full_name': 'New User', 'country': 'United States',
+                       'region': 'California', 'city': 'Mountain View'})
+        r = session.post(r.url, data=fields)
+        assert 'Please correct the errors below.' in r.text
+        fields.update({'optin': 'on', 'g-recaptcha-response': 'passed'})
+        r = session.post(r.url, data=fields)
+        assert r.url.endswith('/en-US/u/new/')
+        assert 'id="pending-approval"' in r.text
+        assert 'Mountain View' in r.text
+
+    def test_groups_are_provisioned(self, site, fake_login):
+        provisioner = GroupProvisioner(site.site_url)
+        session = fake_login('mozillians.vouched.one@restmail.net')
+        selenium = type('Browser', (object,), {'get_cookies': lambda self: [
+            {'name': c.name, 'value': c.value, 'path': c.path} for c in session.cookies]})()
+        slug = provisioner.create(selenium)
+        assert slug in site.groups
+        assert [slug] == provisioner.orphans(provisioner.session_for(selenium))
+        assert [] == provisioner.sweep(max_age=0)
+        assert [] == provisioner.teardown()
+        assert slug not in site.groups
@@ -7,20 +7,20 @@ from random import randrange
 
 import pytest
 
+from pages.groups_page import GroupsPage
 from pages.home_page import Home
 
 
 class TestGroup:
 
     @pytest.mark.credentials
-    def test_group_description_edit(self, base_url, selenium, vouched_user):
+    def test_group_description_edit(self, base_url, selenium, vouched_user, create_group):
         home_page = Home(selenium, base_url).open()
         home_page.login(vouched_user['email'])
 
         # Create a new group
-        group_name = 'moz-group-{0}'.format(uuid.uuid4())
-        groups_page = home_page.header.click_groups_menu_item()
-        group = groups_page.create_group(group_name)
+        group_name = 'moz-group-{0}'.format(uuid.uuid1())
+        group = create_group(group_name)
 
         # New group data
         new_group_description = 'This is an automated group.'
@@ -40,14 +40,12 @@ class TestGroup:
         assert new_group_irc_channel == group_info.irc_channel
 
     @pytest.mark.credentials
-    def test_group_deletion_confirmation(self, base_url, selenium, vouched_user):
+    def test_group_deletion_confirmation(self, base_url, selenium, vouched_user, create_group):
         home_page = Home(selenium, base_url).open()
         home_page.login(vouched_user['email'])
 
         # Create a new group
-        group_name = 'moz-group-{0}'.format(uuid.uuid4())
-        groups_page = home_page.header.click_groups_menu_item()
-        group = groups_page.create_group(group_name)
+        group = create_group()
 
         # Delete should only work with acknowledgement
         delete_form = group.description.delete_group
@@ -58,14 +56,12 @@ class TestGroup:
         assert groups_page.is_group_deletion_alert_present
 
     @pytest.mark.credentials
-    def test_group_type_change(self, base_url, selenium, vouched_user):
+    def test_group_type_change(self, base_url, selenium, vouched_user, create_group):
         home_page = Home(selenium, base_url).open()
         home_page.login(vouched_user['email'])
 
         # Create a new group
-        group_name = 'moz-group-{0}'.format(uuid.uuid4())
-        groups_page = home_page.header.click_groups_menu_item()
-        group = groups_page.create_group(group_name)
+        group = create_group()
 
         # Change group type to reveal criteria
         group_type = group.access.group_type
@@ -74,14 +70,12 @@ class TestGroup:
         assert group_type.is_member_criteria_visible
 
     @pytest.mark.credentials
-    def test_group_invitations(self, base_url, selenium, vouched_user):
+    def test_group_invitations(self, base_url, selenium, vouched_user, create_group):
         home_page = Home(selenium, base_url).open()
         home_page.login(vouched_user['email'])
 
         # Create a new group
-        group_name = 'moz-group-{0}'.format(uuid.uuid4())
-        groups_page = home_page.header.click_groups_menu_item()
-        group = groups_page.create_group(group_name)
+        group = create_group()
 
         # Invite a new member
         invite = group.invitations.invite
@@ -95,10 +89,11 @@ class TestGroup:
         assert new_member in invitations.search_invitation_list[random_profile].name
 
     @pytest.mark.credentials
+    @pytest.mark.pristine_browser
     def test_github_non_nda_user_cannot_create_access_group(self, base_url, selenium, github_non_nda_user):
         home_page = Home(selenium, base_url).open()
         home_page.login_with_github(github_non_nda_user['username'], github_non_nda_user['password'],
                                     github_non_nda_user['secret'])
-        groups_page = home_page.header.click_groups_menu_item()
+        groups_page = home_page.goto(GroupsPage)
         create_group_page = groups_page.click_create_group_main_button()
         assert not create_group_page.is_access_group_present
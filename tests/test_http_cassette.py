@@ -0,0 +1,86 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pytest
+import requests
+
+from pages.link_crawler import LinkCrawler
+from tests.http_cassette import (Cassette, CassetteAdapter, CassetteMiss,
+                                 mount_globally)
+from tests.restmail import Inbox
+
+
+def session_with(cassette):
+    session = requests.Session()
+    session.mount('http://', CassetteAdapter(cassette))
+    return session
+
+
+class TestHttpCassette:
+
+    @pytest.mark.nondestructive
+    def test_replays_recorded_responses_in_order(self, fake_restmail, tmpdir):
+        url = fake_restmail.url + '/mail/user'
+        cassette = Cassette(str(tmpdir), 'record').open()
+        session = session_with(cassette)
+        session.get(url)
+        fake_restmail.deliver('user', 'hello')
+        session.get(url)
+        cassette.close()
+        fake_restmail.stop()
+
+        cassette = Cassette(str(tmpdir), 'replay', strict=True).open()
+        session = session_with(cassette)
+        assert [] == session.get(url).json()
+        assert [{'text': 'hello'}] == session.get(url).json()
+        assert [{'text': 'hello'}] == session.get(url).json()
+        with pytest.raises(CassetteMiss):
+            session.get(url + '/other')
+        assert {'recorded': 0, 'replayed': 3, 'missed': 1} == cassette.stats
+        cassette.close()
+
+    @pytest.mark.nondestructive
+    def test_mounted_globally(self, fake_restmail, tmpdir):
+        fake_restmail.deliver('user', "<p>Sign in at <a href='https://example.com/'>example.com</a></p>")
+        cassette = Cassette(str(tmpdir), 'record').open()
+        undo = mount_globally(cassette)
+        try:
+            links = LinkCrawler(fake_restmail.url).collect_links('/mail/user')
+            Inbox(url=fake_restmail.url).get_mail('user')
+        finally:
+            undo()
+            cassette.close()
+        fake_restmail.stop()
+        assert ['https://example.com/'] == links
+
+        cassette = Cassette(str(tmpdir), 'replay', strict=True).open()
+        undo = mount_globally(cassette)
+        try:
+            assert links == LinkCrawler(fake_restmail.url).collect_links('/mail/user')
+            assert 'example.com' in Inbox(url=fake_restmail.url).get_mail('user')[0]['text']
+            assert {'recorded': 0, 'replayed': 3, 'missed': 0} == cassette.stats
+        finally:
+            undo()
+            cassette.close()
+
+    @pytest.mark.nondestructive
+    def test_records_streamed_responses(self, fake_restmail, tmpdir):
+        fake_restmail.deliver('user', 'hello')
+        url = fake_restmail.url + '/mail/user'
+        Cassette(str(tmpdir), 'record', name='gw0').open().close()
+        cassette = Cassette(str(tmpdir), 'record')
+        cassette.erase()
+        assert [] == tmpdir.listdir()
+        session = session_with(cassette.open())
+        response = session.get(url, stream=True)
+        assert 0 == cassette.recorded
+        next(response.iter_content(4))
+        response.close()
+        assert 1 == cassette.recorded
+        cassette.close()
+        fake_restmail.stop()
+
+        cassette = Cassette(str(tmpdir), 'replay', strict=True).open()
+        assert [{'text': 'hello'}] == session_with(cassette).get(url).json()
+        cassette.close()
@@ -0,0 +1,98 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pytest
+from selenium.common.exceptions import (InvalidSelectorException,
+                                        NoSuchElementException,
+                                        StaleElementReferenceException,
+                                        WebDriverException)
+from selenium.webdriver.common.by import By
+
+from pages.home_page import Home
+from pages.html_tree import parse, select
+from pages.http_driver import HttpDriver
+from pages.profile import Profile
+
+DOCUMENT = u"""<!DOCTYPE html>
+<html><head><title> A  page </title></head>
+<body>
+  <ul id="list">
+    <li class="a first">One
+    <li class="a" hidden>Two
+    <li class="b"><a href="/three">Three &amp; more</a>
+  </ul>
+  <p style="display: none">Hidden</p>
+  <p>Shown<br>on two lines</p>
+  <p><a href="/wrapped">Wrapped
+      link</a></p>
+</body></html>"""
+
+
+@pytest.fixture
+def http_driver():
+    driver = HttpDriver()
+    yield driver
+    driver.quit()
+
+
+class TestHttpDriver:
+
+    @pytest.mark.nondestructive
+    def test_selectors(self):
+        document = parse(DOCUMENT)
+        assert ['One', 'Two', 'Three & more'] == [
+            e.text_content().strip() for e in select(document, '#list > li')]
+        assert ['li'] * 2 == [e.tag for e in select(document, 'ul li.a')]
+        assert ['b'] == [e.get('class') for e in select(document, 'li:nth-child(3)')]
+        assert ['b'] == [e.get('class') for e in select(document, 'li:not(.a)')]
+        assert ['/three'] == [e.get('href') for e in select(document, 'a[href^="/th"]')]
+        assert [False, True, True] == [e.is_displayed() for e in select(document, 'p')]
+        assert u'Shown\non two lines' == select(document, 'p')[1].inner_text()
+        assert u'Wrapped link' == select(document, 'p')[2].inner_text()
+        assert ['/wrapped'] == [e.get('href') for e in document.find_elements('link text', 'Wrapped link')]
+
+    @pytest.mark.nondestructive
+    def test_page_objects(self, site, http_driver):
+        home_page = Home(http_driver, site.site_url).open()
+        about_page = home_page.footer.click_about_link()
+        assert about_page.is_privacy_section_present
+        assert about_page.is_get_involved_section_present
+        search_page = home_page.open().header.search_for(u'Qwerty')
+        assert 0 == search_page.results_count
+        search_page = home_page.open().header.search_for(u'User')
+        assert [u'Mozillians User'] == [r.name for r in search_page.search_results]
+        profile_page = Profile(http_driver, site.site_url, username='private.mozillian').open()
+        assert u'Private Mozillian' == profile_page.name
+        assert not profile_page.is_groups_present
+
+    @pytest.mark.nondestructive
+    def test_elements(self, site, http_driver):
+        http_driver.get(site.site_url + '/en-US/about/')
+        assert 'js' in http_driver.find_element(By.TAG_NAME, 'html').get_attribute('class')
+        link = http_driver.find_element(By.PARTIAL_LINK_TEXT, 'About')
+        assert link.get_attribute('href').startswith(site.site_url)
+        with pytest.raises(NoSuchElementException):
+            http_driver.find_element(By.ID, 'missing')
+        with pytest.raises(InvalidSelectorException):
+            http_driver.find_elements(By.CSS_SELECTOR, 'li >')
+        link.click()
+        with pytest.raises(StaleElementReferenceException):
+            link.text
+        http_driver.back()
+        assert http_driver.current_url.endswith('/en-US/about/')
+
+    @pytest.mark.nondestructive
+    def test_frozen_page(self, site, http_driver):
+        profile_page = Profile(http_driver, site.site_url, username='private.mozillian').open()
+        with profile_page.frozen():
+            http_driver.get(site.site_url + '/en-US/about/')
+            assert u'Private Mozillian' == profile_page.name
+            assert profile_page.is_element_present(*profile_page._location_locator)
+            with pytest.raises(WebDriverException):
+                profile_page.find_element(*profile_page._city_locator).click()
+            with pytest.raises(WebDriverException, match='frozen'):
+                profile_page.wait.until(lambda s: False)
+            with pytest.raises(WebDriverException, match='frozen'):
+                profile_page.dom_wait.until_present(profile_page._city_locator)
+        assert not profile_page.is_element_present(*profile_page._location_locator)
@@ -0,0 +1,69 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pytest
+import requests
+
+from pages.http_login import HttpLogin, HttpLoginError
+from tests.fake_auth import FakeAuth
+from tests.fake_restmail import FakeRestmail
+from tests.restmail import Inbox
+
+
+@pytest.fixture
+def fake_auth(fake_restmail):
+    server = FakeAuth(fake_restmail).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def http_login(fake_restmail):
+    return HttpLogin(inbox=Inbox(url=fake_restmail.url, max_interval=0.5), timeout=5)
+
+
+class TestHttpLogin:
+
+    @pytest.mark.nondestructive
+    def test_session_cookies_log_in(self, fake_auth, http_login):
+        cookies = http_login.session_cookies(
+            fake_auth.site_url + '/oidc/authenticate/', 'user@restmail.net')
+        # the provider's own cookies stay behind
+        assert ['oidc_state', 'sessionid'] == sorted(c['name'] for c in cookies)
+        session = requests.Session()
+        for cookie in cookies:
+            session.cookies.set(cookie['name'], cookie['value'])
+        assert 'nav-logout' in session.get(fake_auth.site_url + '/').text
+
+    @pytest.mark.nondestructive
+    def test_stale_mail_is_cleared(self, fake_auth, fake_restmail, http_login):
+        # left over by an earlier attempt which gave up waiting for it
+        fake_restmail.deliver('user', 'Sign in: %s/passwordless/verify_redirect?state=stale' %
+                              fake_auth.site_url)
+        fake_auth.mail_delay = 0.3
+        cookies = http_login.session_cookies(
+            fake_auth.site_url + '/oidc/authenticate/', 'user@restmail.net')
+        assert 'sessionid' in [c['name'] for c in cookies]
+
+    @pytest.mark.nondestructive
+    def test_sign_in_without_authorize_endpoint(self, fake_auth, http_login):
+        with pytest.raises(HttpLoginError):
+            http_login.session_cookies(fake_auth.site_url + '/', 'user')
+
+    @pytest.mark.nondestructive
+    def test_falls_back_when_no_mail_arrives(self, fake_auth):
+        # the link is mailed to fake_auth's restmail, this inbox stays empty
+        empty = FakeRestmail().start()
+        http_login = HttpLogin(inbox=Inbox(url=empty.url, max_interval=0.1), mail_timeout=0.5)
+        http_login.enabled = True
+        sign_in = type('Link', (object,), {
+            'get_attribute': lambda self, name: fake_auth.site_url + '/oidc/authenticate/'})()
+        page = type('Page', (object,), {
+            '_sign_in_button_locator': ('id', 'nav-login'),
+            'find_element': lambda self, *locator: sign_in})()
+        try:
+            assert not http_login.login(page, 'user@restmail.net')
+        finally:
+            empty.stop()
+        assert {'logins': 0, 'fallbacks': 1} == http_login.stats
@@ -5,6 +5,7 @@
 import pytest
 
 from pages.home_page import Home
+from pages.invite import Invite
 
 
 class TestInvite:
@@ -13,7 +14,7 @@ class TestInvite:
     def test_inviting_an_invalid_email_address(self, base_url, selenium, vouched_user):
         home_page = Home(selenium, base_url).open()
         home_page.login(vouched_user['email'])
-        invite_page = home_page.header.click_invite_menu_item()
+        invite_page = home_page.goto(Invite)
         invite_page.invite("invalidmail")
         assert 'Enter a valid email address.' == invite_page.error_text_message
 
@@ -21,7 +22,7 @@ class TestInvite:
     def test_invite(self, base_url, selenium, vouched_user):
         home_page = Home(selenium, base_url).open()
         home_page.login(vouched_user['email'])
-        invite_page = home_page.header.click_invite_menu_item()
+        invite_page = home_page.goto(Invite)
         email_address = "user@example.com"
         invite_success_page = invite_page.invite(email_address, 'Just a bot sending a test invite to a test account.')
         assert "%s has been invited to Mozillians. They'll receive an email with instructions on how to join.\
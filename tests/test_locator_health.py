@@ -0,0 +1,44 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pytest
+import requests
+from selenium.webdriver.common.by import By
+
+from pages.html_tree import parse
+from pages.locator_health import Locator, check, check_snapshots, main
+
+
+class TestLocatorHealth:
+
+    @pytest.mark.nondestructive
+    def test_snapshots(self, site, tmpdir):
+        for name, path in [('About', '/en-US/about/'), ('Search.empty', '/en-US/search/?q=Qwerty')]:
+            tmpdir.join(name + '.html').write_text(requests.get(site.site_url + path).text, 'utf-8')
+        checks = dict(((c.snapshot, c.locator.name), c.status) for c in check_snapshots(
+            [str(p) for p in sorted(tmpdir.listdir())]))
+        assert '1' == checks[('About.html', 'About._privacy_section_locator')]
+        assert '1' == checks[('About.html', 'Base.Footer._about_mozillians_link_locator')]
+        assert 'missing' == checks[('About.html', 'Base._logout_locator')]
+        assert 'missing' == checks[('Search.empty.html', 'Search._result_locator')]
+        assert '1' == checks[('Search.empty.html', 'Search._no_results_locator_head')]
+        assert not any(name.startswith('Profile.') for _, name in checks)
+
+    @pytest.mark.nondestructive
+    def test_unsupported(self):
+        document = parse(u'<ul><li>One</ul>')
+        located = [Locator('Page', 'Page', '_' + by, by, value) for by, value in [
+            (By.TAG_NAME, 'li'), (By.XPATH, '//li'), (By.CSS_SELECTOR, 'ul >')]]
+        assert [(1, None), (None, 'unsupported'), (None, 'invalid')] == [
+            (c.count, c.error) for c in check('page.html', document, located)]
+
+    @pytest.mark.nondestructive
+    @pytest.mark.parametrize('args', [['missing-snapshots'], ['--url', 'http://127.0.0.1:1/']])
+    def test_usage_errors(self, args, monkeypatch, capsys, tmpdir):
+        monkeypatch.chdir(tmpdir)
+        monkeypatch.setattr('sys.argv', ['locator_health'] + args)
+        with pytest.raises(SystemExit) as e:
+            main()
+        assert 2 == e.value.code
+        assert 'error:' in capsys.readouterr()[1]
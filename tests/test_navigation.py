@@ -0,0 +1,50 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pytest
+
+from pages.about import About
+from pages.create_group_page import CreateGroupPage
+from pages.home_page import Home
+from pages.http_driver import HttpDriver
+from pages.navigation import Navigator
+from pages.profile import Profile
+from pages.settings import Settings
+
+
+@pytest.fixture
+def http_driver(fake_login):
+    driver = HttpDriver(fake_login('mozillians.vouched.one@restmail.net'))
+    yield driver
+    driver.quit()
+
+
+class TestNavigation:
+
+    @pytest.mark.nondestructive
+    def test_cheapest_paths(self):
+        navigator = Navigator()
+        assert ['open Settings'] == map(str, navigator.path(Home, Settings, {}))
+        assert ['Home.header.click_settings_menu_item'] == map(
+            str, navigator.path(Home, Settings, {}, direct=False))
+        assert ['Home.header.click_groups_menu_item',
+                'GroupsPage.click_create_group_main_button'] == map(
+            str, navigator.path(Home, CreateGroupPage, {}, direct=False))
+        # only the menu knows whose profile is the user's own
+        assert ['Home.header.click_view_profile_menu_item'] == map(
+            str, navigator.path(Home, Profile, {}))
+        assert ['open Profile'] == map(str, navigator.path(Home, Profile, {'username': 'a'}))
+        assert navigator.path(Home, Profile, {'username': 'a'}, direct=False) is None
+
+    @pytest.mark.nondestructive
+    def test_goto(self, site, http_driver):
+        navigator = Navigator()
+        home_page = Home(http_driver, site.site_url).open()
+        about_page = navigator.goto(home_page, About)
+        assert about_page.is_privacy_section_present
+        create_group_page = navigator.goto(about_page, CreateGroupPage)
+        assert http_driver.current_url.endswith('/en-US/groups/add/')
+        profile_page = navigator.goto(create_group_page, Profile, username='private.mozillian')
+        assert u'Private Mozillian' == profile_page.name
+        assert {'navigations': 3, 'direct': 2, 'saved': 9} == navigator.stats
@@ -7,9 +7,9 @@ import time
 import pytest
 from selenium.webdriver.common.by import By
 
+from pages.groups_page import GroupsPage
 from pages.home_page import Home
 from pages.link_crawler import LinkCrawler
-from pages.profile import Profile
 from pages.settings import Settings
 
 
@@ -20,7 +20,7 @@ class TestProfile:
     def test_profile_deletion_confirmation(self, base_url, selenium, vouched_user):
         home_page = Home(selenium, base_url).open()
         home_page.login(vouched_user['email'])
-        settings = home_page.header.click_settings_menu_item()
+        settings = home_page.goto(Settings)
 
         delete_form = settings.profile.delete_account
 
@@ -39,7 +39,7 @@ class TestProfile:
     def test_edit_profile_information(self, base_url, selenium, vouched_user):
         home_page = Home(selenium, base_url).open()
         home_page.login(vouched_user['email'])
-        settings = home_page.header.click_settings_menu_item()
+        settings = home_page.goto(Settings)
         current_time = str(time.time()).split('.')[0]
 
         # New profile data
@@ -56,15 +56,16 @@ class TestProfile:
         profile_page = home_page.header.click_view_profile_menu_item()
 
         # Check that everything was updated
-        assert new_full_name == profile_page.name
-        assert new_biography == profile_page.biography
+        with profile_page.frozen():
+            assert new_full_name == profile_page.name
+            assert new_biography == profile_page.biography
 
     @pytest.mark.credentials
     def test_skill_addition(self, base_url, selenium, vouched_user):
         home_page = Home(selenium, base_url).open()
         home_page.login(vouched_user['email'])
 
-        settings = home_page.header.click_settings_menu_item()
+        settings = home_page.goto(Settings)
         skills_form = settings.profile.skills
         skills_form.add_skill("Hello World")
         skills_form.click_update()
@@ -80,12 +81,12 @@ class TestProfile:
         home_page = Home(selenium, base_url).open()
         home_page.login(vouched_user['email'])
 
-        settings = home_page.header.click_settings_menu_item()
+        settings = home_page.goto(Settings)
         skills_form = settings.profile.skills
         skills_form.add_skill("Hello World")
         skills_form.click_update()
 
-        settings = home_page.header.click_settings_menu_item()
+        settings = home_page.goto(Settings)
         skills_form = settings.profile.skills
         skills_form.delete_skill("hello world")
         skills_form.click_update()
@@ -103,8 +104,9 @@ class TestProfile:
         home_page.login(vouched_user['email'])
 
         profile_page = home_page.header.click_view_profile_menu_item()
-        city = profile_page.city
-        country = profile_page.country
+        with profile_page.frozen():
+            city = profile_page.city
+            country = profile_page.country
 
         search_results_page = profile_page.click_profile_city_filter()
         expected_results_title = u'Mozillians in %s, %s' % (city, country)
@@ -122,8 +124,9 @@ class TestProfile:
         home_page.login(vouched_user['email'])
 
         profile_page = home_page.header.click_view_profile_menu_item()
-        region = profile_page.region
-        country = profile_page.country
+        with profile_page.frozen():
+            region = profile_page.region
+            country = profile_page.country
         search_results_page = profile_page.click_profile_region_filter()
         expected_results_title = u'Mozillians in %s, %s' % (region, country)
         actual_results_title = search_results_page.title
@@ -174,7 +177,7 @@ class TestProfile:
 
         home_page = Home(selenium, base_url).open()
         home_page.login(vouched_user['email'])
-        groups_page = home_page.header.click_groups_menu_item()
+        groups_page = home_page.goto(GroupsPage)
         edit_group = groups_page.create_group(group_name)
 
         search_listings = edit_group.header.search_for(group_name)
@@ -202,30 +205,19 @@ class TestProfile:
         profile_page.view_profile_as('Public')
         assert not profile_page.is_groups_present
 
-    @pytest.mark.credentials
-    @pytest.mark.nondestructive
-    def test_private_groups_field_when_not_logged_in(self, base_url, selenium, private_user):
-        page = Profile(selenium, base_url, username=private_user['username']).open()
-        assert not page.is_groups_present
-
     @pytest.mark.credentials
     @pytest.mark.nondestructive
     def test_that_links_in_the_services_page_return_200_code(self, base_url, selenium, vouched_user):
         home_page = Home(selenium, base_url).open()
         home_page.login(vouched_user['email'])
 
-        settings = home_page.header.click_settings_menu_item()
+        settings = home_page.goto(Settings)
         developer = settings.developer
         crawler = LinkCrawler(base_url)
         urls = developer.get_services_urls()
-        bad_urls = []
-
         assert len(urls) > 0
 
-        for url in urls:
-            check_result = crawler.verify_status_code_is_ok(url)
-            if check_result is not True:
-                bad_urls.append(check_result)
+        bad_urls = [r.message for r in crawler.verify_many(urls) if not r.ok]
 
         assert 0 == len(bad_urls), u'%s bad links found. ' % len(bad_urls) + ', '.join(bad_urls)
 
@@ -234,7 +226,7 @@ class TestProfile:
     def test_that_user_can_view_external_accounts(self, base_url, selenium, vouched_user):
         home_page = Home(selenium, base_url).open()
         home_page.login(vouched_user['email'])
-        settings = home_page.header.click_settings_menu_item()
+        settings = home_page.goto(Settings)
 
         assert settings.external_accounts.irc_form.is_displayed
         assert settings.external_accounts.external_accounts_form.is_displayed
@@ -243,7 +235,7 @@ class TestProfile:
     def test_that_user_can_add_external_account(self, base_url, selenium, vouched_user):
         home_page = Home(selenium, base_url).open()
         home_page.login(vouched_user['email'])
-        settings = home_page.header.click_settings_menu_item()
+        settings = home_page.goto(Settings)
 
         external_accounts_form = settings.external_accounts.external_accounts_form
         cnt_external_accounts = external_accounts_form.count_external_accounts()
@@ -255,7 +247,7 @@ class TestProfile:
     def test_that_user_can_modify_external_accounts_irc_nickname(self, base_url, selenium, vouched_user):
         home_page = Home(selenium, base_url).open()
         home_page.login(vouched_user['email'])
-        settings = home_page.header.click_settings_menu_item()
+        settings = home_page.goto(Settings)
 
         irc_form = settings.external_accounts.irc_form
         old_nickname = irc_form.nickname
@@ -266,7 +258,7 @@ class TestProfile:
         profile_page = home_page.header.click_view_profile_menu_item()
         assert new_nickname == profile_page.irc_nickname
 
-        settings = home_page.header.click_settings_menu_item()
+        settings = home_page.goto(Settings)
         irc_form = settings.external_accounts.irc_form
         irc_form.update_nickname(old_nickname)
         irc_form.click_update()
@@ -284,5 +276,5 @@ class TestProfile:
         assert not home_page.is_groups_link_visible
         assert not home_page.is_functional_areas_link_visible
 
-        settings = home_page.header.click_settings_menu_item()
+        settings = home_page.goto(Settings)
         assert not settings.groups.is_find_group_link_visible
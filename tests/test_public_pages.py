@@ -0,0 +1,42 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import uuid
+
+import pytest
+
+from pages.about import About
+from pages.profile import Profile
+from pages.search import Search
+
+
+class TestPublicPages:
+
+    @pytest.mark.credentials
+    @pytest.mark.nondestructive
+    def test_public_pages(self, base_url, selenium, private_user, tab_scheduler):
+        # read-only checks of what anyone can see, run side by side in tabs
+        # of one browser instead of one test and page load after another
+        def about():
+            page = yield About(selenium, base_url)
+            assert page.is_privacy_section_present
+            assert page.is_get_involved_section_present
+
+        def search(query):
+            def check():
+                page = yield Search(selenium, base_url, query=query)
+                assert 0 == page.results_count
+            return check
+
+        def private_profile():
+            page = yield Profile(selenium, base_url, username=private_user['username'])
+            assert not page.is_groups_present
+
+        checks = [('about page', about)]
+        checks += [(u'search for "{0}"'.format(q), search(q))
+                   for q in (u'Qwerty', u'', uuid.uuid4().hex)]
+        checks.append(('private profile', private_profile))
+
+        failures = tab_scheduler.run(checks)
+        assert not failures, u'\n'.join(u'{0}: {1!r}'.format(*f) for f in failures.items())
@@ -2,51 +2,42 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+import os
+
 import pytest
-import requests
+
+from pages.status_verifier import StatusVerifier, dump_chains, load_checks
+
+CHECKS = load_checks(os.path.join(os.path.dirname(__file__), 'redirects.json'))
 
 
 class TestRedirects:
 
     @pytest.mark.nondestructive
-    def test_302_redirect_for_anonymous_users(self, base_url):
-        paths = ['/es/country/us/',
-                 '/sq/country/doesnotexist/',
-                 '/hu/country/us/region/California/',
-                 '/pl/country/in/city/Gulbarga/',
-                 '/zh-TW/group/webqa/',
-                 '/zh-CN/group/258/join/',
-                 '/sl/group/doesnotexit/',
-                 '/pt-BR/u/moz.mozillians.unvouched/',
-                 '/ca/u/UserDoesNotExist/',
-                 '/nl/logout/',
-                 '/lt/user/edit/',
-                 '/en-US/invite/',
-                 '/fr/register/']
-        urls = self.make_absolute_paths(base_url, paths)
-        error_list = self.verify_http_response_codes(urls, 302)
+    def test_302_redirect_for_anonymous_users(self, base_url, request):
+        error_list = self.verify_http_response_codes(base_url, request, 302)
         assert 0 == len(error_list), error_list
 
     @pytest.mark.nondestructive
-    def test_200_for_anonymous_users(self, base_url):
-        paths = ['/pl/opensearch.xml', '/nl/u/Mozillians.User/']
-        urls = self.make_absolute_paths(base_url, paths)
-        error_list = self.verify_http_response_codes(urls, 200)
+    def test_200_for_anonymous_users(self, base_url, request):
+        error_list = self.verify_http_response_codes(base_url, request, 200)
         assert 0 == len(error_list), error_list
 
-    def make_absolute_paths(self, url, paths):
-        urls = []
-        for path in paths:
-            urls.append(url + path)
-        return urls
-
-    def verify_http_response_codes(self, urls, expected_http_value):
-        error_list = []
-        for url in urls:
-            # prevent redirects, we only want the value of the 1st HTTP status
-            response = requests.get(url, allow_redirects=False)
-            http_status = response.status_code
-            if http_status != expected_http_value:
-                error_list.append('Expected %s but got %s. %s' %
-                                  (expected_http_value, http_status, url))
-        return error_list
+    @pytest.mark.nondestructive
+    def test_redirect_chains_for_anonymous_users(self, base_url, request):
+        paths = [c.path for c in CHECKS if c.status == 302]
+        chains = StatusVerifier(base_url).follow_many(paths)
+        if request.config.getoption('redirect_chains'):
+            dump_chains(chains, request.config.getoption('redirect_chains'))
+        request.node.add_report_section(
+            'call', 'redirect chains', '\n'.join(c.describe() for c in chains))
+        bad_chains = [c.describe() for c in chains
+                      if c.is_loop or c.is_too_long or c.is_truncated or c.is_downgraded]
+        assert 0 == len(bad_chains), bad_chains
+
+    def verify_http_response_codes(self, base_url, request, expected_http_value):
+        checks = [c for c in CHECKS if c.status == expected_http_value]
+        assert len(checks) > 0
+        results = StatusVerifier(base_url).verify_many(checks)
+        request.node.add_report_section('call', 'responses', StatusVerifier.report(results))
+        return [r.message for r in results if not r.ok]
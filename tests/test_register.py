@@ -2,9 +2,12 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+import pytest
+
 from pages.home_page import Home
 
 
+@pytest.mark.pristine_browser
 class TestRegister:
 
     def test_profile_creation(self, base_url, selenium, new_user):
@@ -0,0 +1,48 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import time
+
+import pytest
+
+from tests.restmail import Inbox
+
+
+@pytest.fixture
+def inbox(fake_restmail):
+    return Inbox(url=fake_restmail.url, max_interval=0.5)
+
+
+class TestRestmail:
+
+    @pytest.mark.nondestructive
+    def test_returns_as_soon_as_mail_arrives(self, fake_restmail, inbox):
+        fake_restmail.deliver('user@restmail.net', 'hello', delay=0.3)
+        start = time.time()
+        mail = inbox.get_mail('user@restmail.net', timeout=5)
+        assert 'hello' == mail[0]['text']
+        assert time.time() - start < 1
+        assert 0.3 <= inbox.last_delivery_time < 1
+
+    @pytest.mark.nondestructive
+    def test_polls_over_one_connection(self, fake_restmail, inbox):
+        fake_restmail.deliver('user', 'hello', delay=1)
+        inbox.get_mail('user', timeout=5)
+        polls = [r for r in fake_restmail.requests if r[0] == 'GET']
+        assert len(polls) > 2
+        assert 1 == len(fake_restmail.connections)
+
+    @pytest.mark.nondestructive
+    def test_mail_is_consumed(self, fake_restmail, inbox):
+        fake_restmail.deliver('user', 'first')
+        assert 'first' == inbox.get_mail('user', timeout=1)[0]['text']
+        fake_restmail.deliver('user', 'second')
+        assert 'second' == inbox.get_mail('user', timeout=1)[0]['text']
+
+    @pytest.mark.nondestructive
+    def test_timeout(self, fake_restmail, inbox):
+        fake_restmail.deliver('user', 'hello')
+        with pytest.raises(Exception) as e:
+            inbox.get_mail('user', message_count=2, timeout=0.5)
+        assert 'Expected 2 messages but there were 1' in str(e.value)
@@ -26,10 +26,11 @@ class TestSearch:
         home_page = Home(selenium, base_url).open()
         home_page.login(vouched_user['email'])
         search_page = home_page.header.search_for(query, loggedin=True)
-        assert search_page.results_count > 0
+        results = search_page.search_result_records
+        assert len(results) > 0
         # get random index
-        random_profile = randrange(search_page.results_count)
-        profile_name = search_page.search_results[random_profile].name
+        random_profile = randrange(len(results))
+        profile_name = results[random_profile].name
         assert query.lower() in profile_name.lower()
 
     @pytest.mark.credentials
@@ -50,19 +51,3 @@ class TestSearch:
         home_page.login(vouched_user['email'])
         search_page = home_page.header.search_for(query, loggedin=True)
         assert 0 == search_page.results_count
-
-    @pytest.mark.nondestructive
-    def test_search_for_not_existing_mozillian_when_not_logged_in(self, base_url, selenium):
-        query = u'Qwerty'
-        home_page = Home(selenium, base_url).open()
-        search_page = home_page.header.search_for(query)
-        assert 0 == search_page.results_count
-
-    @pytest.mark.nondestructive
-    def test_search_for_empty_string_redirects_to_search_page(self, base_url, selenium):
-        # Searching for empty string redirects to the Search page
-        # with publicly available profiles
-        query = u''
-        home_page = Home(selenium, base_url).open()
-        search_page = home_page.header.search_for(query)
-        assert search_page.results_count == 0
@@ -0,0 +1,107 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from pages.about import About
+from pages.http_driver import HttpDriver
+from pages.search import Search
+from tests.tab_scheduler import LOADED_SCRIPT, START_LOAD_SCRIPT, TabScheduler
+
+TAB_STATE = ('current_url', 'page_source', 'document', '_history')
+
+
+class TabbedHttpDriver(HttpDriver):
+    """HttpDriver with tabs, which load their page when asked whether they have."""
+
+    def __init__(self):
+        HttpDriver.__init__(self)
+        self.current_window_handle = 'tab0'
+        self.tabs = {'tab0': {}}
+        self.loading = {}
+        self.started = []
+        self.unloading = 0
+
+    @property
+    def window_handles(self):
+        return sorted(self.tabs)
+
+    @property
+    def switch_to(self):
+        return self
+
+    def window(self, handle):
+        if self.current_window_handle in self.tabs:
+            self.tabs[self.current_window_handle] = dict((k, getattr(self, k)) for k in TAB_STATE)
+        self.current_window_handle = handle
+        for key, value in self.tabs[handle].items():
+            setattr(self, key, value)
+
+    def close(self):
+        del self.tabs[self.current_window_handle]
+
+    def execute_script(self, script, *args):
+        if script == START_LOAD_SCRIPT:
+            self.loading[self.current_window_handle] = args[0]
+            self.started.append(args[0].rpartition('/')[2] or 'about')
+        elif script == LOADED_SCRIPT:
+            if self.unloading:
+                self.unloading -= 1
+                raise WebDriverException('Document was unloaded during execution')
+            url = self.loading.pop(self.current_window_handle)
+            self.get(url)
+            return True
+        elif 'window.open' in script:
+            self.tabs['tab{0}'.format(len(self.tabs))] = {}
+        else:
+            return HttpDriver.execute_script(self, script, *args)
+
+
+class TestTabScheduler:
+
+    @pytest.mark.nondestructive
+    def test_checks_interleave(self, site):
+        driver = TabbedHttpDriver()
+        done = []
+
+        def search(query, results):
+            def check():
+                page = yield Search(driver, site.site_url, query=query)
+                done.append(query)
+                assert results == page.results_count
+                page = yield About(driver, site.site_url)
+                assert page.is_privacy_section_present
+            return check
+
+        failures = TabScheduler(driver, tabs=2, poll=0).run([
+            ('one', search('Qwerty', 0)), ('two', search('User', 1)), ('three', search('Mozillians', 0))])
+        assert ['?q=Qwerty', '?q=User', 'about', 'about', '?q=Mozillians'] == driver.started[:5]
+        assert ['Qwerty', 'User', 'Mozillians'] == done
+        assert ['three'] == list(failures)
+        assert ['tab0'] == driver.window_handles
+
+    @pytest.mark.nondestructive
+    def test_polled_between_documents(self, site):
+        driver = TabbedHttpDriver()
+        driver.unloading = 2
+
+        def check():
+            page = yield About(driver, site.site_url)
+            assert page.is_privacy_section_present
+
+        failures = TabScheduler(driver, tabs=2, poll=0).run([('about', check), ('again', check)])
+        assert not failures
+        assert 0 == driver.unloading
+
+    @pytest.mark.nondestructive
+    def test_without_tabs(self, site):
+        driver = HttpDriver()
+
+        def check():
+            page = yield About(driver, site.site_url)
+            assert not page.is_privacy_section_present
+
+        failures = TabScheduler(driver).run([('about', check)])
+        assert isinstance(failures['about'], AssertionError)
@@ -0,0 +1,65 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import fcntl
+import threading
+import time
+
+import pytest
+
+from tests.user_leases import LeaseManager, LeaseTimeout
+
+USERS = [{'email': 'one@restmail.net'}, {'email': 'two@restmail.net'}]
+
+
+def is_queued_on(leases, user):
+    lock = leases._try_lock('turnstile:' + user['email'], fcntl.LOCK_SH)
+    if lock is None:
+        return True
+    lock.close()
+    return False
+
+
+@pytest.fixture
+def leases(tmpdir):
+    return LeaseManager(str(tmpdir), timeout=0.5, interval=0.01, max_interval=0.01)
+
+
+class TestUserLeases:
+
+    @pytest.mark.nondestructive
+    def test_shared_and_exclusive(self, leases):
+        first = leases.acquire(USERS, shared=True)
+        second = leases.acquire(USERS, shared=True)
+        assert first.user is second.user is USERS[0]
+        third = leases.acquire(USERS)
+        assert USERS[1] is third.user
+        with pytest.raises(LeaseTimeout):
+            leases.acquire(USERS)
+        first.release()
+        second.release()
+        assert USERS[0] is leases.acquire(USERS).user
+        third.release()
+
+    @pytest.mark.nondestructive
+    def test_writer_is_not_starved(self, leases):
+        reader = leases.acquire(USERS[:1], shared=True)
+        writer = []
+        other_worker = LeaseManager(leases.directory, timeout=5, interval=0.01)
+        thread = threading.Thread(target=lambda: writer.append(other_worker.acquire(USERS[:1])))
+        thread.start()
+        while not is_queued_on(leases, USERS[0]):
+            time.sleep(0.01)
+        with pytest.raises(LeaseTimeout):
+            leases.acquire(USERS[:1], shared=True)
+        reader.release()
+        thread.join()
+        assert USERS[0] is writer[0].user
+
+    @pytest.mark.nondestructive
+    def test_mailbox_times_out(self, leases):
+        with leases.mailbox('one@restmail.net'):
+            with pytest.raises(LeaseTimeout):
+                with leases.mailbox('one@restmail.net'):
+                    pass
@@ -0,0 +1,34 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pytest
+
+from pages.base import Base
+from pages.http_driver import HttpDriver
+from tests.webdriver_commands import CommandRecorder
+
+
+class ScriptDriver(HttpDriver):
+    """Answers the scripts of DomWait through execute, as WebDriver does."""
+
+    def execute(self, command, params=None):
+        return {'value': u'Mozillians'}
+
+    def set_script_timeout(self, timeout):
+        self.execute('setTimeouts', {'script': timeout})
+
+    def execute_async_script(self, script, *args):
+        return self.execute('executeAsyncScript', {'script': script, 'args': args})['value']
+
+
+class TestWebDriverCommands:
+
+    @pytest.mark.nondestructive
+    def test_waits_are_charged_to_the_page_method(self):
+        driver = ScriptDriver()
+        recorder = CommandRecorder()
+        driver.execute = recorder.wrap(driver.execute)
+        assert u'Mozillians' == Base(driver, 'http://localhost').page_title
+        assert ['Base.page_title'] == list(recorder.methods)
+        assert 2 == recorder.count
@@ -0,0 +1,175 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Records a timeline of each test in Chrome Trace Event format.
+
+Test phases, methods of page objects, the restmail client, explicit waits
+and page loads become spans which can be opened in chrome://tracing
+or https://ui.perfetto.dev. Nothing is installed unless --trace-timeline
+is given, so there is no overhead otherwise.
+"""
+
+import glob
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+from pypom import Page, Region
+
+
+def is_page_object_method(frame):
+    # parsers, crawlers and other helpers in pages would drown the timeline
+    return not frame.f_code.co_name.startswith('<') and \
+        isinstance(frame.f_locals.get('self'), (Page, Region))
+
+
+# module prefix -> (category, function names to trace, a test of the frame
+# or None for all)
+TRACED = (
+    ('pages.', 'pages', is_page_object_method),
+    ('tests.restmail', 'restmail', None),
+    ('selenium.webdriver.support.wait', 'wait', ('until', 'until_not')),
+    ('selenium.webdriver.remote.webdriver', 'navigation', ('get', 'refresh', 'back', 'forward')),
+)
+
+
+def now():
+    # wall clock rather than a monotonic one, so workers line up when merged
+    return time.time() * 1e6
+
+
+class Tracer(object):
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.events = []
+        self._codes = {}
+        self._stacks = threading.local()
+
+    def span(self, name, category, start, **args):
+        self.events.append({
+            'name': name, 'cat': category, 'ph': 'X', 'ts': start,
+            'dur': now() - start, 'pid': self.pid,
+            'tid': threading.current_thread().ident, 'args': args})
+
+    def category(self, frame):
+        code = frame.f_code
+        if code not in self._codes:
+            self._codes[code] = None
+            module = frame.f_globals.get('__name__', '')
+            for prefix, category, names in TRACED:
+                if not module.startswith(prefix):
+                    continue
+                if names is None or (names(frame) if callable(names) else code.co_name in names):
+                    self._codes[code] = category
+                    break
+        return self._codes[code]
+
+    def profile(self, frame, event, arg):
+        if event == 'call':
+            category = self.category(frame)
+            if category is not None:
+                stack = self._stacks.__dict__.setdefault('frames', [])
+                stack.append((frame, category, now()))
+        elif event == 'return':
+            stack = getattr(self._stacks, 'frames', None)
+            if stack and stack[-1][0] is frame:
+                frame, category, start = stack.pop()
+                instance = frame.f_locals.get('self')
+                owner = type(instance).__name__ if instance is not None else \
+                    frame.f_globals.get('__name__')
+                self.span('%s.%s' % (owner, frame.f_code.co_name), category, start)
+
+    def start(self):
+        threading.setprofile(self.profile)
+        sys.setprofile(self.profile)
+
+    def stop(self):
+        sys.setprofile(None)
+        threading.setprofile(None)
+
+
+def pytest_addoption(parser):
+    parser.getgroup('tracing').addoption(
+        '--trace-timeline', metavar='path',
+        help='write a Chrome Trace Event timeline of the tests to a JSON file.')
+
+
+def pytest_configure(config):
+    if not config.getoption('trace_timeline'):
+        return
+    worker = getattr(config, 'slaveinput', {}).get('slaveid')
+    if worker is None and getattr(config.option, 'numprocesses', None):
+        # the xdist master only merges what the workers recorded
+        return
+    config._tracer = Tracer(int(worker[2:]) if worker else 0)
+    config._tracer.start()
+
+
+def trace(item, name, start):
+    tracer = getattr(item.config, '_tracer', None)
+    if tracer is not None:
+        tracer.span(name, 'test', start, test=item.nodeid)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    start = now()
+    yield
+    trace(item, item.nodeid, start)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_setup(item):
+    start = now()
+    yield
+    trace(item, 'setup', start)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    start = now()
+    yield
+    trace(item, 'call', start)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item):
+    start = now()
+    yield
+    trace(item, 'teardown', start)
+
+
+def pytest_sessionfinish(session):
+    path = session.config.getoption('trace_timeline')
+    if not path:
+        return
+    tracer = getattr(session.config, '_tracer', None)
+    if tracer is not None:
+        tracer.stop()
+        worker = getattr(session.config, 'slaveinput', {}).get('slaveid')
+        with open('%s.%s' % (path, worker) if worker else path, 'w') as f:
+            json.dump({'traceEvents': tracer.events}, f)
+    if not hasattr(session.config, 'slaveinput'):
+        merge(path)
+
+
+def merge(path):
+    parts = glob.glob(path + '.gw*')
+    if not parts:
+        return
+    events = []
+    for part in sorted(parts):
+        with open(part) as f:
+            worker_events = json.load(f)['traceEvents']
+        if worker_events:
+            events.append({'name': 'process_name', 'ph': 'M', 'pid': worker_events[0]['pid'],
+                           'args': {'name': part.rpartition('.')[2]}})
+        events.extend(worker_events)
+        os.remove(part)
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': events}, f)
@@ -0,0 +1,157 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import errno
+import fcntl
+import hashlib
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+
+class LeaseTimeout(Exception):
+    pass
+
+
+class Lease(object):
+
+    def __init__(self, user, lock, shared, wait):
+        self.user = user
+        self.shared = shared
+        self.wait = wait
+        self._lock = lock
+
+    def release(self):
+        if self._lock is not None:
+            fcntl.flock(self._lock, fcntl.LOCK_UN)
+            self._lock.close()
+            self._lock = None
+
+    def describe(self):
+        return 'waited {0:.1f}s for {1} lease on {2}'.format(
+            self.wait, 'a shared' if self.shared else 'an exclusive', self.user['email'])
+
+
+class LeaseManager(object):
+    """Lends stored users to tests, across all processes on this machine.
+
+    Every user has a lock file in a directory shared by the xdist workers.
+    Leases are flock locks on it, so they go away with the process holding
+    them. Read-only tests take shared leases and may use a user at the same
+    time, any other test waits for an exclusive one.
+
+    Pages hold the mailbox lock through Base.mailbox, which is set to
+    mailbox when the plugin is configured.
+    """
+
+    def __init__(self, directory=None, timeout=600, interval=0.1, max_interval=2):
+        self.directory = directory or os.path.join(
+            tempfile.gettempdir(), 'mozillians-user-leases')
+        self.timeout = timeout
+        self.interval = interval
+        self.max_interval = max_interval
+        self.leases = 0
+        self.waited = 0
+        self.longest = 0
+
+    def _open(self, name):
+        if not os.path.isdir(self.directory):
+            try:
+                os.makedirs(self.directory)
+            except OSError as e:
+                if e.errno != errno.EEXIST:
+                    raise
+        digest = hashlib.sha1(name.encode('utf-8')).hexdigest()[:16]
+        return open(os.path.join(self.directory, digest + '.lock'), 'a')
+
+    def _try_lock(self, name, flags):
+        lock = self._open(name)
+        try:
+            fcntl.flock(lock, flags | fcntl.LOCK_NB)
+        except IOError as e:
+            lock.close()
+            if e.errno not in (errno.EAGAIN, errno.EACCES):
+                raise
+            return None
+        return lock
+
+    def _try_lease(self, email, shared):
+        if not shared:
+            return self._try_lock(email, fcntl.LOCK_EX)
+        # readers pass through the turnstile, which a waiting writer holds
+        turnstile = self._try_lock('turnstile:' + email, fcntl.LOCK_SH)
+        if turnstile is None:
+            return None
+        try:
+            return self._try_lock(email, fcntl.LOCK_SH)
+        finally:
+            turnstile.close()
+
+    def acquire(self, users, shared=False, offset=0):
+        """Lease the first free user, trying them from offset onwards.
+
+        Workers pass their own index as offset so they do not all queue up
+        for the first user. A test waiting for an exclusive lease queues on
+        the user at its offset, whom no further shared leases are given
+        until it got one, so it is not starved by overlapping readers.
+        """
+        offset %= len(users)
+        users = users[offset:] + users[:offset]
+        start = time.time()
+        interval = self.interval
+        queued = None
+        try:
+            while True:
+                for user in users:
+                    lock = self._try_lease(user['email'], shared)
+                    if lock is not None:
+                        lease = Lease(user, lock, shared, time.time() - start)
+                        self.leases += 1
+                        self.waited += lease.wait
+                        self.longest = max(self.longest, lease.wait)
+                        return lease
+                if time.time() - start > self.timeout:
+                    raise LeaseTimeout('No user could be leased in {0}s'.format(self.timeout))
+                if not shared and queued is None:
+                    queued = self._try_lock('turnstile:' + users[0]['email'], fcntl.LOCK_EX)
+                time.sleep(interval)
+                interval = min(interval * 1.5, self.max_interval)
+        finally:
+            if queued is not None:
+                queued.close()
+
+    @contextmanager
+    def mailbox(self, email):
+        """Hold the user's restmail inbox while logging in by email.
+
+        Users leased by several tests at once would otherwise have their
+        login links read by whichever test polls the inbox first.
+        """
+        start = time.time()
+        interval = self.interval
+        lock = self._try_lock('mailbox:' + email, fcntl.LOCK_EX)
+        while lock is None:
+            if time.time() - start > self.timeout:
+                raise LeaseTimeout('The mailbox of {0} was not free in {1}s'.format(
+                    email, self.timeout))
+            time.sleep(interval)
+            interval = min(interval * 1.5, self.max_interval)
+            lock = self._try_lock('mailbox:' + email, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            lock.close()
+
+    def add_stats(self, stats):
+        self.leases += stats.get('leases', 0)
+        self.waited += stats.get('waited', 0)
+        self.longest = max(self.longest, stats.get('longest', 0))
+
+    @property
+    def stats(self):
+        return {'leases': self.leases, 'waited': self.waited, 'longest': self.longest}
+
+
+leases = LeaseManager()
@@ -0,0 +1,144 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Counts the WebDriver commands sent by each test and page object method.
+
+Commands are attributed to the innermost method of the pages package on the
+call stack, or to the test itself when it talks to the driver directly.
+Helpers which page objects go through, such as DomWait, are skipped, so a
+wait is charged to the page object method waiting.
+"""
+
+import json
+import sys
+import time
+from collections import Counter
+
+import pytest
+
+results = {}
+
+# modules sending commands on behalf of page objects
+HELPER_MODULES = ('pages.dom_wait', 'pages.snapshot', 'pages.navigation', 'pages.login_cache',
+                  'pages.http_login', 'pages.http_driver', 'pages.html_tree')
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('webdriver commands')
+    group.addoption('--webdriver-commands', metavar='path',
+                    help='write WebDriver command counts per test and page '
+                         'object method to a JSON file.')
+    group.addoption('--max-webdriver-commands', type=int, metavar='count',
+                    help='fail tests sending more WebDriver commands than this. '
+                         'The max_webdriver_commands marker overrides it per test.')
+
+
+def caller():
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if module.startswith('pages.') and module not in HELPER_MODULES and \
+                not frame.f_code.co_name.startswith('<'):
+            instance = frame.f_locals.get('self')
+            owner = type(instance).__name__ if instance is not None else module
+            return '%s.%s' % (owner, frame.f_code.co_name)
+        frame = frame.f_back
+    return '(test)'
+
+
+class CommandRecorder(object):
+
+    def __init__(self):
+        self.count = 0
+        self.time = 0.0
+        self.commands = Counter()
+        self.methods = {}
+
+    def record(self, command, elapsed, method):
+        self.count += 1
+        self.time += elapsed
+        self.commands[command] += 1
+        stats = self.methods.setdefault(method, {'count': 0, 'time': 0.0})
+        stats['count'] += 1
+        stats['time'] += elapsed
+
+    def wrap(self, execute):
+        def counting_execute(command, params=None):
+            start = time.time()
+            try:
+                return execute(command, params)
+            finally:
+                self.record(command, time.time() - start, caller())
+        return counting_execute
+
+    def to_dict(self):
+        return {'count': self.count, 'time': self.time,
+                'commands': dict(self.commands), 'methods': self.methods}
+
+
+def budget(item):
+    marker = item.get_marker('max_webdriver_commands')
+    if marker is not None:
+        return marker.args[0]
+    return item.config.getoption('max_webdriver_commands')
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    driver = getattr(item, 'funcargs', {}).get('selenium')
+    if driver is None:
+        yield
+        return
+    recorder = item.webdriver_commands = CommandRecorder()
+    driver.execute = recorder.wrap(driver.execute)
+    try:
+        outcome = yield
+    finally:
+        del driver.execute
+    limit = budget(item)
+    if outcome.excinfo is None and limit is not None and recorder.count > limit:
+        pytest.fail('{0} WebDriver commands sent, the budget is {1}'.format(
+            recorder.count, limit), pytrace=False)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    recorder = getattr(item, 'webdriver_commands', None)
+    if call.when != 'call' or recorder is None:
+        return
+    report = outcome.get_result()
+    report.webdriver_commands = recorder.to_dict()
+    pytest_html = item.config.pluginmanager.getplugin('html')
+    if pytest_html is not None:
+        extra = getattr(report, 'extra', [])
+        extra.append(pytest_html.extras.json(report.webdriver_commands, 'WebDriver commands'))
+        report.extra = extra
+
+
+def pytest_runtest_logreport(report):
+    # runs on the xdist master as well, which receives the reports of all workers
+    data = getattr(report, 'webdriver_commands', None)
+    if data is not None:
+        results[report.nodeid] = data
+
+
+def summarize(results):
+    methods = {}
+    for data in results.values():
+        for method, stats in data['methods'].items():
+            total = methods.setdefault(method, {'count': 0, 'time': 0.0, 'tests': 0})
+            total['count'] += stats['count']
+            total['time'] += stats['time']
+            total['tests'] += 1
+    return methods
+
+
+def pytest_sessionfinish(session):
+    path = session.config.getoption('webdriver_commands')
+    if not path or hasattr(session.config, 'slaveinput'):
+        return
+    with open(path, 'w') as f:
+        json.dump({'tests': results, 'methods': summarize(results)},
+                  f, indent=2, sort_keys=True)